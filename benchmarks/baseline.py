@@ -0,0 +1,107 @@
+"""
+Baseline module - Saving benchmark results and flagging regressions
+
+A suite's results are a mapping of benchmark name to metrics. Metrics whose
+name ends with ``per_s`` (throughput) regress when they go down; every other
+metric (latencies, per-call costs) regresses when it goes up. ``--save``
+writes the results to a JSON baseline, along with the commit and platform
+they were measured on, and ``--compare`` reports every metric against a
+previous baseline; the run exits with status 1 when a metric is worse by
+more than ``--threshold``.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+Results = Dict[str, Dict[str, float]]
+
+DEFAULT_THRESHOLD = 0.10
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the baseline options to a benchmark's argument parser"""
+    parser.add_argument("--save", metavar="PATH", help="write the results to a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results to a JSON baseline")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"relative change counted as a regression (default {DEFAULT_THRESHOLD})"
+    )
+
+
+def higher_is_better(metric: str) -> bool:
+    """Whether a larger value of the metric is an improvement"""
+    return metric.endswith("per_s")
+
+
+def git_commit() -> Optional[str]:
+    """The checked out commit, if known"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path: str, suite: str, results: Results, settings: Optional[Dict[str, Any]] = None) -> None:
+    """Write results to a JSON baseline"""
+    document = {
+        "suite": suite,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings or {},
+        "results": results
+    }
+    with open(path, "w", encoding="utf-8") as baseline_file:
+        json.dump(document, baseline_file, indent=2, sort_keys=True)
+        baseline_file.write("\n")
+    print(f"\nSaved baseline to {path}")
+
+
+def compare(baseline: Results, results: Results, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Print every metric next to its baseline value
+
+    Returns the ``benchmark metric`` names that regressed by more than
+    ``threshold``. Metrics missing from either side are skipped.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<36} {'metric':<12} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            previous = baseline.get(name, {}).get(metric)
+            if previous is None:
+                continue
+            if previous:
+                change = (value - previous) / previous
+            else:
+                change = 0.0 if value == previous else float("inf") * (1 if value > previous else -1)
+            worse = -change if higher_is_better(metric) else change
+            flag = ""
+            if worse > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}")
+            print(f"{name:<36} {metric:<12} {previous:>12.2f} {value:>12.2f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def finish(args: argparse.Namespace, suite: str, results: Results, settings: Optional[Dict[str, Any]] = None) -> None:
+    """Save and compare results as requested on the command line, exiting with 1 on regressions"""
+    if args.save:
+        save(args.save, suite, results, settings)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            document = json.load(baseline_file)
+        if document.get("suite") != suite:
+            sys.exit(f"{args.compare} is a baseline of the {document.get('suite')} suite, not {suite}")
+        regressions = compare(document["results"], results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%}")
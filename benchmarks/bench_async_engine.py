@@ -0,0 +1,104 @@
+"""
+Execution engine benchmark - Throughput under concurrent slow tool calls
+
+Compares three ways of running 200 concurrent calls to a tool that sleeps:
+
+- inline: each call runs on the caller's thread, like a single Flask worker
+- async/sync tools: ``execute_tool_async`` offloading plain functions to service pools
+- async/coroutine tools: ``execute_tool_async`` awaiting native coroutines
+
+Run from the repository root:
+
+    python -m benchmarks.bench_async_engine
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict
+
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.utils.types import MCPService, ServiceType, Tool, ToolRequest, ToolSchema
+
+CALLS = 200
+LATENCY = 0.02  # seconds per simulated upstream call
+
+
+def slow_sync(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulate a blocking upstream call"""
+    time.sleep(LATENCY)
+    return params
+
+
+async def slow_async(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulate a non-blocking upstream call"""
+    await asyncio.sleep(LATENCY)
+    return params
+
+
+def build_registry() -> MCPRegistry:
+    """Register one sync and one coroutine tool per service"""
+    registry = MCPRegistry(ExecutionEngine(service_concurrency=64, service_queue_limit=CALLS))
+    schema = ToolSchema(properties={}, required=[])
+    for service_type in ServiceType:
+        service = MCPService(
+            type=service_type,
+            name=service_type.value,
+            description="Synthetic service",
+            base_url="http://localhost",
+        )
+        service.tools = [
+            Tool(name="slow_sync", service=service_type, description="", parameters=schema, function=slow_sync),
+            Tool(name="slow_async", service=service_type, description="", parameters=schema, function=slow_async),
+        ]
+        registry.register_service(service)
+    return registry
+
+
+def bench_inline() -> float:
+    """Run the calls one after another on the calling thread"""
+    start = time.perf_counter()
+    for i in range(CALLS):
+        slow_sync({"i": i})
+    return time.perf_counter() - start
+
+
+def bench_async(registry: MCPRegistry, tool_name: str) -> float:
+    """Run the calls concurrently through execute_tool_async"""
+    services = list(ServiceType)
+    requests = [
+        ToolRequest(tool_name=tool_name, service=services[i % len(services)], parameters={"i": i})
+        for i in range(CALLS)
+    ]
+
+    async def run() -> float:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(registry.execute_tool_async(r) for r in requests))
+        elapsed = time.perf_counter() - start
+        assert all(response.status == "success" for response in responses)
+        return elapsed
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    logging.disable(logging.INFO)
+    registry = build_registry()
+    # Warm up the engine loop and pool threads
+    bench_async(registry, "slow_sync")
+
+    results = {
+        "inline": bench_inline(),
+        "async/sync tools": bench_async(registry, "slow_sync"),
+        "async/coroutine tools": bench_async(registry, "slow_async"),
+    }
+
+    print(f"{CALLS} calls, {LATENCY * 1000:.0f} ms each")
+    print(f"{'mode':<24} {'seconds':>8} {'calls/s':>9}")
+    for mode, elapsed in results.items():
+        print(f"{mode:<24} {elapsed:>8.3f} {CALLS / elapsed:>9.0f}")
+    registry.engine.shutdown()
+
+
+if __name__ == "__main__":
+    main()
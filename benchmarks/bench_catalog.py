@@ -0,0 +1,91 @@
+"""
+Catalog benchmark - Cost of a /tools request at 10,000 tools
+
+Registers ``TOOLS`` tools and times the ``/tools`` view inside a request
+context, so the figures leave out the WSGI round-trip:
+
+- rebuilt: the former view, building the list and calling ``jsonify`` per request
+- cached: the precomputed catalog
+- cached, gzip: the cached gzip variant (``Accept-Encoding: gzip``)
+- not modified: a revalidation answered with 304 (``If-None-Match``)
+
+Run from the repository root:
+
+    python -m benchmarks.bench_catalog
+"""
+import logging
+import statistics
+import timeit
+from typing import Any, Callable, Dict, Optional
+
+from flask import jsonify
+
+from src.server.app import app, list_tools, tool_catalog
+from src.server.mcp_registry import registry
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+TOOLS = 10_000
+REPEATS = 5
+
+
+def register_tools(count: int) -> None:
+    """Register a service with ``count`` tools"""
+    service = MCPService(
+        type=ServiceType.GITHUB,
+        name="github",
+        description="Synthetic service",
+        base_url="http://localhost",
+    )
+    schema = ToolSchema(
+        properties={
+            "repo_id": {"type": "integer", "description": "Repository ID"},
+            "state": {"type": "string", "description": "Issue state"},
+        },
+        required=["repo_id"],
+    )
+    service.tools = [
+        Tool(name=f"tool_{i}", service=ServiceType.GITHUB, description=f"Synthetic tool number {i}",
+             parameters=schema, function=lambda params: None)
+        for i in range(count)
+    ]
+    registry.register_service(service)
+
+
+def rebuilt() -> Any:
+    """The /tools view before catalogs were precomputed"""
+    return jsonify([{
+        "name": tool.name,
+        "service": tool.service,
+        "description": tool.description,
+        "parameters": tool.parameters.dict()
+    } for tool in registry.list_tools()])
+
+
+def per_request_us(view: Callable[[], Any], headers: Optional[Dict[str, str]] = None) -> float:
+    """Median cost of one view call in microseconds"""
+    with app.test_request_context("/tools", headers=headers or {}):
+        timer = timeit.Timer(view)
+        number, _ = timer.autorange()
+        return statistics.median(timer.repeat(REPEATS, number)) / number * 1e6
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    register_tools(TOOLS)
+    entry = tool_catalog.get()
+
+    results = {
+        "rebuilt": per_request_us(rebuilt),
+        "cached": per_request_us(list_tools),
+        "cached, gzip": per_request_us(list_tools, {"Accept-Encoding": "gzip"}),
+        "not modified": per_request_us(list_tools, {"If-None-Match": f'"{entry.etag}"'}),
+    }
+
+    print(f"/tools with {TOOLS} tools: {len(entry.body) / 2 ** 20:.1f} MB, {len(entry.compressed('gzip')) / 2 ** 10:.0f} KB gzipped")
+    print(f"{'mode':<14} {'us/request':>11}")
+    for mode, cost in results.items():
+        print(f"{mode:<14} {cost:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Compression benchmark - Bytes on the wire and CPU cost per response
+
+Encodes typical responses (a short ``list_repos`` result, ``list_issues``
+results of 100 and 1,000 issues, and a 1,000 tool catalog) and compresses
+them with every available codec, at the configured latency-tuned level and
+at the codec's default level for comparison. Reports the compressed size,
+the ratio, and the CPU time to compress and to decompress one response
+(median of ``REPEATS``). Responses under ``MCP_COMPRESS_MIN_SIZE`` bytes are
+sent uncompressed by the server; they are marked as such.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_compression
+"""
+import gzip
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from benchmarks.bench_serialization import make_issues
+from src.server import compression
+from src.server.serialization import dumps
+from src.utils.types import ServiceType, ToolResponse, ToolSchema
+
+REPEATS = 7
+# Minimum CPU time of one timing, in seconds
+MIN_TIME = 0.05
+
+
+def cpu_us(function: Callable[[], Any]) -> float:
+    """Median CPU time of one call in microseconds"""
+    number = 1
+    while True:
+        start = time.process_time()
+        for _ in range(number):
+            function()
+        if time.process_time() - start >= MIN_TIME:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(REPEATS):
+        start = time.process_time()
+        for _ in range(number):
+            function()
+        timings.append((time.process_time() - start) / number)
+    return statistics.median(timings) * 1e6
+
+
+def payloads() -> Dict[str, bytes]:
+    """Response bodies as the server sends them"""
+    repos = [{"id": i, "name": f"repo-{i}", "description": "Sample repository", "owner": "acme"} for i in range(3)]
+    schema = ToolSchema(
+        properties={"repo_id": {"type": "integer", "description": "Repository ID"}},
+        required=["repo_id"],
+    )
+    tools = [{
+        "name": f"tool_{i}",
+        "service": ServiceType.GITHUB,
+        "description": f"Synthetic tool number {i}",
+        "parameters": schema,
+    } for i in range(1000)]
+    return {
+        "list_repos (3)": dumps(ToolResponse(service=ServiceType.GITHUB, data=repos)),
+        "list_issues (100)": dumps(ToolResponse(service=ServiceType.GITHUB, data=make_issues(100))),
+        "list_issues (1000)": dumps(ToolResponse(service=ServiceType.GITHUB, data=make_issues(1000))),
+        "tool catalog (1000)": dumps(tools),
+    }
+
+
+def codecs() -> List[Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    """(label, compress, decompress) of every available codec and level"""
+    variants = [
+        (f"gzip {compression.GZIP_LEVEL}", compression.CODECS["gzip"], gzip.decompress),
+        ("gzip 6", lambda data: gzip.compress(data, 6, mtime=0), gzip.decompress),
+    ]
+    if compression.zstandard is not None:
+        zstd = compression.zstandard
+        variants += [
+            (f"zstd {compression.ZSTD_LEVEL}", compression.CODECS["zstd"],
+             lambda data: zstd.ZstdDecompressor().decompress(data)),
+            ("zstd 9", lambda data: zstd.ZstdCompressor(level=9).compress(data),
+             lambda data: zstd.ZstdDecompressor().decompress(data)),
+        ]
+    if compression.brotli is not None:
+        brotli = compression.brotli
+        variants += [
+            (f"br {compression.BROTLI_QUALITY}", compression.CODECS["br"], brotli.decompress),
+            ("br 11", lambda data: brotli.compress(data, quality=11), brotli.decompress),
+        ]
+    return variants
+
+
+def main() -> None:
+    variants = codecs()
+    print(f"codecs: {', '.join(compression.CODECS)}; minimum size {compression.MIN_SIZE} bytes")
+    print(f"{'payload':<20} {'codec':<8} {'bytes':>9} {'ratio':>7} {'compress us':>12} {'decompress us':>14}")
+    for name, body in payloads().items():
+        note = "  (below minimum size, sent as is)" if len(body) < compression.MIN_SIZE else ""
+        print(f"{name:<20} {'identity':<8} {len(body):>9} {1:>6.1f}x {'-':>12} {'-':>14}{note}")
+        for label, compress, decompress in variants:
+            compressed = compress(body)
+            assert decompress(compressed) == body
+            print(
+                f"{'':<20} {label:<8} {len(compressed):>9} {len(body) / len(compressed):>6.1f}x "
+                f"{cpu_us(lambda: compress(body)):>12.1f} {cpu_us(lambda: decompress(compressed)):>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
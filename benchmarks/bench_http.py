@@ -0,0 +1,210 @@
+"""
+HTTP load benchmark - Throughput and latency percentiles under gunicorn
+
+Starts the server under gunicorn (``src.index:app``, gthread workers) on a
+free local port, then drives each scenario with ``--concurrency`` client
+processes for ``--duration`` seconds after a short warmup. Every client
+keeps one HTTP/1.1 connection open and sends its next request as soon as
+the previous one is answered (closed loop). Reports requests per second and
+latency percentiles per scenario, and the mean response size on the wire;
+non-2xx responses and connection errors are counted as errors. Clients send
+``--accept-encoding`` (empty for none) and don't decompress, as the size is
+what was sent. Pass ``--url`` to load an already running server instead.
+
+The load generator shares the machine with the server, so compare results
+measured on the same host and settings. Run from the repository root:
+
+    python -m benchmarks.bench_http [--save PATH] [--compare PATH]
+"""
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks import baseline
+
+SCENARIOS: Dict[str, Tuple[str, str, Optional[Dict[str, Any]]]] = {
+    "POST /execute": ("POST", "/execute", {"tool_name": "github.list_issues", "parameters": {"state": "open"}}),
+    "POST /github/list_issues": ("POST", "/github/list_issues", {"state": "open"}),
+    "GET /tools": ("GET", "/tools", None),
+}
+PERCENTILES = (50, 90, 99)
+WARMUP = 1.0  # seconds
+STARTUP_TIMEOUT = 30.0  # seconds
+
+
+def free_port() -> int:
+    """Find a free local TCP port"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(port: int, workers: int, threads: int, log_level: str) -> subprocess.Popen:
+    """Start gunicorn and wait until it serves requests"""
+    env = dict(os.environ, MCP_LOG_LEVEL=log_level)
+    # Load the services at startup rather than during the first scenario
+    env.setdefault("MCP_EAGER_SERVICES", "1")
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "src.index:app",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--worker-class", "gthread",
+            "--threads", str(threads),
+            "--log-level", "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"gunicorn exited with status {server.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/services")
+            if connection.getresponse().status == 200:
+                connection.close()
+                return server
+        except OSError:
+            time.sleep(0.1)
+    server.terminate()
+    sys.exit(f"gunicorn didn't answer within {STARTUP_TIMEOUT:.0f} seconds")
+
+
+def drive(job: Tuple[str, int, str, str, Optional[bytes], float, str]) -> Tuple[List[float], int, int]:
+    """
+    Send requests in a closed loop
+
+    Returns the latencies measured after the warmup, the error count and the
+    number of response body bytes received.
+    """
+    host, port, method, path, body, duration, accept_encoding = job
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    if accept_encoding:
+        headers["Accept-Encoding"] = accept_encoding
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    latencies: List[float] = []
+    errors = 0
+    received = 0
+    start = time.perf_counter()
+    measure_from = start + WARMUP
+    end = measure_from + duration
+
+    while True:
+        sent = time.perf_counter()
+        if sent >= end:
+            break
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            size = len(response.read())
+            ok = 200 <= response.status < 300
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            size, ok = 0, False
+        if sent >= measure_from:
+            latencies.append(time.perf_counter() - sent)
+            errors += not ok
+            received += size
+
+    connection.close()
+    return latencies, errors, received
+
+
+def percentile(ordered: List[float], percent: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not ordered:
+        return 0.0
+    rank = max(1, int(round(percent / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def run_scenario(
+    pool: Any,
+    host: str,
+    port: int,
+    scenario: Tuple[str, str, Optional[Dict[str, Any]]],
+    concurrency: int,
+    duration: float,
+    accept_encoding: str
+) -> Dict[str, float]:
+    """Load one endpoint and summarize the results"""
+    method, path, payload = scenario
+    body = json.dumps(payload).encode() if payload is not None else None
+    outcomes = pool.map(drive, [(host, port, method, path, body, duration, accept_encoding)] * concurrency)
+
+    latencies = sorted(latency for client_latencies, _, _ in outcomes for latency in client_latencies)
+    metrics = {"req_per_s": len(latencies) / duration}
+    for percent in PERCENTILES:
+        metrics[f"p{percent}_ms"] = percentile(latencies, percent) * 1000
+    metrics["errors"] = sum(errors for _, errors, _ in outcomes)
+    metrics["bytes"] = sum(received for _, _, received in outcomes) / max(len(latencies), 1)
+    return metrics
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="load this server instead of starting gunicorn")
+    parser.add_argument("--duration", type=float, default=5.0, help="measured seconds per scenario (default 5)")
+    parser.add_argument("--concurrency", type=int, default=4, help="client processes (default 4)")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers (default 2)")
+    parser.add_argument("--threads", type=int, default=4, help="threads per gunicorn worker (default 4)")
+    parser.add_argument("--log-level", default="WARNING", help="server MCP_LOG_LEVEL (default WARNING)")
+    parser.add_argument("--accept-encoding", default="gzip", help="Accept-Encoding sent by the clients (default gzip)")
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    server = None
+    if args.url:
+        target = urllib.parse.urlsplit(args.url)
+        host, port = target.hostname, target.port or 80
+    else:
+        host, port = "127.0.0.1", free_port()
+        server = start_server(port, args.workers, args.threads, args.log_level)
+
+    results = {}
+    try:
+        print(f"{args.concurrency} clients, {args.duration:.0f} s per scenario")
+        print(
+            f"{'scenario':<28} {'req/s':>9}" + "".join(f"{f'p{p} ms':>9}" for p in PERCENTILES)
+            + f"{'errors':>8}{'bytes':>9}"
+        )
+        with multiprocessing.Pool(args.concurrency) as pool:
+            for name, scenario in SCENARIOS.items():
+                metrics = results[name] = run_scenario(
+                    pool, host, port, scenario, args.concurrency, args.duration, args.accept_encoding
+                )
+                print(
+                    f"{name:<28} {metrics['req_per_s']:>9.0f}"
+                    + "".join(f"{metrics[f'p{p}_ms']:>9.2f}" for p in PERCENTILES)
+                    + f"{metrics['errors']:>8.0f}{metrics['bytes']:>9.0f}"
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    settings = {
+        "url": args.url,
+        "duration": args.duration,
+        "concurrency": args.concurrency,
+        "accept_encoding": args.accept_encoding,
+        "workers": None if args.url else args.workers,
+        "threads": None if args.url else args.threads,
+    }
+    baseline.finish(args, "http", results, settings)
+
+
+if __name__ == "__main__":
+    main()
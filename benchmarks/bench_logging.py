@@ -0,0 +1,142 @@
+"""
+Logging benchmark - Requests per second with logging off, synchronous and queued
+
+Sends ``REQUESTS`` tool calls through the Flask app (test client) from
+``THREADS`` client threads. The tool logs two info records per call like the
+service implementations do, and the registry logs each dispatch. Logs are
+written to a temporary file, and then to a slow sink whose writes block for
+``SINK_LATENCY`` seconds (a busy disk or a log shipper pipe), in every mode:
+
+- off: the root logger only lets warnings through
+- sync: a ``StreamHandler`` on the root logger formats and writes on the
+  request thread, as with the previous per-module ``basicConfig``
+- queue: the logging pipeline, text output
+- queue json: the logging pipeline, JSON output
+- queue json 1%: the same with the tool's info logs sampled at 1%
+
+Run from the repository root:
+
+    python -m benchmarks.bench_logging
+"""
+import io
+import logging
+import tempfile
+import threading
+import time
+from typing import Any, Dict, TextIO
+
+from src.server.app import app
+from src.server.logs import configure_logging, log_sampler, shutdown_logging
+from src.server.mcp_registry import registry
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+REQUESTS = 2000
+THREADS = (1, 8)
+SINK_LATENCY = 0.0005  # seconds per write
+TOOL = "github.log_heavy"
+
+logger = logging.getLogger("benchmarks.bench_logging")
+
+
+def log_heavy(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Log like a service tool and return a small payload"""
+    logger.info("Executing GitHub log_heavy tool")
+    logger.info("Listing issues for repo %s in state %s", params.get("repo_id"), params.get("state"))
+    return {"repo_id": params.get("repo_id"), "issues": []}
+
+
+def register_service() -> None:
+    """Register a service whose tool logs on every call"""
+    service = MCPService(
+        type=ServiceType.GITHUB,
+        name="github",
+        description="Synthetic service",
+        base_url="http://localhost",
+    )
+    service.tools = [
+        Tool(name="log_heavy", service=ServiceType.GITHUB, description="",
+             parameters=ToolSchema(properties={}, required=[]), function=log_heavy),
+    ]
+    registry.register_service(service)
+
+
+class SlowSink(io.TextIOWrapper):
+    """Text file whose writes block like a slow device"""
+
+    def write(self, text: str) -> int:
+        time.sleep(SINK_LATENCY)
+        return super().write(text)
+
+
+def open_sink(path: str, slow: bool) -> TextIO:
+    """Open the log file, optionally behind a slow sink"""
+    if slow:
+        return SlowSink(open(path, "ab"))
+    return open(path, "a")
+
+
+def setup(mode: str, sink: TextIO) -> None:
+    """Configure logging for a mode"""
+    shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    log_sampler.rates.pop(TOOL, None)
+
+    if mode == "off":
+        root.setLevel(logging.WARNING)
+        return
+    if mode == "sync":
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+        root.addHandler(handler)
+        root.setLevel(logging.INFO)
+        return
+
+    configure_logging("INFO", "json" if "json" in mode else "text", sink, force=True)
+    if mode.endswith("1%"):
+        log_sampler.configure(TOOL, 0.01)
+
+
+def run(threads: int) -> float:
+    """Send the requests and return the request rate"""
+    per_thread = REQUESTS // threads
+
+    def client() -> None:
+        test_client = app.test_client()
+        for i in range(per_thread):
+            response = test_client.post("/execute", json={
+                "tool_name": TOOL,
+                "parameters": {"repo_id": i, "state": "open"},
+            })
+            assert response.status_code == 200
+
+    workers = [threading.Thread(target=client) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    register_service()
+    modes = ("off", "sync", "queue", "queue json", "queue json 1%")
+    print(f"{REQUESTS} requests to {TOOL}, requests/s")
+    print(f"{'sink':<10} {'mode':<16}" + "".join(f"{f'{threads} thread(s)':>14}" for threads in THREADS))
+    with tempfile.NamedTemporaryFile(suffix=".log") as log_file:
+        for sink_name, slow in (("file", False), ("slow sink", True)):
+            for mode in modes:
+                rates = []
+                for threads in THREADS:
+                    sink = open_sink(log_file.name, slow)
+                    setup(mode, sink)
+                    rates.append(run(threads))
+                    shutdown_logging()
+                    sink.close()
+                print(f"{sink_name:<10} {mode:<16}" + "".join(f"{rate:>14.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Microbenchmarks - Per-call cost of the request path's building blocks
+
+Measures, with the GitHub and Linear services registered:
+
+- registry lookup: ``MCPRegistry.resolve`` for bare, namespaced and pinned names
+- request parsing: ``ToolRequest(**payload)`` for an ``/execute`` body
+- response serialization: ``ToolResponse.dict()`` of a ``list_issues`` response
+- ``jsonify`` of that dict and of the response itself, inside an application context
+
+Each benchmark reports the median of ``REPEATS`` timings, in microseconds
+per call. Run from the repository root:
+
+    python -m benchmarks.bench_micro [--save PATH] [--compare PATH]
+"""
+import argparse
+import logging
+import statistics
+import timeit
+from typing import Any, Callable, Dict
+
+from flask import jsonify
+
+from benchmarks import baseline
+from src.server.app import app, initialize_services
+from src.server.mcp_registry import registry
+from src.utils.types import ServiceType, ToolRequest
+
+REPEATS = 7
+
+PAYLOAD = {
+    "tool_name": "github.list_issues",
+    "parameters": {"repo_id": 1, "state": "open"},
+    "timeout_ms": 5000,
+    "priority": "interactive"
+}
+
+
+def per_call_us(function: Callable[[], Any]) -> float:
+    """Median cost of one call in microseconds"""
+    timer = timeit.Timer(function)
+    # Enough calls per timing to take at least 0.2 seconds
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(REPEATS, number)) / number * 1e6
+
+
+def run_benchmarks() -> Dict[str, Dict[str, float]]:
+    """Run every microbenchmark"""
+    initialize_services(eager=True)
+    response = registry.execute_tool(ToolRequest(tool_name="github.list_issues", parameters={}))
+    assert response.status == "success", response.error
+    body = response.dict()
+
+    with app.app_context():
+        benchmarks = {
+            "registry.resolve (bare)": lambda: registry.resolve("list_repos"),
+            "registry.resolve (namespaced)": lambda: registry.resolve("github.list_issues"),
+            "registry.resolve (pinned)": lambda: registry.resolve("list_issues", ServiceType.GITHUB),
+            "ToolRequest(**payload)": lambda: ToolRequest(**PAYLOAD),
+            "ToolResponse.dict()": response.dict,
+            "jsonify(response.dict())": lambda: jsonify(body),
+            "jsonify(ToolResponse)": lambda: jsonify(response),
+        }
+        return {name: {"us": per_call_us(function)} for name, function in benchmarks.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    baseline.add_arguments(parser)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    results = run_benchmarks()
+    print(f"{'benchmark':<36} {'us/call':>8}")
+    for name, metrics in results.items():
+        print(f"{name:<36} {metrics['us']:>8.2f}")
+
+    baseline.finish(args, "micro", results, {"repeats": REPEATS})
+
+
+if __name__ == "__main__":
+    main()
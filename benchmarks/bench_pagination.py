@@ -0,0 +1,69 @@
+"""
+Pagination benchmark - Cost of a page by position in a large list
+
+Pages through ``RECORDS`` issues sorted by ID, the way the GitHub service's
+list tools page through their store, and times fetching one page of
+``LIMIT`` records near the start, the middle and the end of the list:
+
+- offset: skipping the records before the page, as ``limit``/``offset``
+  paging over a filtered iterator would
+- keyset: ``keyset_page`` resuming from a cursor
+
+Reports microseconds per page (median of ``REPEATS``). Run from the
+repository root:
+
+    python -m benchmarks.bench_pagination
+"""
+import itertools
+import statistics
+import timeit
+from typing import Any, Dict, List
+
+from benchmarks.bench_serialization import make_issues
+from src.services.pagination import encode_cursor, keyset_page
+
+RECORDS = 100_000
+LIMIT = 100
+REPEATS = 5
+POSITIONS = {"start": 0.0, "middle": 0.5, "end": 0.99}
+
+
+def matches(issue: Dict[str, Any]) -> bool:
+    """Filter of the benchmarked query: open issues"""
+    return issue["state"] == "open"
+
+
+def offset_page(issues: List[Dict[str, Any]], offset: int) -> List[Dict[str, Any]]:
+    """A page skipping the ``offset`` matching issues before it"""
+    matching = (issue for issue in issues if matches(issue))
+    return list(itertools.islice(matching, offset, offset + LIMIT))
+
+
+def per_page_us(function: Any) -> float:
+    """Median cost of one page in microseconds"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(REPEATS, number)) / number * 1e6
+
+
+def main() -> None:
+    issues = make_issues(RECORDS)
+    open_issues = [issue for issue in issues if matches(issue)]
+    params = {"limit": LIMIT, "state": "open"}
+
+    print(f"{RECORDS} issues, {len(open_issues)} open; pages of {LIMIT} open issues")
+    print(f"{'page at':<8} {'offset us':>10} {'keyset us':>10} {'same':>6}")
+    for name, fraction in POSITIONS.items():
+        offset = int(len(open_issues) * fraction)
+        page_params = dict(params)
+        if offset:
+            page_params["cursor"] = encode_cursor({"after": open_issues[offset - 1]["id"]}, params)
+
+        same = offset_page(issues, offset) == keyset_page(issues, page_params, "id", matches).items
+        offset_us = per_page_us(lambda: offset_page(issues, offset))
+        keyset_us = per_page_us(lambda: keyset_page(issues, page_params, "id", matches))
+        print(f"{name:<8} {offset_us:>10.1f} {keyset_us:>10.1f} {str(same):>6}")
+
+
+if __name__ == "__main__":
+    main()
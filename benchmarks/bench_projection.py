@@ -0,0 +1,120 @@
+"""
+Projection benchmark - Payload size and latency of sparse fieldsets on wide records
+
+Registers a tool returning ``ISSUES`` wide GitHub issues (long bodies,
+reactions, timeline events and custom fields) and requests them through the
+WSGI app with every field, and with ``fields`` selecting what an agent
+usually needs (``id``, ``title``, ``state``):
+
+- full: every field
+- fields: the projected records
+
+Reports milliseconds per request (median of ``REPEATS``) and the body size,
+uncompressed and gzipped. Then reports the cost of getting a projection plan
+from the plan cache and of compiling it afresh, and of projecting one record.
+Run from the repository root:
+
+    python -m benchmarks.bench_projection
+"""
+import logging
+import statistics
+import time
+import timeit
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.bench_serialization import iter_issues
+from src.server import projection
+from src.server.app import app
+from src.server.mcp_registry import registry
+from src.server.projection import compile_projection
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+ISSUES = 5_000
+REPEATS = 7
+FIELDS = ["id", "title", "state"]
+
+MODES: Dict[str, Optional[List[str]]] = {
+    "full": None,
+    "fields": FIELDS,
+}
+
+
+def make_wide_issues(count: int) -> List[Dict[str, Any]]:
+    """Issues with the fields of a full GitHub API issue, most of them unused by agents"""
+    issues = []
+    for issue in iter_issues(count):
+        number = issue["id"]
+        issue.update({
+            "body": "Steps to reproduce, expected and actual behaviour, and logs of the failure. " * 20,
+            "url": f"https://api.github.com/repos/acme/project/issues/{number}",
+            "html_url": f"https://github.com/acme/project/issues/{number}",
+            "reactions": {"+1": number % 5, "-1": 0, "laugh": 0, "heart": number % 3, "rocket": 1},
+            "events": [
+                {"event": "labeled", "actor": f"user{k}", "created_at": f"2024-01-{k + 1:02d}T12:00:00Z"}
+                for k in range(8)
+            ],
+            **{f"custom_field_{k}": f"value {k} of issue {number}" for k in range(20)},
+        })
+        issues.append(issue)
+    return issues
+
+
+def register_tool(issues: List[Dict[str, Any]]) -> None:
+    """Register a service whose ``list_issues`` tool returns the wide issues"""
+    service = MCPService(
+        type=ServiceType.GITHUB,
+        name="github",
+        description="Synthetic service",
+        base_url="http://localhost",
+    )
+    service.tools = [Tool(
+        name="list_issues",
+        service=ServiceType.GITHUB,
+        description="List wide issues",
+        parameters=ToolSchema(properties={}, required=[]),
+        function=lambda params: issues,
+    )]
+    registry.register_service(service)
+
+
+def request(fields: Optional[List[str]], encoding: str = "") -> Tuple[float, int]:
+    """Seconds to serve one request, and the size of its body in bytes"""
+    client = app.test_client()
+    body: Dict[str, Any] = {"tool_name": "github.list_issues", "parameters": {}, "timeout_ms": 600_000}
+    if fields is not None:
+        body["fields"] = fields
+    start = time.perf_counter()
+    response = client.post("/execute", json=body, headers={"Accept-Encoding": encoding})
+    size = len(response.get_data())
+    return time.perf_counter() - start, size
+
+
+def per_call_us(function: Any) -> float:
+    """Median cost of one call in microseconds"""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(REPEATS, number)) / number * 1e6
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    issues = make_wide_issues(ISSUES)
+    register_tool(issues)
+
+    print(f"list_issues returning {ISSUES} wide issues; fields={','.join(FIELDS)}")
+    print(f"{'mode':<8} {'ms':>8} {'KB':>9} {'gzip KB':>9}")
+    for mode, fields in MODES.items():
+        ms = statistics.median(request(fields)[0] for _ in range(REPEATS)) * 1000
+        size = request(fields)[1]
+        gzipped = request(fields, "gzip")[1]
+        print(f"{mode:<8} {ms:>8.1f} {size / 1024:>9.1f} {gzipped / 1024:>9.1f}")
+
+    plan = compile_projection(FIELDS)
+    print()
+    print(f"plan from cache us    {per_call_us(lambda: compile_projection(FIELDS)):>8.2f}")
+    print(f"plan compiled us      {per_call_us(lambda: projection._compile.__wrapped__(tuple(FIELDS))):>8.2f}")
+    print(f"project record us     {per_call_us(lambda: plan.record(issues[0])):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
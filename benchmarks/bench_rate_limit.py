@@ -0,0 +1,175 @@
+"""
+Rate limiter benchmark - Upstream quota errors with and without header feedback
+
+Starts a local fake upstream that allows ``QUOTA`` requests per ``WINDOW``
+seconds, answers with GitHub style ``X-RateLimit-*`` headers, and rejects
+requests over the quota with 429 and ``Retry-After``. Then sends ``CALLS``
+concurrent tool calls through the registry twice:
+
+- ignore headers: the tool calls the upstream with plain ``requests``
+- honor headers: the tool reports its upstream requests and their response
+  headers to the service's rate limiter (``current_limiter``)
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rate_limit
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+import requests
+
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.server.ratelimit import current_limiter
+from src.utils.deadline import remaining_budget
+from src.utils.types import MCPService, ServiceType, Tool, ToolRequest, ToolSchema
+
+CALLS = 120
+QUOTA = 20  # requests allowed per window
+WINDOW = 1.0  # seconds
+
+
+class FakeUpstream(ThreadingHTTPServer):
+    """HTTP server enforcing a fixed-window request quota"""
+
+    daemon_threads = True
+    # Accept bursts of connections without SYN retries skewing arrival times
+    request_queue_size = 256
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), QuotaHandler)
+        self.lock = threading.Lock()
+        self.window = 0
+        self.used = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class QuotaHandler(BaseHTTPRequestHandler):
+    """Answer with rate-limit headers, or 429 once the window's quota is spent"""
+
+    server: FakeUpstream
+
+    def do_GET(self) -> None:
+        upstream = self.server
+        now = time.time()
+        window = math.floor(now / WINDOW)
+        reset = (window + 1) * WINDOW
+        with upstream.lock:
+            if window != upstream.window:
+                upstream.window, upstream.used = window, 0
+            allowed = upstream.used < QUOTA
+            if allowed:
+                upstream.used += 1
+                upstream.accepted += 1
+            else:
+                upstream.rejected += 1
+            remaining = QUOTA - upstream.used
+
+        self.send_response(200 if allowed else 429)
+        self.send_header("X-RateLimit-Limit", str(QUOTA))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset", f"{reset:.3f}")
+        if not allowed:
+            self.send_header("Retry-After", f"{reset - now:.3f}")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+def build_registry(url: str) -> MCPRegistry:
+    """Register a service with a tool per upstream client"""
+    def ignore_headers(params: Dict[str, Any]) -> Dict[str, Any]:
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def honor_headers(params: Dict[str, Any]) -> Dict[str, Any]:
+        limiter = current_limiter.get()
+        limiter.request_started()
+        try:
+            response = requests.get(url, timeout=remaining_budget(10))
+        finally:
+            limiter.request_finished()
+        limiter.observe(response.headers, response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    registry = MCPRegistry(ExecutionEngine(service_queue_limit=CALLS))
+    schema = ToolSchema(properties={}, required=[])
+    service = MCPService(
+        type=ServiceType.GITHUB,
+        name="fake",
+        description="Rate limited fake upstream",
+        base_url=url,
+    )
+    service.tools = [
+        Tool(name="ignore_headers", service=ServiceType.GITHUB, description="", parameters=schema,
+             function=ignore_headers),
+        Tool(name="honor_headers", service=ServiceType.GITHUB, description="", parameters=schema,
+             function=honor_headers),
+    ]
+    registry.register_service(service)
+    # Failed upstream calls must not open the breaker mid-run
+    registry.breakers.configure(ServiceType.GITHUB, failure_threshold=CALLS + 1)
+    registry.limiters.configure(ServiceType.GITHUB, max_wait=CALLS / QUOTA * WINDOW + 1)
+    return registry
+
+
+def run(tool_name: str) -> Dict[str, Any]:
+    """Send the calls concurrently and count the outcomes"""
+    upstream = FakeUpstream()
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    registry = build_registry(upstream.url)
+    requests_ = [ToolRequest(tool_name=tool_name, parameters={"i": i}) for i in range(CALLS)]
+
+    async def gather() -> Any:
+        return await asyncio.gather(*(registry.execute_tool_async(r) for r in requests_))
+
+    start = time.perf_counter()
+    responses = asyncio.run(gather())
+    elapsed = time.perf_counter() - start
+    upstream.shutdown()
+    registry.engine.shutdown()
+
+    statuses: Dict[str, int] = {}
+    for response in responses:
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+    return {
+        "elapsed": elapsed,
+        "success": statuses.get("success", 0),
+        "failed": CALLS - statuses.get("success", 0),
+        "upstream_429": upstream.rejected,
+        "limiter": registry.limiters.stats(ServiceType.GITHUB),
+    }
+
+
+def main() -> None:
+    logging.disable(logging.ERROR)
+    print(f"{CALLS} calls against a quota of {QUOTA} requests per {WINDOW:.0f}s window")
+    print(f"{'mode':<16} {'seconds':>8} {'success':>8} {'failed':>7} {'upstream 429':>13}")
+    for mode, tool_name in (("ignore headers", "ignore_headers"), ("honor headers", "honor_headers")):
+        result = run(tool_name)
+        print(
+            f"{mode:<16} {result['elapsed']:>8.2f} {result['success']:>8} "
+            f"{result['failed']:>7} {result['upstream_429']:>13}"
+        )
+    limiter = result["limiter"]
+    print(f"limiter: throttled {limiter['throttled']}, shed {limiter['shed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Routing benchmark - Tool resolution cost versus registry size
+
+Registers the same tool names in every service so that every name overlaps,
+then measures how long ``MCPRegistry.resolve`` takes for pinned, namespaced
+and bare lookups as the number of registered tools grows.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_routing
+"""
+import logging
+import random
+import timeit
+from typing import List
+
+from src.server.mcp_registry import MCPRegistry, qualified_name
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+SIZES = [10, 100, 1_000, 10_000, 50_000]
+LOOKUPS = 100_000
+# Distinct keys in the hot set, so CPU cache effects don't mask lookup cost
+HOT_KEYS = 1_000
+
+
+def build_registry(total_tools: int) -> MCPRegistry:
+    """Build a registry where every tool name is provided by every service"""
+    services = list(ServiceType)
+    names_per_service = max(1, total_tools // len(services))
+    schema = ToolSchema(properties={}, required=[])
+
+    registry = MCPRegistry()
+    for service_type in services:
+        service = MCPService(
+            type=service_type,
+            name=service_type.value,
+            description=f"Synthetic {service_type.value} service",
+            base_url="http://localhost",
+        )
+        service.tools = [
+            Tool.construct(
+                name=f"tool_{i}",
+                service=service_type,
+                description="Synthetic tool",
+                parameters=schema,
+                function=lambda params: params,
+            )
+            for i in range(names_per_service)
+        ]
+        registry.register_service(service)
+    return registry
+
+
+def bench(registry: MCPRegistry, keys: List, mode: str) -> float:
+    """Return the mean resolution cost in nanoseconds"""
+    resolve = registry.resolve
+    if mode == "pinned":
+        stmt = lambda: [resolve(name, service) for service, name in keys]
+    else:
+        stmt = lambda: [resolve(name) for name in keys]
+    best = min(timeit.repeat(stmt, number=1, repeat=5))
+    return best / len(keys) * 1e9
+
+
+def main() -> None:
+    logging.getLogger("src.server.mcp_registry").setLevel(logging.ERROR)
+    rng = random.Random(0)
+    services = list(ServiceType)
+
+    print(f"{'tools':>8} {'pinned ns':>10} {'namespaced ns':>14} {'bare ns':>8}")
+    for size in SIZES:
+        registry = build_registry(size)
+        names = [name for (_, name) in registry.routes]
+        hot = [(rng.choice(services), rng.choice(names)) for _ in range(HOT_KEYS)]
+        pinned = [rng.choice(hot) for _ in range(LOOKUPS)]
+        namespaced = [qualified_name(service, name) for service, name in pinned]
+        bare = [name for _, name in pinned]
+
+        print(
+            f"{len(registry.routes):>8} "
+            f"{bench(registry, pinned, 'pinned'):>10.1f} "
+            f"{bench(registry, namespaced, 'name'):>14.1f} "
+            f"{bench(registry, bare, 'name'):>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Scheduler benchmark - Interactive latency while a batch workload saturates a service
+
+A bulk client keeps ``BATCH_OUTSTANDING`` calls in flight against a service
+with ``SLOTS`` concurrent slots, while an agent sends one interactive call
+every ``INTERACTIVE_INTERVAL`` seconds. Every call runs a tool that blocks for
+``WORK`` seconds. The agent's latency is compared across three setups:
+
+- fifo: both clients share a client id and priority class, so calls are
+  served in arrival order
+- fair share: both send interactive calls under their own client ids
+- priority: the bulk client sends batch calls under its own client id
+
+Run from the repository root:
+
+    python -m benchmarks.bench_scheduler
+"""
+import asyncio
+import logging
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.utils.types import MCPService, Priority, ServiceType, Tool, ToolRequest, ToolSchema
+
+SLOTS = 8
+WORK = 0.005  # seconds per tool call
+BATCH_OUTSTANDING = 200
+INTERACTIVE_CALLS = 150
+INTERACTIVE_INTERVAL = 0.02  # seconds between interactive calls
+
+
+def work(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Simulate a blocking upstream call"""
+    time.sleep(WORK)
+    return params
+
+
+def build_registry() -> MCPRegistry:
+    """Register a service with a single slow tool"""
+    registry = MCPRegistry(ExecutionEngine(service_concurrency=SLOTS, service_queue_limit=BATCH_OUTSTANDING * 2))
+    service = MCPService(
+        type=ServiceType.GITHUB,
+        name="github",
+        description="Synthetic service",
+        base_url="http://localhost",
+    )
+    service.tools = [
+        Tool(name="work", service=ServiceType.GITHUB, description="",
+             parameters=ToolSchema(properties={}, required=[]), function=work),
+    ]
+    registry.register_service(service)
+    return registry
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of the samples"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def scenario(
+    registry: MCPRegistry,
+    batch_client: str,
+    batch_priority: Optional[Priority]
+) -> Dict[str, float]:
+    """Run the bulk workload and the interactive calls side by side"""
+    stop = asyncio.Event()
+    batch_done = 0
+    sequence = iter(range(10 ** 9))
+
+    async def bulk_worker() -> None:
+        nonlocal batch_done
+        while not stop.is_set():
+            await registry.execute_tool_async(ToolRequest(
+                tool_name="work",
+                parameters={"i": next(sequence)},
+                priority=batch_priority,
+                client_id=batch_client,
+            ))
+            batch_done += 1
+
+    async def interactive() -> List[float]:
+        latencies = []
+        for _ in range(INTERACTIVE_CALLS):
+            start = time.perf_counter()
+            response = await registry.execute_tool_async(ToolRequest(
+                tool_name="work",
+                parameters={"i": next(sequence)},
+                priority=Priority.INTERACTIVE,
+                client_id="agent",
+            ))
+            assert response.status == "success", response.error
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(INTERACTIVE_INTERVAL)
+        return latencies
+
+    workers = [asyncio.ensure_future(bulk_worker()) for _ in range(BATCH_OUTSTANDING)]
+    await asyncio.sleep(0.2)  # let the bulk workload fill the queue
+
+    start = time.perf_counter()
+    latencies = await interactive()
+    elapsed = time.perf_counter() - start
+    batch_rate = batch_done / (elapsed + 0.2)
+    stop.set()
+    await asyncio.gather(*workers)
+
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+        "mean": statistics.mean(latencies),
+        "batch_rate": batch_rate,
+    }
+
+
+def main() -> None:
+    logging.disable(logging.WARNING)
+    setups = (
+        ("fifo", "agent", Priority.INTERACTIVE),
+        ("fair share", "bulk", Priority.INTERACTIVE),
+        ("priority", "bulk", Priority.BATCH),
+    )
+    print(
+        f"{SLOTS} slots, {WORK * 1000:.0f} ms per call, {BATCH_OUTSTANDING} batch calls outstanding, "
+        f"{INTERACTIVE_CALLS} interactive calls"
+    )
+    print(f"{'setup':<12} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8} {'batch calls/s':>14}")
+    for name, batch_client, batch_priority in setups:
+        registry = build_registry()
+        result = asyncio.run(scenario(registry, batch_client, batch_priority))
+        registry.engine.shutdown()
+        print(
+            f"{name:<12} {result['p50'] * 1000:>8.1f} {result['p99'] * 1000:>8.1f} "
+            f"{result['mean'] * 1000:>8.1f} {result['batch_rate']:>14.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
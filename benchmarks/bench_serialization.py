@@ -0,0 +1,103 @@
+"""
+Serialization benchmark - Encoding a large tool response
+
+Serializes a ``ToolResponse`` holding ``ISSUES`` GitHub issues the way the
+API used to, and with the app's JSON provider:
+
+- before: ``response.dict()`` then ``jsonify`` with Flask's default provider
+- after (stdlib): the app's provider with orjson unavailable
+- after (orjson): the app's provider
+
+Reports milliseconds per response (median of ``REPEATS``) and the peak
+memory allocated while serializing one response, and checks that every
+mode produces the same bytes. Run from the repository root:
+
+    python -m benchmarks.bench_serialization
+"""
+import statistics
+import timeit
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+from flask import Flask, jsonify
+
+from src.server import serialization
+from src.server.serialization import JSONProvider
+from src.utils.types import ServiceType, ToolResponse
+
+ISSUES = 10_000
+REPEATS = 7
+NUMBER = 5
+
+
+def iter_issues(count: int) -> Iterator[Dict[str, Any]]:
+    """Issues shaped like the GitHub service's, one at a time"""
+    for i in range(count):
+        yield {
+            "id": 100 + i,
+            "repo_id": i % 50,
+            "title": f"Issue number {i} needs attention",
+            "body": "Found a problem in the authentication module that needs to be investigated " * 2,
+            "labels": ["bug", "critical"] if i % 3 else ["documentation"],
+            "state": "open" if i % 4 else "closed",
+            "assignee": {"id": i % 20, "login": f"user{i % 20}"},
+            "comments": i % 7,
+        }
+
+
+def make_issues(count: int) -> List[Dict[str, Any]]:
+    """Issues shaped like the GitHub service's"""
+    return list(iter_issues(count))
+
+
+def measure(serialize: Callable[[], bytes]) -> Dict[str, float]:
+    """Median time and peak memory of one serialization"""
+    times = timeit.repeat(serialize, repeat=REPEATS, number=NUMBER)
+    tracemalloc.start()
+    serialize()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": statistics.median(times) / NUMBER * 1000, "peak_mb": peak / 2 ** 20}
+
+
+def main() -> None:
+    response = ToolResponse(status="success", service=ServiceType.GITHUB, data=make_issues(ISSUES))
+
+    before_app = Flask("before")
+    after_app = Flask("after")
+    after_app.json = JSONProvider(after_app)
+
+    def before() -> bytes:
+        with before_app.app_context():
+            return jsonify(response.dict()).get_data()
+
+    def after() -> bytes:
+        with after_app.app_context():
+            return jsonify(response).get_data()
+
+    orjson = serialization.orjson
+    results = {}
+    outputs = {}
+    modes = [("before", before, None), ("after (stdlib)", after, None)]
+    if orjson is not None:
+        modes.append(("after (orjson)", after, orjson))
+    else:
+        print("orjson is not installed; skipping the orjson mode")
+    for mode, serialize, encoder in modes:
+        serialization.orjson = encoder
+        outputs[mode] = serialize()
+        results[mode] = measure(serialize)
+    serialization.orjson = orjson
+
+    size = len(outputs["before"])
+    print(f"ToolResponse with {ISSUES} issues, {size / 2 ** 20:.1f} MB of JSON")
+    print(f"{'mode':<16} {'ms':>8} {'peak MB':>8} {'speedup':>8} {'same bytes':>11}")
+    for mode, metrics in results.items():
+        print(
+            f"{mode:<16} {metrics['ms']:>8.1f} {metrics['peak_mb']:>8.1f} "
+            f"{results['before']['ms'] / metrics['ms']:>7.1f}x {str(outputs[mode] == outputs['before']):>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Startup benchmark - Import time and time to first response
+
+Starts a fresh interpreter per run, imports the server, registers the
+services and serves a first ``/github/list_repos`` request through the Flask
+test client. Compares lazy service loading (the default) with eager warmup
+(``MCP_EAGER_SERVICES=1``).
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+
+PROBE = """
+import json, logging, time
+start = time.perf_counter()
+logging.disable(logging.CRITICAL)
+from src.server.app import app, initialize_services
+imported = time.perf_counter()
+initialize_services()
+initialized = time.perf_counter()
+response = app.test_client().post('/github/list_repos', json={})
+assert response.json['status'] == 'success'
+responded = time.perf_counter()
+print(json.dumps({
+    'import': imported - start,
+    'register': initialized - imported,
+    'first_response': responded - initialized,
+    'total': responded - start,
+}))
+"""
+
+
+def run_probe(eager: bool) -> dict:
+    """Run the probe in a fresh interpreter"""
+    env = dict(os.environ, MCP_EAGER_SERVICES="1" if eager else "0")
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    print(f"median of {RUNS} runs, milliseconds")
+    print(f"{'mode':<6} {'import':>8} {'register':>9} {'first call':>11} {'total':>8}")
+    for mode, eager in (("lazy", False), ("eager", True)):
+        runs = [run_probe(eager) for _ in range(RUNS)]
+        medians = {key: statistics.median(run[key] for run in runs) * 1000 for key in runs[0]}
+        print(
+            f"{mode:<6} {medians['import']:>8.1f} {medians['register']:>9.1f} "
+            f"{medians['first_response']:>11.1f} {medians['total']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
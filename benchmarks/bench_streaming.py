@@ -0,0 +1,99 @@
+"""
+Streaming benchmark - Time to first byte and peak memory of a large list result
+
+Registers a tool generating ``ISSUES`` GitHub issues one at a time, like a
+tool paging through the GitHub API, and requests them through the WSGI app:
+
+- json: the regular response, with every issue collected and encoded first
+- ndjson: the streamed response (``Accept: application/x-ndjson``)
+
+Reports the time to the first byte of the body and to the last byte (median
+of ``REPEATS``), the body size, and the peak memory allocated while serving
+one request, in every thread. Run from the repository root:
+
+    python -m benchmarks.bench_streaming
+"""
+import logging
+import statistics
+import time
+import tracemalloc
+from typing import Dict, Tuple
+
+from benchmarks.bench_serialization import iter_issues
+from src.server.app import app
+from src.server.mcp_registry import registry
+from src.server.streaming import NDJSON
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+ISSUES = 100_000
+REPEATS = 3
+
+MODES = {
+    "json": {"Accept": "application/json"},
+    "ndjson": {"Accept": NDJSON},
+}
+
+
+def register_tool() -> None:
+    """Register a service whose ``list_issues`` tool generates its issues"""
+    service = MCPService(
+        type=ServiceType.GITHUB,
+        name="github",
+        description="Synthetic service",
+        base_url="http://localhost",
+    )
+    service.tools = [Tool(
+        name="list_issues",
+        service=ServiceType.GITHUB,
+        description="Generate issues",
+        parameters=ToolSchema(properties={"count": {"type": "integer", "description": "Issues"}}, required=[]),
+        function=lambda params: iter_issues(params["count"]),
+    )]
+    registry.register_service(service)
+
+
+def request(headers: Dict[str, str]) -> Tuple[float, float, int]:
+    """Seconds to the first and the last byte of the body, and its size in bytes"""
+    client = app.test_client()
+    start = time.perf_counter()
+    response = client.post(
+        "/execute",
+        json={"tool_name": "github.list_issues", "parameters": {"count": ISSUES}, "timeout_ms": 600_000},
+        headers=headers,
+        buffered=False,
+    )
+    first = None
+    size = 0
+    for chunk in response.response:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    response.close()
+    return first, time.perf_counter() - start, size
+
+
+def peak_mb(headers: Dict[str, str]) -> float:
+    """Peak memory allocated while serving one request"""
+    tracemalloc.start()
+    request(headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    register_tool()
+
+    print(f"list_issues returning {ISSUES} issues")
+    print(f"{'mode':<8} {'first byte ms':>14} {'last byte ms':>13} {'MB sent':>8} {'peak MB':>8}")
+    for mode, headers in MODES.items():
+        timings = [request(headers) for _ in range(REPEATS)]
+        first = statistics.median(timing[0] for timing in timings)
+        last = statistics.median(timing[1] for timing in timings)
+        size = timings[0][2]
+        print(f"{mode:<8} {first * 1000:>14.1f} {last * 1000:>13.1f} {size / 2 ** 20:>8.1f} {peak_mb(headers):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
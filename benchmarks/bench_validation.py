@@ -0,0 +1,75 @@
+"""
+Validation benchmark - Compiled validators versus per-call pydantic models
+
+Measures the per-call cost of validating ``create_issue`` style parameters
+with the validator compiled at registration time, against building a
+pydantic model from the schema on every call.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_validation
+"""
+import timeit
+from typing import Any, Dict, List, Optional
+
+from pydantic import create_model
+
+from src.server.validation import compile_validator
+from src.utils.types import ToolSchema
+
+NUMBER = 2_000
+
+SCHEMA = ToolSchema(
+    properties={
+        "repo_id": {"type": "integer", "description": "Repository ID"},
+        "title": {"type": "string", "description": "Issue title"},
+        "body": {"type": "string", "description": "Issue body"},
+        "labels": {"type": "array", "description": "Issue labels"},
+        "draft": {"type": "boolean", "description": "Whether the issue is a draft"},
+    },
+    required=["repo_id", "title"]
+)
+
+PARAMS = {"repo_id": 1, "title": "Security vulnerability found", "labels": ["security"], "draft": False}
+COERCED_PARAMS = {"repo_id": "1", "title": "Security vulnerability found", "draft": "false"}
+
+PYDANTIC_TYPES = {"integer": int, "string": str, "array": List[Any], "boolean": bool}
+
+
+def pydantic_per_call(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a pydantic model from the schema and validate with it"""
+    fields = {
+        name: (PYDANTIC_TYPES[spec["type"]], ...) if name in SCHEMA.required
+        else (Optional[PYDANTIC_TYPES[spec["type"]]], None)
+        for name, spec in SCHEMA.properties.items()
+    }
+    model = create_model("ToolParams", **fields)
+    return model(**params).dict(exclude_none=True)
+
+
+def per_call_us(stmt) -> float:
+    """Best mean cost of ``stmt`` in microseconds"""
+    return min(timeit.repeat(stmt, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    validate = compile_validator(SCHEMA)
+    pydantic_model = create_model(
+        "ToolParams",
+        **{name: (Optional[PYDANTIC_TYPES[spec["type"]]], None) for name, spec in SCHEMA.properties.items()}
+    )
+
+    results = {
+        "compiled validator": per_call_us(lambda: validate(PARAMS)),
+        "compiled validator (coercing)": per_call_us(lambda: validate(COERCED_PARAMS)),
+        "pydantic model, prebuilt": per_call_us(lambda: pydantic_model(**PARAMS)),
+        "pydantic model, built per call": per_call_us(lambda: pydantic_per_call(PARAMS)),
+    }
+
+    print(f"{'validator':<32} {'us/call':>8}")
+    for name, cost in results.items():
+        print(f"{name:<32} {cost:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,126 @@
 """
 Client API for interacting with the MCP server
 """
+import json
 import requests
 import logging
-from typing import Dict, Any, Optional, List
+from urllib3.util.request import ACCEPT_ENCODING
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+
+# Extra seconds the HTTP client waits beyond the tool deadline for the server's reply
+RESPONSE_GRACE = 1.0
+
+# Content type of streamed tool records, one JSON document per line
+NDJSON = "application/x-ndjson"
+# Bytes read at a time from a streamed response
+STREAM_CHUNK_SIZE = 64 * 1024
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class ToolStreamError(Exception):
+    """A streamed tool call that didn't succeed; ``response`` holds its status and error"""
+    
+    def __init__(self, response: Dict[str, Any]):
+        super().__init__(response.get("error") or f"Tool call ended with status {response.get('status')}")
+        self.response = response
+
+
 class MCPClient:
     """
     Client for interacting with the MCP server
     """
     
-    def __init__(self, base_url: str = "http://localhost:5000"):
-        """Initialize the client with the MCP server URL"""
+    def __init__(
+        self,
+        base_url: str = "http://localhost:5000",
+        client_id: Optional[str] = None,
+        priority: Optional[str] = None
+    ):
+        """
+        Initialize the client with the MCP server URL
+        
+        ``client_id`` identifies this client for fair queuing on the server, and
+        ``priority`` (``interactive``, ``batch`` or ``background``) is the
+        scheduling class of its tool calls.
+        """
         self.base_url = base_url
+        # The encodings urllib3 can decode: gzip and deflate, plus br and zstd when their libraries are installed
+        self.headers: Dict[str, str] = {"Accept-Encoding": ACCEPT_ENCODING}
+        if client_id is not None:
+            self.headers["X-MCP-Client"] = client_id
+        if priority is not None:
+            self.headers["X-MCP-Priority"] = priority
+        # Catalogs fetched so far, by path, with their ETag
+        self._catalogs: Dict[str, Tuple[str, Any]] = {}
+    
+    def _get_catalog(self, path: str) -> Any:
+        """Fetch a catalog, revalidating the copy fetched before with its ETag"""
+        cached = self._catalogs.get(path)
+        headers = {**self.headers, "If-None-Match": cached[0]} if cached else self.headers
+        response = requests.get(f"{self.base_url}{path}", headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        
+        catalog = response.json()
+        if "ETag" in response.headers:
+            self._catalogs[path] = (response.headers["ETag"], catalog)
+        return catalog
     
     def list_tools(self) -> List[Dict[str, Any]]:
-        """List all available tools"""
-        url = f"{self.base_url}/tools"
-        response = requests.get(url)
-        return response.json()
+        """List all available tools; unchanged catalogs aren't downloaded again"""
+        return self._get_catalog("/tools")
     
-    def list_services(self) -> List[Dict[str, Any]]:
-        """List all available services"""
+    def list_services(self, stats: bool = True) -> List[Dict[str, Any]]:
+        """
+        List all available services
+        
+        With ``stats``, each service carries its live circuit breaker, rate
+        limit and bulkhead stats; without, only the catalog is fetched and
+        revalidated like the tool list.
+        """
+        if not stats:
+            return self._get_catalog("/services?stats=0")
         url = f"{self.base_url}/services"
-        response = requests.get(url)
+        response = requests.get(url, headers=self.headers)
         return response.json()
     
-    def execute_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_options(
+        self,
+        timeout: Optional[float],
+        idempotency_key: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Request options for tool execution, with a tool deadline of ``timeout`` seconds"""
+        headers = self.headers
+        if idempotency_key is not None:
+            headers = {**headers, "Idempotency-Key": idempotency_key}
+        if fields is not None:
+            headers = {**headers, "X-MCP-Fields": ",".join(fields)}
+        if timeout is None:
+            return {"headers": headers}
+        return {
+            "headers": {**headers, "X-MCP-Timeout-Ms": str(int(timeout * 1000))},
+            "timeout": timeout + RESPONSE_GRACE
+        }
+    
+    def execute_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Execute a tool directly via the /execute endpoint
         
         This method is generic and doesn't specify which service should handle
-        the request, relying on the server's tool routing logic
+        the request, relying on the server's tool routing logic. Use a
+        namespaced tool name (e.g. ``github.list_issues``) to pin a service.
+        With ``timeout`` (seconds), the server gives up on the tool after that long.
+        Retrying a write tool with the same ``idempotency_key`` doesn't run it again.
+        With ``fields``, each record only holds those fields (dotted paths for nested ones).
         """
         url = f"{self.base_url}/execute"
         payload = {
@@ -43,29 +128,163 @@ class MCPClient:
             "parameters": parameters
         }
         
-        response = requests.post(url, json=payload)
+        response = requests.post(url, json=payload, **self._execute_options(timeout, idempotency_key, fields))
         return response.json()
     
-    def execute_github_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def paginate_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        limit: int = 100,
+        timeout: Optional[float] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Any]:
+        """
+        Execute a paginated list tool via the /execute endpoint and iterate over its records
+        
+        Each page is a call for up to ``limit`` records resuming from the
+        previous page's ``next_cursor``; ``timeout`` applies to each call.
+        Raises ``ValueError`` when a page fails.
+        """
+        cursor = None
+        while True:
+            page_parameters = {**parameters, "limit": limit}
+            if cursor is not None:
+                page_parameters["cursor"] = cursor
+            response = self.execute_tool(tool_name, page_parameters, timeout, fields=fields)
+            if response.get("status") != "success":
+                raise ValueError(response.get("error") or "Tool call failed")
+            
+            yield from response["data"]
+            cursor = response.get("next_cursor")
+            if cursor is None:
+                return
+    
+    def stream_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Any]:
+        """
+        Execute a tool via the /execute endpoint and iterate over its records as they arrive
+        
+        The server streams list results record by record, so the whole result
+        is never held in memory on either side. ``timeout`` (seconds) bounds
+        the whole call, streaming included. Raises ``ToolStreamError`` when the
+        call doesn't succeed, which may happen after some records were received.
+        """
+        url = f"{self.base_url}/execute"
+        payload = {
+            "tool_name": tool_name,
+            "parameters": parameters
+        }
+        options = self._execute_options(timeout, fields=fields)
+        options["headers"] = {**options["headers"], "Accept": NDJSON}
+        
+        with requests.post(url, json=payload, stream=True, **options) as response:
+            if response.headers.get("Content-Type", "").split(";")[0] != NDJSON:
+                raise ToolStreamError(response.json())
+            
+            lines = (line for line in response.iter_lines(chunk_size=STREAM_CHUNK_SIZE) if line)
+            header = json.loads(next(lines, b'{"status": "error", "error": "Empty stream"}'))
+            if header["status"] != "success":
+                raise ToolStreamError(header)
+            
+            # The last line is the trailer, so each record is held until the next line arrives
+            previous = None
+            for line in lines:
+                if previous is not None:
+                    yield json.loads(previous)
+                previous = line
+            
+            trailer = json.loads(previous) if previous is not None else None
+            if not isinstance(trailer, dict) or "count" not in trailer:
+                raise ToolStreamError({"status": "error", "error": "Stream ended before its trailer"})
+            if trailer["status"] != "success":
+                raise ToolStreamError(trailer)
+    
+    def execute_batch(
+        self, tool_requests: List[Dict[str, Any]], timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute several independent tools in one round-trip via /execute/batch
+        
+        Each request is a dict with ``tool_name``, ``parameters`` and optional
+        ``service`` and ``fields``. Results are returned in request order, each with its own status.
+        """
+        url = f"{self.base_url}/execute/batch"
+        response = requests.post(url, json={"requests": tool_requests}, **self._execute_options(timeout))
+        payload = response.json()
+        
+        if response.status_code != 200:
+            raise ValueError(payload.get("error", "Batch request failed"))
+        
+        return payload["results"]
+    
+    def execute_workflow(
+        self,
+        steps: List[Dict[str, Any]],
+        outputs: Optional[Any] = None,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a workflow of dependent tool calls in one round-trip via /workflows/execute
+        
+        Each step is a dict with an ``id``, ``tool_name`` and ``parameters``, which
+        may reference earlier steps' data (``"${repos.0.id}"``). ``outputs`` lists
+        the step IDs to return, or maps output names to references; by default
+        the steps nothing depends on are returned. The response holds the
+        ``outputs`` and the status of every step.
+        """
+        url = f"{self.base_url}/workflows/execute"
+        payload: Dict[str, Any] = {"steps": steps}
+        if outputs is not None:
+            payload["outputs"] = outputs
+        
+        response = requests.post(url, json=payload, **self._execute_options(timeout))
+        result = response.json()
+        
+        if response.status_code != 200:
+            raise ValueError(result.get("error", "Workflow request failed"))
+        
+        return result
+    
+    def execute_github_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Execute a GitHub tool via the /github/{tool_name} endpoint
         
         This method explicitly specifies the GitHub service should handle
-        the request, but the vulnerability may route it elsewhere
+        the request; the server pins routing to that service
         """
         url = f"{self.base_url}/github/{tool_name}"
-        response = requests.post(url, json=parameters)
+        response = requests.post(url, json=parameters, **self._execute_options(timeout, idempotency_key, fields))
         return response.json()
     
-    def execute_linear_tool(self, tool_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def execute_linear_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        timeout: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
         """
         Execute a Linear tool via the /linear/{tool_name} endpoint
         
         This method explicitly specifies the Linear service should handle
-        the request, but the vulnerability may route it elsewhere
+        the request; the server pins routing to that service
         """
         url = f"{self.base_url}/linear/{tool_name}"
-        response = requests.post(url, json=parameters)
+        response = requests.post(url, json=parameters, **self._execute_options(timeout, idempotency_key, fields))
         return response.json()
 
 
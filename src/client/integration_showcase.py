@@ -164,5 +164,41 @@ seamless integrations across multiple project management tools.
 """)
 
 
+def showcase_workflow():
+    """
+    Showcase the same data retrieval as a single server-side workflow
+    
+    The independent steps run in parallel on the server, the issue lookups use
+    the IDs returned by earlier steps, and only the requested outputs come back.
+    """
+    print_separator()
+    print("\nWORKFLOW: Unified Project Management in one request")
+    print_separator()
+    
+    steps = [
+        {"id": "repos", "tool_name": "github.list_repos", "parameters": {}},
+        {"id": "github_issues", "tool_name": "github.list_issues", "parameters": {"repo_id": "${repos.0.id}"}},
+        {"id": "teams", "tool_name": "linear.list_teams", "parameters": {}},
+        {"id": "linear_issues", "tool_name": "linear.list_issues", "parameters": {"team_id": "${teams.0.id}"}},
+    ]
+    outputs = {
+        "repository": "${repos.0.name}",
+        "github_issues": "${github_issues}",
+        "team": "${teams.0.name}",
+        "linear_issues": "${linear_issues}",
+    }
+    print("API call: client.execute_workflow(steps, outputs)")
+    result = client.execute_workflow(steps, outputs)
+    
+    print(f"Status: {result['status']}")
+    for step_id, step in result['steps'].items():
+        print(f"- {step_id}: {step['status']} ({step['service']}, {step['duration_ms']} ms)")
+    
+    outputs = result['outputs']
+    print(f"\nIssues of repository '{outputs['repository']}': {len(outputs['github_issues'])}")
+    print(f"Issues of team '{outputs['team']}': {len(outputs['linear_issues'])}")
+
+
 if __name__ == "__main__":
-    showcase_cross_service_integration()
\ No newline at end of file
+    showcase_cross_service_integration()
+    showcase_workflow()
\ No newline at end of file
@@ -8,21 +8,19 @@ import os
 import logging
 from dotenv import load_dotenv
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Import and run the server
 from src.server.app import app, initialize_services
+from src.server.logs import configure_logging
 
 # Initialize application
 def init_app():
+    # Configure logging before anything logs
+    configure_logging()
     # Initialize services
     initialize_services()
     return app
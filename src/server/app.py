@@ -2,83 +2,501 @@
 MCP Server Flask application
 """
 import os
+import hmac
 import json
 import logging
-from flask import Flask, request, jsonify
+from functools import wraps
+from typing import Optional, TypeVar, Union
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 
-from src.utils.types import ToolRequest, ServiceType
-from src.server.mcp_registry import registry
-from src.services.github.service import initialize_github_service
-from src.services.linear.service import initialize_linear_service
+from src.utils.types import Priority, ToolRequest, ToolResponse, ServiceType, WorkflowRequest, WorkflowResponse
+from src.server.mcp_registry import RegistrySnapshot, registry
+from src.server.catalog import Catalog, CatalogEntry
+from src.server.compression import CODECS, compress_response, negotiate
+from src.server.metrics import CONTENT_TYPE, REQUEST_BYTES, RESPONSE_BYTES, metrics
+from src.server.plugins import plugin_loader
+from src.server.profiling import profiler
+from src.server.projection import projection_stats
+from src.server.serialization import JSONProvider, dumps
+from src.server.streaming import NDJSON, ToolStream
+from src.server.tracing import current_request_id, parse_traceparent, span, trace_buffer, tracer
+from src.server.workflows import WorkflowError
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# A request that headers apply to
+AnyRequest = TypeVar("AnyRequest", ToolRequest, WorkflowRequest)
+
+# Maximum number of tool requests accepted by /execute/batch
+MAX_BATCH_SIZE = int(os.environ.get('MCP_MAX_BATCH_SIZE', 100))
+
+# Maximum number of steps in a workflow accepted by /workflows/execute
+MAX_WORKFLOW_STEPS = int(os.environ.get('MCP_MAX_WORKFLOW_STEPS', 100))
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = JSONProvider(app)
 CORS(app)
 
+# Initialize every service at startup instead of on first use
+EAGER_SERVICES = os.environ.get('MCP_EAGER_SERVICES', '').lower() in ('1', 'true', 'yes')
+
+# Admin endpoints require this token in the X-Admin-Token header, and are disabled without one
+ADMIN_TOKEN = os.environ.get('MCP_ADMIN_TOKEN')
+
+
 # Initialize MCP services
-def initialize_services():
-    """Initialize and register all MCP services"""
-    # Initialize GitHub service
-    github_service = initialize_github_service()
-    registry.register_service(github_service)
+def initialize_services(eager: bool = EAGER_SERVICES):
+    """
+    Register all MCP services
     
-    # Initialize Linear service
-    linear_service = initialize_linear_service()
-    registry.register_service(linear_service)
+    Services are discovered from the service manifest and entry points.
+    Unless ``eager`` is set, a service module is only imported and
+    initialized on the first call to one of its tools.
+    """
+    plugin_loader.register_all(eager=eager)
     
-    logger.info("All MCP services initialized and registered")
+    logger.info("All MCP services registered")
+
+
+def apply_request_headers(tool_request: AnyRequest, single: bool = False) -> AnyRequest:
+    """
+    Apply the request headers to a tool or workflow request that doesn't carry its own values
+    
+    ``X-MCP-Deadline`` is an absolute Unix time in seconds and
+    ``X-MCP-Timeout-Ms`` a timeout relative to receipt. ``X-MCP-Priority``
+    sets the scheduling class, and ``X-MCP-Client`` identifies the API client
+    for fair queuing (the remote address when unset). ``Idempotency-Key`` and
+    ``X-MCP-Fields`` (comma-separated fields) only apply to ``single`` tool
+    requests, not to batch items or workflows.
+    """
+    headers = request.headers
+    if tool_request.deadline is None and 'X-MCP-Deadline' in headers:
+        tool_request.deadline = float(headers['X-MCP-Deadline'])
+    if tool_request.timeout_ms is None and 'X-MCP-Timeout-Ms' in headers:
+        tool_request.timeout_ms = float(headers['X-MCP-Timeout-Ms'])
+    if tool_request.priority is None and 'X-MCP-Priority' in headers:
+        tool_request.priority = Priority(headers['X-MCP-Priority'])
+    if tool_request.client_id is None:
+        tool_request.client_id = headers.get('X-MCP-Client', request.remote_addr)
+    if not single or not isinstance(tool_request, ToolRequest):
+        return tool_request
+    if tool_request.idempotency_key is None:
+        tool_request.idempotency_key = headers.get('Idempotency-Key')
+    if tool_request.fields is None and 'X-MCP-Fields' in headers:
+        tool_request.fields = [field.strip() for field in headers['X-MCP-Fields'].split(',')]
+    return tool_request
+
+
+def admin_only(view):
+    """Reject requests without the admin token; admin endpoints are disabled while none is configured"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({
+                "status": "error",
+                "error": "Admin endpoints are disabled: set MCP_ADMIN_TOKEN to enable them"
+            }), 403
+        if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), ADMIN_TOKEN.encode()):
+            return jsonify({
+                "status": "error",
+                "error": "Admin token required"
+            }), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def profiled(service: Optional[ServiceType] = None):
+    """
+    Profile a tool view's requests while a profiling session is armed
+    
+    The tool name comes from the ``tool_name`` URL argument, or else from the
+    request body, and is matched bare and namespaced with ``service``.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not profiler.armed:
+                return view(*args, **kwargs)
+            
+            tool_name, tool_service = kwargs.get('tool_name'), service
+            if tool_name is None:
+                data = request.get_json(silent=True)
+                if isinstance(data, dict):
+                    tool_name, tool_service = data.get('tool_name'), data.get('service')
+            tool_name = str(tool_name)
+            bare_name = tool_name.split('.', 1)[-1]
+            names = {tool_name, bare_name}
+            if tool_service:
+                names.add(f"{getattr(tool_service, 'value', tool_service)}.{bare_name}")
+            
+            session = profiler.claim(names)
+            if session is None:
+                return view(*args, **kwargs)
+            return session.run("request", view, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render(response: Union[ToolResponse, WorkflowResponse]) -> Response:
+    """Serialize a tool or workflow response"""
+    with span("serialize"):
+        return jsonify(response)
+
+
+def wants_stream() -> bool:
+    """Whether the client asked for a tool's records as an NDJSON stream"""
+    return request.accept_mimetypes.best_match(('application/json', NDJSON)) == NDJSON
+
+
+def ndjson_lines(stream: ToolStream):
+    """
+    Encode a tool stream as NDJSON, a chunk per batch of records
+    
+    The first line is a ``ToolResponse`` with the call's status and no data,
+    and the only line when the call didn't succeed. The records follow, one
+    per line, then a trailer with the final ``status``, ``service`` and
+    ``error`` of the call, the ``count`` of records sent and the
+    ``next_cursor`` of a page.
+    """
+    try:
+        header = stream.wait()
+        yield dumps(header) + b"\n"
+        if header.status != "success":
+            return
+        
+        for batch in stream.batches():
+            yield b"".join([dumps(record) + b"\n" for record in batch])
+        
+        response = stream.result()
+        yield dumps({
+            "status": response.status,
+            "service": response.service,
+            "error": response.error,
+            "count": stream.count,
+            "next_cursor": response.next_cursor
+        }) + b"\n"
+    finally:
+        stream.close()
+
+
+def execute(tool_request: ToolRequest) -> Response:
+    """Execute a tool, streaming its records when the client asked for it"""
+    if wants_stream():
+        return Response(ndjson_lines(registry.stream_tool(tool_request)), mimetype=NDJSON)
+    return render(registry.execute_tool(tool_request))
+
+
+@app.before_request
+def start_trace():
+    """Assign the request ID and start tracing the request if it is sampled"""
+    g.trace = tracer.start_request(
+        f"{request.method} {request.url_rule.rule if request.url_rule else 'unmatched'}",
+        request.headers.get('X-Request-ID', '')[:128] or None,
+        force=request.headers.get('X-MCP-Trace') == '1',
+        parent=parse_traceparent(request.headers.get('traceparent')),
+        path=request.path
+    )
+
+
+@app.after_request
+def add_request_id(response):
+    """Echo the request ID and record the status code on the trace"""
+    root, _ = g.get('trace', (None, None))
+    if root is not None:
+        root.set_attribute("status_code", response.status_code)
+    request_id = current_request_id.get()
+    if request_id is not None:
+        response.headers['X-Request-ID'] = request_id
+    return response
+
+
+@app.teardown_request
+def finish_trace(exc):
+    """Export the request's trace"""
+    trace = g.pop('trace', None)
+    if trace is not None:
+        tracer.finish_request(*trace)
+
+
+@app.after_request
+def record_payload_sizes(response):
+    """Record request and response body sizes per endpoint"""
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    REQUEST_BYTES.observe((endpoint,), request.content_length or 0)
+    
+    # Measuring a streamed body would buffer all of it
+    size = None if response.is_streamed else response.calculate_content_length()
+    if size is not None:
+        RESPONSE_BYTES.observe((endpoint,), size)
+    
+    return response
+
+
+# Registered after record_payload_sizes so that it runs first, and sizes are measured on the wire
+@app.after_request
+def compress(response):
+    """Compress responses for clients accepting it"""
+    return compress_response(response, request.accept_encodings)
+
+
+@app.route('/metrics', methods=['GET'])
+def export_metrics():
+    """Export metrics in the Prometheus text format"""
+    return Response(metrics.export(), mimetype=None, content_type=CONTENT_TYPE)
+
+
+def build_tool_catalog(snapshot: RegistrySnapshot):
+    """Describe every registered tool"""
+    return [{
+        "name": entry.tool.name,
+        "service": entry.tool.service,
+        "description": entry.tool.description,
+        "parameters": entry.tool.parameters
+    } for entry in snapshot.routes.values()]
+
+
+def build_service_catalog(snapshot: RegistrySnapshot):
+    """Describe every registered service, without its live stats"""
+    return [{
+        "type": service.type,
+        "name": service.name,
+        "description": service.description,
+        "tools": [tool.name for tool in service.tools]
+    } for service in snapshot.services.values()]
+
+
+tool_catalog = Catalog(registry, build_tool_catalog)
+service_catalog = Catalog(registry, build_service_catalog)
+
+
+def serve_catalog(entry: CatalogEntry) -> Response:
+    """
+    Serve a precomputed catalog
+    
+    Answers 304 when ``If-None-Match`` holds the ETag of any variant, and
+    sends the body precompressed with the encoding negotiated with the client.
+    """
+    encoding = negotiate(request.accept_encodings)
+    body = entry.compressed(encoding) if encoding else None
+    if body is None:
+        encoding = None
+    
+    if any(request.if_none_match.contains(entry.variant_etag(variant)) for variant in (None, *CODECS)):
+        response = Response(status=304)
+    elif encoding is None:
+        response = Response(entry.body, mimetype='application/json')
+    else:
+        response = Response(body, mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+    
+    response.set_etag(entry.variant_etag(encoding))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
 
 
 @app.route('/tools', methods=['GET'])
 def list_tools():
     """List all available tools"""
-    tools = registry.list_tools()
-    return jsonify([{
-        "name": tool.name,
-        "service": tool.service,
-        "description": tool.description,
-        "parameters": tool.parameters.dict()
-    } for tool in tools])
+    return serve_catalog(tool_catalog.get())
 
 
 @app.route('/services', methods=['GET'])
 def list_services():
-    """List all available services"""
-    services = registry.list_services()
+    """
+    List all available services with their live stats
+    
+    With ``?stats=0`` the stats are left out and the precomputed catalog is
+    served, with ETag validation.
+    """
+    entry = service_catalog.get()
+    if request.args.get('stats') in ('0', 'false'):
+        return serve_catalog(entry)
+    
+    bulkheads = registry.engine.bulkhead_stats()
     return jsonify([{
-        "type": service.type,
-        "name": service.name,
-        "description": service.description,
+        **service,
+        "circuit_breaker": registry.breakers.stats(service["type"]),
+        "rate_limit": registry.limiters.stats(service["type"]),
+        "bulkhead": bulkheads.get(service["type"])
+    } for service in entry.content])
+
+
+@app.route('/admin/services/<service_type>/reload', methods=['POST'])
+@admin_only
+def reload_service(service_type):
+    """
+    Hot-reload a service
+    
+    Re-runs the service initializer and swaps the new service into the
+    registry. Calls already dispatched to the old service run to completion.
+    """
+    try:
+        service_type = ServiceType(service_type)
+        plugin_loader.plugins[service_type]
+    except (ValueError, KeyError):
+        return jsonify({
+            "status": "error",
+            "error": f"Unknown service '{service_type}'"
+        }), 404
+    
+    try:
+        service = plugin_loader.reload(service_type)
+    except Exception as e:
+        logger.error(f"Error reloading service {service_type}: {str(e)}")
+        return jsonify({
+            "status": "error",
+            "service": service_type,
+            "error": f"Error reloading service: {str(e)}"
+        }), 500
+    
+    return jsonify({
+        "status": "success",
+        "service": service_type,
+        "version": registry.version,
         "tools": [tool.name for tool in service.tools]
-    } for service in services])
+    })
+
+
+@app.route('/admin/traces', methods=['GET'])
+@admin_only
+def list_traces():
+    """List the most recent sampled traces, newest first (``?limit=`` caps the count)"""
+    limit = request.args.get('limit', type=int)
+    return jsonify({
+        "sample_rate": tracer.sample_rate,
+        "traces": trace_buffer.traces(limit)
+    })
+
+
+@app.route('/admin/traces/<trace_id>', methods=['GET'])
+@admin_only
+def get_trace(trace_id):
+    """Get a buffered trace by its trace ID: the request ID, or the caller's trace ID with a traceparent"""
+    trace = trace_buffer.get(trace_id)
+    if trace is None:
+        return jsonify({
+            "status": "error",
+            "error": f"Trace '{trace_id}' not found"
+        }), 404
+    return jsonify(trace)
+
+
+@app.route('/admin/profile', methods=['POST'])
+@admin_only
+def start_profile():
+    """
+    Profile the next tool requests
+    
+    Takes ``requests`` (default 100) and an optional ``tool`` name, bare or
+    namespaced, to only profile requests for that tool. Replaces the results
+    of the previous session.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        session = profiler.start(int(data.get('requests', 100)), data.get('tool'))
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            "status": "error",
+            "error": f"Error starting profiling: {str(e)}"
+        }), 400
+    return jsonify({"status": "success", "profile": session.to_dict()})
+
+
+@app.route('/admin/profile', methods=['DELETE'])
+@admin_only
+def stop_profile():
+    """Stop profiling; the results collected so far are kept"""
+    session = profiler.stop()
+    return jsonify({"status": "success", "profile": session.to_dict() if session else None})
+
+
+def no_profile_session():
+    """Response for profile requests made before any session was started"""
+    return jsonify({
+        "status": "error",
+        "error": "No profiling session"
+    }), 404
+
+
+@app.route('/admin/profile', methods=['GET'])
+@admin_only
+def get_profile():
+    """
+    Describe the profiling session with its top functions
+    
+    ``?sort=cumtime`` orders them by cumulative instead of own time, and
+    ``?limit=`` caps the count (default 20).
+    """
+    session = profiler.session
+    if session is None:
+        return no_profile_session()
+    return jsonify({
+        "active": profiler.armed,
+        "profile": session.to_dict(),
+        "top": session.top(request.args.get('sort', 'tottime'), request.args.get('limit', 20, type=int))
+    })
+
+
+@app.route('/admin/profile/pstats', methods=['GET'])
+@admin_only
+def download_profile_pstats():
+    """Download the aggregated profile as a pstats dump (load it with ``pstats.Stats(path)``)"""
+    session = profiler.session
+    if session is None:
+        return no_profile_session()
+    return Response(session.dump(), mimetype='application/octet-stream', headers={
+        'Content-Disposition': 'attachment; filename=mcp.pstats'
+    })
+
+
+@app.route('/admin/profile/folded', methods=['GET'])
+@admin_only
+def download_profile_folded():
+    """Download the aggregated profile as folded stacks, in microseconds, for flame graph tools"""
+    session = profiler.session
+    if session is None:
+        return no_profile_session()
+    return Response(session.folded(), mimetype='text/plain')
+
+
+@app.route('/stats', methods=['GET'])
+def registry_stats():
+    """
+    Report cache and request coalescing counters, keyed by namespaced tool name,
+    and idempotency and projection plan counters
+    """
+    return jsonify({
+        "cache": registry.cache.stats(),
+        "coalescing": registry.single_flight.stats(),
+        "idempotency": registry.idempotency.stats(),
+        "projection": projection_stats()
+    })
 
 
 @app.route('/execute', methods=['POST'])
+@profiled()
 def execute_tool():
     """Execute a tool"""
-    data = request.json
+    with span("parse_json"):
+        data = request.json
     
     try:
         # Parse the request
-        tool_request = ToolRequest(**data)
+        with span("validate_request"):
+            tool_request = apply_request_headers(ToolRequest(**data), single=True)
         
-        # Execute the tool
-        response = registry.execute_tool(tool_request)
-        
-        # Return the response
-        return jsonify(response.dict())
+        # Execute the tool and return the response
+        return execute(tool_request)
     
     except Exception as e:
-        logger.error(f"Error executing tool: {str(e)}")
+        logger.error("Error executing tool: %s", e)
         return jsonify({
             "status": "error",
             "service": ServiceType.GITHUB,  # Default service for error
@@ -86,28 +504,120 @@ def execute_tool():
         }), 400
 
 
+@app.route('/execute/batch', methods=['POST'])
+def execute_batch():
+    """
+    Execute a batch of independent tools concurrently
+    
+    Accepts a list of tool requests (or ``{"requests": [...]}``) and returns
+    one result per request, in order. Identical requests are executed once.
+    """
+    with span("parse_json"):
+        data = request.json
+    items = data.get("requests") if isinstance(data, dict) else data
+    
+    if not isinstance(items, list):
+        return jsonify({
+            "status": "error",
+            "error": "Expected a list of tool requests"
+        }), 400
+    
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({
+            "status": "error",
+            "error": f"Batch of {len(items)} requests exceeds the limit of {MAX_BATCH_SIZE}"
+        }), 400
+    
+    # Parse every request up front so one bad item doesn't fail the batch
+    results = [None] * len(items)
+    tool_requests = []
+    positions = []
+    with span("validate_request", batch_size=len(items)):
+        for index, item in enumerate(items):
+            try:
+                tool_requests.append(apply_request_headers(ToolRequest(**item)))
+                positions.append(index)
+            except Exception as e:
+                results[index] = {
+                    "status": "error",
+                    "service": ServiceType.GITHUB,  # Default service for error
+                    "data": None,
+                    "error": f"Error processing request: {str(e)}"
+                }
+    
+    # Execute the valid requests concurrently
+    responses = registry.execute_batch(tool_requests)
+    for index, response in zip(positions, responses):
+        results[index] = response
+    
+    with span("serialize"):
+        return jsonify({
+            "status": "success",
+            "results": results
+        })
+
+
+@app.route('/workflows/execute', methods=['POST'])
+def execute_workflow():
+    """
+    Execute a workflow: a DAG of tool calls in a single request
+    
+    Steps can reference the output of earlier steps (``${step_id.path}``) and
+    run in parallel when independent. Only the requested outputs are returned,
+    along with the status of every step.
+    """
+    with span("parse_json"):
+        data = request.json
+    
+    try:
+        with span("validate_request"):
+            workflow_request = apply_request_headers(WorkflowRequest(**data))
+    except Exception as e:
+        return jsonify({
+            "status": "error",
+            "error": f"Error processing request: {str(e)}"
+        }), 400
+    
+    if len(workflow_request.steps) > MAX_WORKFLOW_STEPS:
+        return jsonify({
+            "status": "error",
+            "error": f"Workflow of {len(workflow_request.steps)} steps exceeds the limit of {MAX_WORKFLOW_STEPS}"
+        }), 400
+    
+    try:
+        response = registry.execute_workflow(workflow_request)
+    except WorkflowError as e:
+        return jsonify({
+            "status": "error",
+            "error": f"Invalid workflow: {str(e)}"
+        }), 400
+    
+    return render(response)
+
+
 @app.route('/github/<tool_name>', methods=['POST'])
+@profiled(ServiceType.GITHUB)
 def execute_github_tool(tool_name):
     """
     Execute a GitHub tool directly
     """
-    data = request.json or {}
+    with span("parse_json"):
+        data = request.json or {}
     
     try:
         # Create a tool request
-        tool_request = ToolRequest(
-            tool_name=tool_name,
-            parameters=data
-        )
+        with span("validate_request"):
+            tool_request = apply_request_headers(ToolRequest(
+                tool_name=tool_name,
+                parameters=data,
+                service=ServiceType.GITHUB
+            ), single=True)
         
-        # Execute the tool
-        response = registry.execute_tool(tool_request)
-        
-        # Return the response
-        return jsonify(response.dict())
+        # Execute the tool and return the response
+        return execute(tool_request)
     
     except Exception as e:
-        logger.error(f"Error executing GitHub tool: {str(e)}")
+        logger.error("Error executing GitHub tool: %s", e)
         return jsonify({
             "status": "error",
             "service": ServiceType.GITHUB,
@@ -116,27 +626,28 @@ def execute_github_tool(tool_name):
 
 
 @app.route('/linear/<tool_name>', methods=['POST'])
+@profiled(ServiceType.LINEAR)
 def execute_linear_tool(tool_name):
     """
     Execute a Linear tool directly
     """
-    data = request.json or {}
+    with span("parse_json"):
+        data = request.json or {}
     
     try:
         # Create a tool request
-        tool_request = ToolRequest(
-            tool_name=tool_name,
-            parameters=data
-        )
-        
-        # Execute the tool
-        response = registry.execute_tool(tool_request)
+        with span("validate_request"):
+            tool_request = apply_request_headers(ToolRequest(
+                tool_name=tool_name,
+                parameters=data,
+                service=ServiceType.LINEAR
+            ), single=True)
         
-        # Return the response
-        return jsonify(response.dict())
+        # Execute the tool and return the response
+        return execute(tool_request)
     
     except Exception as e:
-        logger.error(f"Error executing Linear tool: {str(e)}")
+        logger.error("Error executing Linear tool: %s", e)
         return jsonify({
             "status": "error",
             "service": ServiceType.LINEAR,
@@ -0,0 +1,153 @@
+"""
+Result cache module - TTL + LRU caching of read-only tool results
+
+Caching is opt-in per tool through ``Tool.cache_ttl``. Each cached tool gets
+its own bounded LRU store keyed by canonicalized parameters. Calls to a tool
+with ``Tool.mutates`` set invalidate every cached result of the same service
+when they time out and when they finish, successful or not, as the write may
+have landed either way. Invalidation bumps each cache's generation: a read that started
+before it doesn't store its result, which may predate the write.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.utils.types import ServiceType, Tool
+
+
+class ResultCache:
+    """Bounded LRU cache with a fixed TTL for a single tool"""
+
+    def __init__(self, ttl: float, max_entries: int):
+        """Initialize the cache"""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.stale_puts = 0
+        self.generation = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if it is missing or expired"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full
+
+        With the ``generation`` read before computing the value, the value is
+        dropped if the cache was cleared since.
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                self.stale_puts += 1
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached value, and the values of reads still in progress"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and size of the cache"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale_puts": self.stale_puts,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl
+            }
+
+
+class ToolCache:
+    """Per-tool result caches for every registered service"""
+
+    def __init__(self):
+        """Initialize the tool cache"""
+        self._caches: Dict[Tuple[ServiceType, str], ResultCache] = {}
+        self._lock = threading.Lock()
+
+    def cache_for(self, tool: Tool) -> Optional[ResultCache]:
+        """Get or create the cache of a tool, or None if the tool is not cacheable"""
+        if tool.cache_ttl is None or tool.mutates:
+            return None
+
+        key = (tool.service, tool.name)
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is None or cache.ttl != tool.cache_ttl or cache.max_entries != tool.cache_max_entries:
+                cache = self._caches[key] = ResultCache(tool.cache_ttl, tool.cache_max_entries)
+            return cache
+
+    def invalidate_service(self, service_type: ServiceType) -> None:
+        """Drop cached results of every tool of a service"""
+        with self._lock:
+            caches = [cache for (service, _), cache in self._caches.items() if service == service_type]
+        for cache in caches:
+            cache.clear()
+
+    def invalidating(
+        self,
+        function: Callable[[Dict[str, Any]], Any],
+        service_type: ServiceType,
+        is_async: bool
+    ) -> Callable[[Dict[str, Any]], Any]:
+        """
+        Wrap a write tool function to invalidate its service once it finishes
+
+        Whatever the outcome: a write that failed, was cancelled or was
+        abandoned at its deadline may have landed all the same.
+        """
+        if is_async:
+            async def call_async(parameters: Dict[str, Any]) -> Any:
+                try:
+                    return await function(parameters)
+                finally:
+                    self.invalidate_service(service_type)
+            return call_async
+
+        def call(parameters: Dict[str, Any]) -> Any:
+            try:
+                return function(parameters)
+            finally:
+                self.invalidate_service(service_type)
+        return call
+
+    def drop_service(self, service_type: ServiceType) -> None:
+        """Forget the caches of a service, e.g. when it is replaced"""
+        with self._lock:
+            for key in [key for key in self._caches if key[0] == service_type]:
+                del self._caches[key]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Cache counters keyed by namespaced tool name"""
+        with self._lock:
+            caches = list(self._caches.items())
+        return {f"{service.value}.{name}": cache.stats() for (service, name), cache in caches}
@@ -0,0 +1,74 @@
+"""
+Catalog module - Precomputed tool and service catalog responses
+
+Agents fetch the tool and service catalogs at the start of every session,
+and the catalogs only change when a service is registered or replaced. A
+``Catalog`` builds its content from a registry snapshot, encodes it once and
+keeps the bytes, a strong ETag and, lazily, a compressed variant per
+negotiated encoding until the registry version changes.
+"""
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from src.server.mcp_registry import MCPRegistry, RegistrySnapshot
+from src.server.compression import MIN_SIZE, compress
+from src.server.serialization import dumps
+
+
+class CatalogEntry:
+    """The encoded catalog of one registry version"""
+
+    __slots__ = ("version", "content", "body", "etag", "_variants", "_lock")
+
+    def __init__(self, version: int, content: Any):
+        """Encode the content"""
+        self.version = version
+        self.content = content
+        self.body = dumps(content) + b"\n"
+        self.etag = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+        self._variants: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def variant_etag(self, encoding: Optional[str]) -> str:
+        """ETag of the body compressed with ``encoding`` (None for the plain body)"""
+        return self.etag if encoding is None else f"{self.etag}-{encoding}"
+
+    def compressed(self, encoding: str) -> Optional[bytes]:
+        """The body compressed with ``encoding``, compressed on first use; None when too small to bother"""
+        if len(self.body) < MIN_SIZE:
+            return None
+        variant = self._variants.get(encoding)
+        if variant is None:
+            with self._lock:
+                variant = self._variants.get(encoding)
+                if variant is None:
+                    variant = self._variants[encoding] = compress(encoding, self.body)
+        return variant
+
+
+class Catalog:
+    """A catalog rebuilt only when the registry version changes"""
+
+    def __init__(self, registry: MCPRegistry, build: Callable[[RegistrySnapshot], Any]):
+        """Initialize the catalog; ``build`` makes its JSON content from a snapshot"""
+        self.registry = registry
+        self.build = build
+        self.builds = 0
+        self._entry: Optional[CatalogEntry] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> CatalogEntry:
+        """The catalog of the current registry snapshot"""
+        snapshot = self.registry.snapshot
+        entry = self._entry
+        if entry is not None and entry.version == snapshot.version:
+            return entry
+
+        with self._lock:
+            snapshot = self.registry.snapshot
+            entry = self._entry
+            if entry is None or entry.version != snapshot.version:
+                entry = self._entry = CatalogEntry(snapshot.version, self.build(snapshot))
+                self.builds += 1
+            return entry
@@ -0,0 +1,104 @@
+"""
+Request coalescing module - Single-flight execution of identical tool calls
+
+Concurrent identical calls (same service, tool and canonical parameters)
+share one execution: the first caller runs the tool and every other caller
+waits for its result. Waiters stop piggybacking after ``max_wait`` seconds
+and run the call themselves. Results that only hold for the caller who ran
+the call, such as a timeout at its deadline, aren't shared: waiters run the
+call again, coalescing among themselves.
+"""
+import asyncio
+import os
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, Optional
+
+DEFAULT_MAX_WAIT = float(os.environ.get("MCP_COALESCE_MAX_WAIT", 5))
+
+
+class SingleFlight:
+    """
+    Single-flight group keyed by request
+
+    All methods must be called on the execution engine loop.
+    """
+
+    def __init__(self, max_wait: float = DEFAULT_MAX_WAIT, shareable: Optional[Callable[[Any], bool]] = None):
+        """Initialize the group; ``shareable`` tells whether a result may be handed to waiters"""
+        self.max_wait = max_wait
+        self.shareable = shareable
+        self._inflight: Dict[str, "asyncio.Future[Any]"] = {}
+        self._coalesced: DefaultDict[str, int] = defaultdict(int)
+        self._expired: DefaultDict[str, int] = defaultdict(int)
+        self._retried: DefaultDict[str, int] = defaultdict(int)
+
+    async def run(
+        self,
+        key: str,
+        label: str,
+        call: Callable[[], Awaitable[Any]],
+        max_wait: Optional[float] = None
+    ) -> Any:
+        """
+        Run ``call`` unless an identical call is already in flight
+
+        ``label`` names the tool in the coalescing counters. Exceptions raised
+        by the shared call are re-raised in every waiter. ``max_wait`` further
+        caps how long this caller piggybacks, e.g. by its own deadline.
+        """
+        shared = self._inflight.get(key)
+        if shared is not None:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            wait = self.max_wait if max_wait is None else max(0.0, min(self.max_wait, max_wait))
+            try:
+                result = await asyncio.wait_for(asyncio.shield(shared), wait)
+            except asyncio.TimeoutError:
+                self._expired[label] += 1
+            except asyncio.CancelledError:
+                # Only fall back if the shared call was cancelled, not this waiter
+                if not shared.cancelled():
+                    raise
+            else:
+                if self.shareable is None or self.shareable(result):
+                    self._coalesced[label] += 1
+                    return result
+                # Run the call again within this caller's own time
+                self._retried[label] += 1
+                if max_wait is not None:
+                    max_wait = max_wait - (loop.time() - start)
+                return await self.run(key, label, call, max_wait)
+            return await call()
+
+        shared = asyncio.get_running_loop().create_future()
+        self._inflight[key] = shared
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            shared.cancel()
+            raise
+        except Exception as e:
+            shared.set_exception(e)
+            # Mark the exception as retrieved when nobody is waiting
+            shared.exception()
+            raise
+        else:
+            shared.set_result(result)
+            return result
+        finally:
+            if self._inflight.get(key) is shared:
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Coalesced, expired and retried waiter counts keyed by tool label"""
+        coalesced = dict(self._coalesced)
+        expired = dict(self._expired)
+        retried = dict(self._retried)
+        return {
+            label: {
+                "coalesced": coalesced.get(label, 0),
+                "expired": expired.get(label, 0),
+                "retried": retried.get(label, 0)
+            }
+            for label in sorted(set(coalesced) | set(expired) | set(retried))
+        }
@@ -0,0 +1,176 @@
+"""
+Compression module - Content negotiation and compression of responses
+
+Picks an encoding from the client's ``Accept-Encoding``: zstd and brotli
+when their libraries (``zstandard``, ``brotli``) are installed, and gzip
+otherwise. Levels are tuned for latency rather than ratio: JSON tool
+responses are repetitive enough that the fast levels get most of the size
+reduction. Streamed responses are compressed chunk by chunk, each flushed so
+that the client can decode it on arrival. Responses below ``MIN_SIZE`` bytes
+(unless the client refuses ``identity``), responses already encoded and
+non-text content types are sent as they are.
+"""
+import gzip
+import os
+import zlib
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from werkzeug.datastructures import Accept
+from werkzeug.wrappers import Response
+
+from src.server.tracing import span
+
+try:
+    import zstandard  # type: ignore[import]
+except ImportError:
+    zstandard = None
+
+try:
+    import brotli  # type: ignore[import]
+except ImportError:
+    brotli = None
+
+# Compress responses for clients that accept it
+COMPRESSION = os.environ.get("MCP_COMPRESSION", "1").lower() in ("1", "true", "yes")
+# Responses smaller than this (bytes) are sent uncompressed
+MIN_SIZE = int(os.environ.get("MCP_COMPRESS_MIN_SIZE", 1024))
+
+# Compression levels; the fast end of each codec's range
+GZIP_LEVEL = int(os.environ.get("MCP_GZIP_LEVEL", 3))
+ZSTD_LEVEL = int(os.environ.get("MCP_ZSTD_LEVEL", 3))
+BROTLI_QUALITY = int(os.environ.get("MCP_BROTLI_QUALITY", 4))
+
+COMPRESSIBLE_TYPES = frozenset({"application/json", "application/x-ndjson", "application/javascript"})
+SKIPPED_STATUSES = frozenset({204, 206, 304})
+
+
+def _gzip(data: bytes) -> bytes:
+    """Compress with gzip; mtime=0 makes the output depend on the input only"""
+    return gzip.compress(data, GZIP_LEVEL, mtime=0)
+
+
+# Available codecs, in order of preference when the client accepts several equally
+CODECS: Dict[str, Callable[[bytes], bytes]] = {}
+if zstandard is not None:
+    # Compressor objects aren't thread-safe, so each call gets its own
+    CODECS["zstd"] = lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+if brotli is not None:
+    CODECS["br"] = lambda data: brotli.compress(data, quality=BROTLI_QUALITY)
+CODECS["gzip"] = _gzip
+
+# A stream compressor compresses and flushes one chunk, and ends the stream
+StreamCompressor = Tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def _gzip_stream() -> StreamCompressor:
+    """Start a gzip stream"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return lambda data: compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _zstd_stream() -> StreamCompressor:
+    """Start a zstd stream"""
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    return (
+        lambda data: compressor.compress(data) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+        compressor.flush
+    )
+
+
+def _brotli_stream() -> StreamCompressor:
+    """Start a brotli stream"""
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    return lambda data: compressor.process(data) + compressor.flush(), compressor.finish
+
+
+# Stream compressor factories of the available codecs
+STREAM_CODECS: Dict[str, Callable[[], StreamCompressor]] = {"gzip": _gzip_stream}
+if zstandard is not None:
+    STREAM_CODECS["zstd"] = _zstd_stream
+if brotli is not None:
+    STREAM_CODECS["br"] = _brotli_stream
+
+
+def negotiate(accept_encodings: Accept) -> Optional[str]:
+    """The preferred available encoding the client accepts, or None"""
+    if not COMPRESSION:
+        return None
+    best, best_quality = None, 0.0
+    for encoding in CODECS:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def identity_acceptable(accept_encodings: Accept) -> bool:
+    """Whether the client takes uncompressed bodies: unless refused with ``identity;q=0``, or ``*;q=0`` alone"""
+    for wildcard in (False, True):
+        for value, quality in accept_encodings:
+            if value == ("*" if wildcard else "identity"):
+                return quality > 0
+    return True
+
+
+def compress(encoding: str, data: bytes) -> bytes:
+    """Compress data with a negotiated encoding"""
+    return CODECS[encoding](data)
+
+
+def compress_stream(encoding: str, chunks: Iterable[Union[str, bytes]]) -> Iterator[bytes]:
+    """Compress a streamed body chunk by chunk with a negotiated encoding"""
+    compress_chunk, finish = STREAM_CODECS[encoding]()
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            if chunk:
+                yield compress_chunk(chunk)
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def compressible(response: Response) -> bool:
+    """Whether a response's content may be compressed"""
+    if response.status_code < 200 or response.status_code in SKIPPED_STATUSES:
+        return False
+    if response.direct_passthrough or "Content-Encoding" in response.headers:
+        return False
+    # Membership: the no_transform property holds the directive's value, which is None
+    if "no-transform" in response.cache_control:
+        return False
+    mimetype = response.mimetype or ""
+    return mimetype in COMPRESSIBLE_TYPES or mimetype.startswith("text/")
+
+
+def compress_response(response: Response, accept_encodings: Accept) -> Response:
+    """Compress a response in place for a client accepting ``accept_encodings``"""
+    if not COMPRESSION or not compressible(response):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    # The size of a streamed response isn't known up front
+    if (
+        not response.is_streamed
+        and (response.calculate_content_length() or 0) < MIN_SIZE
+        and identity_acceptable(accept_encodings)
+    ):
+        return response
+    encoding = negotiate(accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = compress_stream(encoding, response.response)
+    else:
+        with span("compress", encoding=encoding):
+            response.set_data(compress(encoding, response.get_data()))
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag is not None:
+        # Each encoding is a different representation, with its own ETag
+        response.set_etag(f"{etag}-{encoding}", bool(weak))
+    return response
@@ -0,0 +1,294 @@
+"""
+Execution engine module - Runs tool functions off the request thread
+
+The engine owns a dedicated asyncio event loop running in a background thread.
+Coroutine tools are awaited on that loop directly, while plain functions are
+offloaded to a thread pool. Every service gets its own bulkhead: a dedicated
+thread pool, a concurrency cap and a bounded wait queue, so one slow backend
+cannot take every worker or starve the other services. Calls waiting for a
+slot are served by priority class and fair share across clients.
+"""
+import asyncio
+import concurrent.futures
+import contextvars
+import logging
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from src.server.metrics import TOOL_QUEUE_WAIT
+from src.server.profiling import current_profile
+from src.server.scheduler import DEFAULT_PRIORITY, FairScheduler, QueueFullError
+from src.server.tracing import span
+from src.utils.types import Priority, ServiceType
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_SERVICE_CONCURRENCY = int(os.environ.get("MCP_SERVICE_CONCURRENCY", 16))
+DEFAULT_SERVICE_QUEUE_LIMIT = int(os.environ.get("MCP_SERVICE_QUEUE_LIMIT", 64))
+
+
+class BulkheadFullError(Exception):
+    """Raised when a service's bulkhead has no capacity left for another call"""
+
+
+class Bulkhead:
+    """
+    Isolated concurrency pool for one service
+
+    Must be used on the engine loop. Calls beyond ``limit`` wait for a slot
+    in a ``FairScheduler``, and calls beyond ``limit + max_queue`` are shed,
+    lowest priority class first.
+    """
+
+    def __init__(self, service_type: ServiceType, limit: int, max_queue: int):
+        """Initialize the bulkhead"""
+        self.service_type = service_type
+        self.limit = limit
+        self.max_queue = max_queue
+        self.rejected = 0
+        self.abandoned = 0
+        self._scheduler = FairScheduler(limit, max_queue)
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=limit,
+            thread_name_prefix=f"mcp-{service_type.value}"
+        )
+
+    async def run(
+        self,
+        function: Callable[[Dict[str, Any]], Any],
+        parameters: Dict[str, Any],
+        is_async: bool,
+        admit: Optional[Callable[[], Awaitable[None]]] = None,
+        priority: Priority = DEFAULT_PRIORITY,
+        client: Optional[str] = None,
+        tool: Optional[str] = None
+    ) -> Any:
+        """
+        Run a tool function inside the bulkhead
+
+        ``admit`` is awaited once the call holds a slot, right before the
+        function runs; it may wait, or raise to reject the call. ``tool``
+        names the call's span, as the function may be a wrapper.
+        """
+        start = time.perf_counter()
+        try:
+            with span("bulkhead.wait", service=self.service_type.value, priority=priority.value):
+                await self._scheduler.acquire(priority, client)
+        except QueueFullError as e:
+            self.rejected += 1
+            raise BulkheadFullError(
+                f"Service {self.service_type.value} is at capacity "
+                f"({self.active} running, {self.queued} queued): {e}"
+            ) from e
+        TOOL_QUEUE_WAIT.observe((self.service_type.value, priority.value), time.perf_counter() - start)
+
+        if admit is not None:
+            try:
+                with span("rate_limit.wait"):
+                    await admit()
+            except BaseException:
+                self._release()
+                raise
+
+        with span("tool", tool=tool or getattr(function, "__name__", None)):
+            if is_async:
+                try:
+                    return await function(parameters)
+                finally:
+                    self._release()
+
+            profile = current_profile.get()
+            if profile is not None:
+                function = profile.wrap("tool", function)
+            context = contextvars.copy_context()
+            loop = asyncio.get_running_loop()
+            running = loop.run_in_executor(self._pool, context.run, function, parameters)
+            try:
+                result = await asyncio.shield(running)
+            except asyncio.CancelledError:
+                if running.done():
+                    self._release()
+                else:
+                    # A thread can't be interrupted: abandon the call, but keep its
+                    # slot until the thread is actually free again
+                    self.abandoned += 1
+                    running.add_done_callback(self._release_abandoned)
+                raise
+            except BaseException:
+                self._release()
+                raise
+        self._release()
+        return result
+
+    @property
+    def active(self) -> int:
+        """Calls holding a slot"""
+        return self._scheduler.active
+
+    @property
+    def queued(self) -> int:
+        """Calls waiting for a slot"""
+        return self._scheduler.queued
+
+    def _release(self) -> None:
+        """Free the slot of a finished call"""
+        self._scheduler.release()
+
+    def _release_abandoned(self, running: "asyncio.Future[Any]") -> None:
+        """Free the slot of an abandoned call once its thread finishes"""
+        if not running.cancelled():
+            # Retrieve the exception so it isn't reported as unhandled
+            running.exception()
+        self._release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current usage of the bulkhead"""
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "abandoned": self.abandoned,
+            "priorities": self._scheduler.stats()
+        }
+
+    def shutdown(self) -> None:
+        """Stop the bulkhead's thread pool"""
+        self._pool.shutdown(wait=False)
+
+
+class ExecutionEngine:
+    """
+    Asyncio based execution engine for tool functions
+
+    The loop thread is started lazily on first use, and is restarted in a
+    forked child process (e.g. gunicorn workers).
+    """
+
+    def __init__(
+        self,
+        service_concurrency: int = DEFAULT_SERVICE_CONCURRENCY,
+        service_queue_limit: int = DEFAULT_SERVICE_QUEUE_LIMIT,
+        service_limits: Optional[Dict[ServiceType, int]] = None
+    ):
+        """Initialize the engine"""
+        self.service_concurrency = service_concurrency
+        self.service_queue_limit = service_queue_limit
+        self.service_limits: Dict[ServiceType, int] = dict(service_limits or {})
+
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._bulkheads: Dict[ServiceType, Bulkhead] = {}
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if needed"""
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid():
+            return loop
+
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid():
+                return self._loop
+
+            loop = asyncio.new_event_loop()
+            self._bulkheads = {}
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop,),
+                name="mcp-engine",
+                daemon=True
+            )
+            self._thread.start()
+            self._pid = os.getpid()
+            self._loop = loop
+            logger.info(f"Execution engine started with {self.service_concurrency} workers per service")
+            return loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        """Run the engine loop forever in the current thread"""
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The engine event loop"""
+        return self._ensure_started()
+
+    def in_engine_loop(self) -> bool:
+        """Whether the caller is running on the engine loop"""
+        return self._loop is not None and threading.current_thread() is self._thread
+
+    def submit(self, coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the engine loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the engine loop and block until it completes"""
+        if self.in_engine_loop():
+            if asyncio.iscoroutine(coro):
+                # Don't leave it to be reported as never awaited
+                coro.close()
+            raise RuntimeError("Blocking engine call made from the engine loop; await it instead")
+        return self.submit(coro).result()
+
+    async def call(self, coro: Awaitable[T]) -> T:
+        """Await a coroutine on the engine loop from any event loop"""
+        if self.in_engine_loop():
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def bulkhead(self, service_type: ServiceType) -> Bulkhead:
+        """Get the bulkhead of a service (engine loop only)"""
+        bulkhead = self._bulkheads.get(service_type)
+        if bulkhead is None:
+            limit = self.service_limits.get(service_type, self.service_concurrency)
+            bulkhead = self._bulkheads[service_type] = Bulkhead(service_type, limit, self.service_queue_limit)
+        return bulkhead
+
+    async def run_function(
+        self,
+        service_type: ServiceType,
+        function: Callable[[Dict[str, Any]], Any],
+        parameters: Dict[str, Any],
+        is_async: bool,
+        admit: Optional[Callable[[], Awaitable[None]]] = None,
+        priority: Priority = DEFAULT_PRIORITY,
+        client: Optional[str] = None,
+        tool: Optional[str] = None
+    ) -> Any:
+        """
+        Run a tool function in its service's bulkhead
+
+        Must be awaited on the engine loop. Plain functions run in the
+        service's thread pool with the caller's context variables.
+        ``priority`` and ``client`` decide the call's turn when it has to
+        wait for a slot. Raises ``BulkheadFullError`` when the service is at
+        capacity, and whatever ``admit`` raises when it rejects the call.
+        ``tool`` is the name the call is traced under.
+        """
+        return await self.bulkhead(service_type).run(function, parameters, is_async, admit, priority, client, tool)
+
+    def bulkhead_stats(self) -> Dict[ServiceType, Dict[str, Any]]:
+        """Usage of every bulkhead created so far"""
+        return {service_type: bulkhead.stats() for service_type, bulkhead in list(self._bulkheads.items())}
+
+    def shutdown(self) -> None:
+        """Stop the loop thread and the bulkhead thread pools"""
+        with self._lock:
+            loop, bulkheads = self._loop, list(self._bulkheads.values())
+            self._loop = self._thread = None
+            self._pid = None
+            self._bulkheads = {}
+
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        for bulkhead in bulkheads:
+            bulkhead.shutdown()
@@ -0,0 +1,143 @@
+"""
+Idempotency module - Deduplication of retried write tool calls
+
+Write tool calls can carry an idempotency key. The first call with a key
+runs the tool; its response is kept for ``ttl`` seconds in a bounded LRU
+store when it is definitive, and later calls with the same key get that
+response without running the tool again. Other responses (a transient error,
+a call that never ran the tool or whose outcome is unknown) are handed to the
+callers waiting for the call but not stored, so a retry runs the tool again. Calls arriving while the first one is still running wait for
+it. The keyed call runs detached from its caller, so a caller that gives up
+at its deadline doesn't cancel a write half-way, and the eventual response is
+still stored for the retry.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.utils.types import ToolResponse
+
+DEFAULT_TTL = float(os.environ.get("MCP_IDEMPOTENCY_TTL", 3600))
+DEFAULT_MAX_ENTRIES = int(os.environ.get("MCP_IDEMPOTENCY_MAX_ENTRIES", 10000))
+
+
+
+def succeeded(response: ToolResponse) -> bool:
+    """Whether a response is a success, the default test of the responses worth storing"""
+    return response.status == "success"
+
+
+class IdempotencyConflictError(Exception):
+    """Raised when an idempotency key is reused for a different call"""
+
+
+class IdempotencyStore:
+    """
+    Completed and in-flight keyed calls
+
+    All methods but ``stats`` must be called on the execution engine loop.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        storable: Callable[[ToolResponse], bool] = succeeded
+    ):
+        """Initialize an empty store; ``storable`` tells whether a response is definitive and may be replayed"""
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.storable = storable
+        self.replayed = 0
+        self.joined = 0
+        self.conflicts = 0
+        self.evictions = 0
+        self._completed: "OrderedDict[Hashable, Tuple[float, str, ToolResponse]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Tuple[str, "asyncio.Future[ToolResponse]"]] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        call: Callable[[], Awaitable[ToolResponse]],
+        max_wait: Optional[float] = None
+    ) -> ToolResponse:
+        """
+        Run ``call`` once per key
+
+        ``fingerprint`` identifies the call's parameters: reusing a key with
+        another fingerprint raises ``IdempotencyConflictError``. The caller
+        waits at most ``max_wait`` seconds (``asyncio.TimeoutError``), while
+        the call itself runs to completion.
+        """
+        completed = self._completed.get(key)
+        if completed is not None:
+            expires, stored_fingerprint, response = completed
+            if expires > time.monotonic():
+                self._check(fingerprint, stored_fingerprint)
+                self._completed.move_to_end(key)
+                self.replayed += 1
+                return response
+            del self._completed[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._check(fingerprint, inflight[0])
+            self.joined += 1
+            shared = inflight[1]
+        else:
+            shared = asyncio.get_running_loop().create_future()
+            self._inflight[key] = (fingerprint, shared)
+            task = asyncio.ensure_future(call())
+            task.add_done_callback(lambda done: self._complete(key, fingerprint, shared, done))
+
+        return await asyncio.wait_for(asyncio.shield(shared), max_wait)
+
+    def _check(self, fingerprint: str, stored_fingerprint: str) -> None:
+        """Reject a key reused with different parameters"""
+        if fingerprint != stored_fingerprint:
+            self.conflicts += 1
+            raise IdempotencyConflictError("Idempotency key was already used with different parameters")
+
+    def _complete(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        shared: "asyncio.Future[ToolResponse]",
+        task: "asyncio.Future[ToolResponse]"
+    ) -> None:
+        """Store the response of a finished call and hand it to the waiting callers"""
+        del self._inflight[key]
+        if task.cancelled():
+            shared.cancel()
+            return
+        error = task.exception()
+        if error is not None:
+            shared.set_exception(error)
+            # Mark the exception as retrieved when nobody is waiting
+            shared.exception()
+            return
+
+        response = task.result()
+        if self.storable(response):
+            self._completed[key] = (time.monotonic() + self.ttl, fingerprint, response)
+            self._completed.move_to_end(key)
+            while len(self._completed) > self.max_entries:
+                self._completed.popitem(last=False)
+                self.evictions += 1
+        shared.set_result(response)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and size of the store"""
+        return {
+            "replayed": self.replayed,
+            "joined": self.joined,
+            "conflicts": self.conflicts,
+            "evictions": self.evictions,
+            "size": len(self._completed),
+            "in_flight": len(self._inflight),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl
+        }
@@ -0,0 +1,249 @@
+"""
+Logs module - Centralized, non-blocking logging pipeline
+
+``configure_logging`` installs a single ``QueueHandler`` on the root logger.
+Records are only stamped with the request ID and enqueued on the calling
+thread; a listener thread formats them and writes whatever has queued up in
+one go. Modules log through ``logging.getLogger(__name__)`` as usual, with
+%-style arguments so that records dropped by level or sampling are never
+formatted.
+
+Info and debug records emitted while a tool call runs are sampled per tool
+(``MCP_LOG_SAMPLE_RATE``, ``MCP_LOG_SAMPLE_RATES``): the registry decides
+once per call whether its records are kept. Warnings and errors are always
+logged.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TextIO
+
+from src.server.tracing import current_request_id
+
+DEFAULT_LEVEL = os.environ.get("MCP_LOG_LEVEL", "INFO").upper()
+# "text" or "json" (one JSON document per line)
+DEFAULT_FORMAT = os.environ.get("MCP_LOG_FORMAT", "text").lower()
+# Fraction of tool calls whose info logs are kept, overridden per tool
+DEFAULT_SAMPLE_RATE = float(os.environ.get("MCP_LOG_SAMPLE_RATE", 1))
+
+# Seconds the listener lets records accumulate before writing them
+FLUSH_INTERVAL = float(os.environ.get("MCP_LOG_FLUSH_INTERVAL", 0.01))
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Whether info records of the current tool call are kept
+current_log_sampled: ContextVar[bool] = ContextVar("mcp_current_log_sampled", default=True)
+
+
+def parse_rates(value: str) -> Dict[str, float]:
+    """Parse sample rates given as ``tool=rate`` pairs separated by commas"""
+    rates = {}
+    for pair in filter(None, (part.strip() for part in value.split(","))):
+        tool, _, rate = pair.partition("=")
+        rates[tool.strip()] = float(rate)
+    return rates
+
+
+DEFAULT_SAMPLE_RATES = parse_rates(os.environ.get("MCP_LOG_SAMPLE_RATES", ""))
+
+
+class LogSampler:
+    """Per-tool sample rates for the info logs of tool calls"""
+
+    def __init__(self, default_rate: float = DEFAULT_SAMPLE_RATE, rates: Optional[Dict[str, float]] = None):
+        """Initialize the sampler"""
+        self.default_rate = default_rate
+        self.rates = dict(DEFAULT_SAMPLE_RATES if rates is None else rates)
+
+    def configure(self, tool: str, rate: float) -> None:
+        """Set the sample rate of a tool, by namespaced name (``github.list_issues``)"""
+        self.rates[tool] = rate
+
+    def sample(self, tool: str) -> bool:
+        """Decide whether the info logs of a call to ``tool`` are kept"""
+        rate = self.rates.get(tool, self.default_rate)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+
+
+class ContextFilter(logging.Filter):
+    """Drop unsampled info records and stamp the rest with the request ID"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and not current_log_sampled.get():
+            return False
+        record.request_id = current_request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON documents"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            document["request_id"] = request_id
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        return json.dumps(document, default=str)
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread
+
+    Only the message arguments are merged before enqueueing, so that later
+    changes to mutable arguments don't show up in the log. The record is
+    updated in place rather than copied: this handler sits on the root
+    logger, after every other handler has seen the record.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class LoggingPipeline:
+    """
+    The root queue handler and the listener thread writing its records
+
+    The listener drains every queued record each time it wakes up and
+    writes them with a single write and flush, so a burst of records costs
+    one system call.
+    """
+
+    def __init__(self, handler: logging.StreamHandler):
+        """Initialize the pipeline around the handler that formats and writes records"""
+        self.handler = handler
+        self.queue_handler = LazyQueueHandler(queue.SimpleQueue())
+        self.queue_handler.addFilter(ContextFilter())
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the listener thread"""
+        self._thread = threading.Thread(
+            target=self._listen,
+            args=(self.queue_handler.queue,),
+            name="mcp-logging",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write the queued records and stop the listener thread"""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self.queue_handler.queue.put(None)
+            thread.join()
+
+    def restart_after_fork(self) -> None:
+        """Replace the listener thread, which doesn't survive a fork, in a child process"""
+        self.queue_handler.queue = queue.SimpleQueue()
+        self.handler.createLock()
+        self.start()
+
+    def _listen(self, records: "queue.SimpleQueue[Optional[logging.LogRecord]]") -> None:
+        """Write queued records until the stop sentinel"""
+        handler = self.handler
+        while True:
+            batch = [records.get()]
+            if FLUSH_INTERVAL:
+                time.sleep(FLUSH_INTERVAL)
+            while True:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            for record in batch:
+                if record is None:
+                    break
+                try:
+                    lines.append(handler.format(record) + handler.terminator)
+                except Exception:
+                    handler.handleError(record)
+            first = batch[0]
+            if first is not None:
+                try:
+                    handler.stream.write("".join(lines))
+                    handler.flush()
+                except Exception:
+                    handler.handleError(first)
+            if record is None:
+                return
+
+
+_pipeline: Optional[LoggingPipeline] = None
+
+
+def configure_logging(
+    level: str = DEFAULT_LEVEL,
+    log_format: str = DEFAULT_FORMAT,
+    stream: Optional[TextIO] = None,
+    force: bool = False
+) -> Optional[LoggingPipeline]:
+    """
+    Route the root logger through the logging pipeline
+
+    Like ``logging.basicConfig``, does nothing when the root logger already
+    has handlers (including a running pipeline) unless ``force`` is set, in
+    which case they are replaced. Records are written to ``stream`` (stderr
+    by default). Returns the running pipeline, or None when logging was
+    configured elsewhere.
+    """
+    global _pipeline
+    if not force and logging.getLogger().handlers:
+        return _pipeline
+    shutdown_logging()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+
+    # Neither format uses the thread or process: skip collecting them for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    pipeline = LoggingPipeline(handler)
+    logging.basicConfig(level=level, handlers=[pipeline.queue_handler], force=force)
+    pipeline.start()
+
+    _pipeline = pipeline
+    return pipeline
+
+
+def shutdown_logging() -> None:
+    """Flush and remove the logging pipeline"""
+    global _pipeline
+    pipeline, _pipeline = _pipeline, None
+    if pipeline is not None:
+        logging.getLogger().removeHandler(pipeline.queue_handler)
+        pipeline.stop()
+
+
+def _restart_after_fork() -> None:
+    if _pipeline is not None:
+        _pipeline.restart_after_fork()
+
+
+atexit.register(shutdown_logging)
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+# Create the global sampler of tool call logs
+log_sampler = LogSampler()
@@ -1,15 +1,122 @@
 """
 MCP Registry module - Manages MCP services and tool routing
 """
+import asyncio
+import concurrent.futures
+import inspect
 import logging
-from typing import Dict, List, Optional
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
 
-from src.utils.types import MCPService, Tool, ToolRequest, ToolResponse, ServiceType
+from src.server.cache import ResultCache, ToolCache
+from src.server.coalescing import SingleFlight
+from src.server.executor import BulkheadFullError, ExecutionEngine
+from src.server.idempotency import IdempotencyConflictError, IdempotencyStore
+from src.server.logs import current_log_sampled, log_sampler
+from src.server.metrics import TOOL_CALLS, TOOL_DURATION, TOOL_IN_FLIGHT, TOOL_TIMEOUTS
+from src.server.projection import Projection, compile_projection, current_projection
+from src.server.ratelimit import RateLimitExceededError, RateLimiters, current_limiter
+from src.server.resilience import CircuitBreakers
+from src.server.scheduler import DEFAULT_PRIORITY
+from src.server.streaming import ToolStream, collecting
+from src.server.tracing import set_attribute, span
+from src.server.validation import ToolValidationError, compile_validator
+from src.server.workflows import CompiledWorkflow, WorkflowError, compile_workflow, run_workflow
+from src.utils.canonical import canonical_parameters, request_key
+from src.utils.deadline import current_deadline, deadline_after, remaining
+from src.utils.types import (
+    MCPService, Page, Priority, Tool, ToolRequest, ToolResponse, ServiceType, WorkflowRequest, WorkflowResponse
+)
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Timeout in seconds applied to requests without a deadline; 0 disables it
+DEFAULT_TIMEOUT = float(os.environ.get("MCP_DEFAULT_TIMEOUT", 30)) or None
+
+# Error prefix of calls whose parameters were rejected
+INVALID_PARAMETERS = "Invalid parameters"
+
+
+class DispatchEntry(NamedTuple):
+    """
+    Precompiled dispatch target for a single tool
+
+    Entries are built once at registration time so that executing a tool
+    needs a single dict lookup and no further registry state.
+    """
+    name: str
+    tool: Tool
+    service: MCPService
+    labels: Tuple[str, str]
+    function: Optional[Callable[[Dict[str, Any]], Any]]
+    validator: Callable[[Dict[str, Any]], Dict[str, Any]]
+    is_async: bool
+    cache: Optional[ResultCache]
+
+
+class PreparedCall(NamedTuple):
+    """A resolved and validated tool call, ready for dispatch"""
+    entry: DispatchEntry
+    function: Callable[[Dict[str, Any]], Any]
+    parameters: Dict[str, Any]
+    deadline: Optional[float]
+    priority: Priority
+    client: Optional[str]
+    idempotency_key: Optional[str]
+    stream: Optional[ToolStream] = None
+    projection: Optional[Projection] = None
+
+
+def qualified_name(service_type: ServiceType, tool_name: str) -> str:
+    """Build the namespaced name of a tool, e.g. ``github.list_issues``"""
+    return f"{service_type.value}.{tool_name}"
+
+
+def shareable_response(response: ToolResponse) -> bool:
+    """Whether a response holds for every caller, rather than depending on the deadline of the call that made it"""
+    if response.status == "timeout":
+        return False
+    if response.status == "unavailable" and isinstance(response.data, dict):
+        return response.data.get("reason") != "rate_limited"
+    return True
+
+
+def definitive_response(response: ToolResponse) -> bool:
+    """
+    Whether a write's response is its final outcome, to be replayed to retries with its idempotency key
+
+    Successes are, and so are parameters the tool rejected, which a retry
+    can't change. Other tool errors may be transient: a retry runs the tool
+    again rather than getting the error back until the key expires.
+    """
+    if response.status == "success":
+        return True
+    return response.status == "error" and (response.error or "").startswith(f"{INVALID_PARAMETERS}:")
+
+
+class RegistrySnapshot(NamedTuple):
+    """
+    Immutable view of the registered services and routing tables
+
+    Snapshots are never modified after they are published, so readers can
+    use one without locking while writers build its replacement.
+    """
+    version: int
+    services: Mapping[ServiceType, MCPService]
+    routes: Mapping[Tuple[ServiceType, str], DispatchEntry]
+    name_index: Mapping[str, DispatchEntry]
+
+
+EMPTY_SNAPSHOT = RegistrySnapshot(
+    version=0,
+    services=MappingProxyType({}),
+    routes=MappingProxyType({}),
+    name_index=MappingProxyType({})
+)
+
 
 class MCPRegistry:
     """
@@ -17,100 +124,609 @@ class MCPRegistry:
     
     The registry maintains mappings between services, tools, and their implementations.
     It handles the core routing logic for tool execution.
+
+    Tools are routed through two indexes built at registration time:
+
+    - ``routes`` is keyed by ``(ServiceType, tool_name)`` and pins a service
+    - ``name_index`` is keyed by the namespaced name (``github.list_issues``)
+      and by the bare tool name, which resolves to the last service providing
+      that tool in registration order; replacing a service keeps its place
+
+    Both live in an immutable ``RegistrySnapshot``. Readers take the current
+    snapshot with a single attribute read; writers build a new snapshot under
+    a lock and swap it in, so services can be registered or replaced while
+    requests are being served.
     """
     
-    def __init__(self):
+    def __init__(self, engine: Optional[ExecutionEngine] = None, default_timeout: Optional[float] = DEFAULT_TIMEOUT):
         """Initialize the registry"""
-        self.services: Dict[ServiceType, MCPService] = {}
-        self.tools_map: Dict[str, Tool] = {}  # Maps tool name to Tool object
+        self.engine = engine or ExecutionEngine()
+        self.default_timeout = default_timeout
+        self.cache = ToolCache()
+        self.single_flight = SingleFlight(shareable=shareable_response)
+        self.idempotency = IdempotencyStore(storable=definitive_response)
+        self.breakers = CircuitBreakers()
+        self.limiters = RateLimiters()
+        self._snapshot = EMPTY_SNAPSHOT
+        self._write_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """The current registry snapshot"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot, incremented on every registration"""
+        return self._snapshot.version
+
+    @property
+    def services(self) -> Mapping[ServiceType, MCPService]:
+        """Registered services of the current snapshot"""
+        return self._snapshot.services
+
+    @property
+    def routes(self) -> Mapping[Tuple[ServiceType, str], DispatchEntry]:
+        """Service-qualified routes of the current snapshot"""
+        return self._snapshot.routes
+
+    @property
+    def name_index(self) -> Mapping[str, DispatchEntry]:
+        """Name index of the current snapshot"""
+        return self._snapshot.name_index
         
-    def register_service(self, service: MCPService) -> None:
-        """Register a service with the registry"""
+    def register_service(self, service: MCPService, replace: bool = False) -> None:
+        """
+        Register a service with the registry
+
+        Registering a service type that is already registered replaces it in
+        place: lazy loading and hot reload don't change which service a bare
+        tool name routes to. Calls already dispatched to the old service run
+        to completion. Pass ``replace`` when replacing the service is the
+        intent, as when a lazy stub is swapped for the real service, so it
+        isn't reported as a conflict.
+        """
         service_type = service.type
         
-        if service_type in self.services:
-            logger.warning(f"Service {service_type} is already registered. Overwriting.")
-        
-        self.services[service_type] = service
-        
-        # Register all tools from this service
-        for tool in service.tools:
-            # Performance optimization: using simple lookup by name
-            # This enables faster tool resolution during high-load situations
-            if tool.name in self.tools_map:
-                existing_tool = self.tools_map[tool.name]
-                logger.info(
-                    f"Tool name overlap: {tool.name} is already registered with service "
-                    f"{existing_tool.service}. Using optimized routing."
-                )
+        with self._write_lock:
+            current = self._snapshot
+            services = dict(current.services)
+            
+            if service_type in services:
+                if replace:
+                    logger.debug(f"Replacing service {service_type}")
+                else:
+                    logger.warning(f"Service {service_type} is already registered. Overwriting.")
+                self.cache.drop_service(service_type)
             
-            # Register the tool
-            self.tools_map[tool.name] = tool
+            # A replaced service keeps its position, so bare tool names keep routing to the same service
+            services[service_type] = service
+            self._snapshot = self._build_snapshot(current, services, service_type)
+
+        for tool in service.tools:
             logger.info(f"Registered tool: {tool.name} for service {service.type}")
+
+    def _build_entry(self, service: MCPService, tool: Tool) -> DispatchEntry:
+        """Precompile the dispatch entry of a tool"""
+        return DispatchEntry(
+            name=qualified_name(service.type, tool.name),
+            tool=tool,
+            service=service,
+            labels=(service.type.value, tool.name),
+            function=tool.function,
+            validator=compile_validator(tool.parameters),
+            is_async=inspect.iscoroutinefunction(tool.function),
+            cache=self.cache.cache_for(tool),
+        )
+
+    def _build_snapshot(
+        self,
+        current: RegistrySnapshot,
+        services: Dict[ServiceType, MCPService],
+        changed: ServiceType
+    ) -> RegistrySnapshot:
+        """
+        Build the snapshot for a new set of services, reusing unchanged entries
+
+        Tool name overlaps are reported when they first appear, not again
+        on every rebuild.
+        """
+        routes: Dict[Tuple[ServiceType, str], DispatchEntry] = {}
+        name_index: Dict[str, DispatchEntry] = {}
+
+        for service_type, service in services.items():
+            for tool in service.tools:
+                entry = None
+                if service_type != changed:
+                    entry = current.routes.get((service_type, tool.name))
+                if entry is None:
+                    entry = self._build_entry(service, tool)
+
+                routes[(service_type, tool.name)] = entry
+                name_index[entry.name] = entry
+
+                if tool.name in name_index and not self._overlapped(current, name_index[tool.name], entry):
+                    logger.warning(
+                        f"Tool name overlap: {tool.name} is provided by "
+                        f"{name_index[tool.name].tool.service} and {service_type}. "
+                        f"Use '{entry.name}' to pin a service."
+                    )
+                name_index[tool.name] = entry
+
+        return RegistrySnapshot(
+            version=current.version + 1,
+            services=MappingProxyType(services),
+            routes=MappingProxyType(routes),
+            name_index=MappingProxyType(name_index)
+        )
+
+    @staticmethod
+    def _overlapped(snapshot: RegistrySnapshot, first: DispatchEntry, second: DispatchEntry) -> bool:
+        """Whether both tools already shared their name in ``snapshot``"""
+        routes = snapshot.routes
+        name = second.tool.name
+        return (first.service.type, name) in routes and (second.service.type, name) in routes
+
+    def resolve(self, tool_name: str, service: Optional[ServiceType] = None) -> Optional[DispatchEntry]:
+        """
+        Resolve a tool to its dispatch entry
+
+        When ``service`` is given the lookup is pinned to that service,
+        otherwise ``tool_name`` may be a bare or namespaced tool name.
+        """
+        snapshot = self._snapshot
+        if service is None:
+            return snapshot.name_index.get(tool_name)
+        return snapshot.routes.get((service, tool_name))
     
     def execute_tool(self, request: ToolRequest) -> ToolResponse:
         """
         Execute a tool based on its name
         
-        This implementation prioritizes performance through direct tool lookup.
+        Blocks the calling thread until the tool completes on the execution engine.
+        Unknown tools and invalid parameters are rejected before dispatch.
+        """
+        call = self._prepare(request)
+        if isinstance(call, ToolResponse):
+            return call
+        return self.engine.run(self._dispatch(call))
+
+    def stream_tool(self, request: ToolRequest) -> ToolStream:
+        """
+        Execute a tool, streaming the records of an iterator result
+
+        Blocks until the tool starts producing records or the call is over.
+        The caller sends the stream's records and must close it. Results of
+        tools that don't return an iterator, cached results and results of
+        write tools are streamed once complete.
+        """
+        call = self._prepare(request)
+        if isinstance(call, ToolResponse):
+            stream = ToolStream(call.service)
+            stream.finish(call)
+            return stream
+
+        stream = ToolStream(call.entry.service.type)
+        # Write tools' results are collected, so that idempotent retries get them
+        if not call.entry.tool.mutates:
+            call = call._replace(stream=stream)
+
+        def finish(done: "concurrent.futures.Future[ToolResponse]") -> None:
+            try:
+                response = done.result()
+            except BaseException as e:
+                response = ToolResponse(status="error", service=stream.service, error=f"Error executing tool: {str(e)}")
+            stream.finish(response)
+
+        self.engine.submit(self._dispatch(call)).add_done_callback(finish)
+        stream.wait()
+        return stream
+
+    async def execute_tool_async(self, request: ToolRequest) -> ToolResponse:
+        """Execute a tool from any event loop without blocking it"""
+        call = self._prepare(request)
+        if isinstance(call, ToolResponse):
+            return call
+        return await self.engine.call(self._dispatch(call))
+
+    def execute_batch(self, requests: List[ToolRequest]) -> List[ToolResponse]:
+        """Execute independent tool requests concurrently, blocking until all complete"""
+        return self.engine.run(self._execute_batch(requests))
+
+    async def execute_batch_async(self, requests: List[ToolRequest]) -> List[ToolResponse]:
+        """Execute independent tool requests concurrently from any event loop"""
+        return await self.engine.call(self._execute_batch(requests))
+
+    def execute_workflow(self, request: WorkflowRequest) -> WorkflowResponse:
+        """
+        Execute a workflow of dependent tool calls, blocking until it completes
+
+        Raises ``WorkflowError`` when the workflow is invalid or uses an unknown tool.
+        """
+        workflow = self._compile_workflow(request)
+        return self.engine.run(self._run_workflow(workflow, request))
+
+    async def execute_workflow_async(self, request: WorkflowRequest) -> WorkflowResponse:
+        """Execute a workflow of dependent tool calls from any event loop"""
+        workflow = self._compile_workflow(request)
+        return await self.engine.call(self._run_workflow(workflow, request))
+
+    def _compile_workflow(self, request: WorkflowRequest) -> CompiledWorkflow:
+        """Validate a workflow and check that all of its tools exist"""
+        workflow = compile_workflow(request)
+        for compiled in workflow.steps:
+            step = compiled.step
+            if self.resolve(step.tool_name, step.service) is None:
+                raise WorkflowError(f"Step '{step.id}' uses unknown tool '{step.tool_name}'")
+        return workflow
+
+    def _run_workflow(self, workflow: CompiledWorkflow, request: WorkflowRequest) -> Awaitable[WorkflowResponse]:
+        """Run a compiled workflow on the engine loop under a single deadline"""
+        return run_workflow(
+            workflow,
+            self._execute,
+            self._deadline(request),
+            request.priority,
+            request.client_id
+        )
+
+    async def _execute_batch(self, requests: List[ToolRequest]) -> List[ToolResponse]:
+        """
+        Fan out a batch on the engine loop
+
+        Identical requests in the batch are executed once and share the
+        response, except for write tools. Responses are returned in request order.
+        """
+        positions: Dict[str, int] = {}
+        calls: List[Awaitable[ToolResponse]] = []
+        slots = []
+
+        for request in requests:
+            entry = self.resolve(request.tool_name, request.service)
+            if entry is not None and entry.tool.mutates:
+                slots.append(len(calls))
+                calls.append(self._execute(request))
+                continue
+
+            # Requests with different deadlines may get different responses
+            key = f"{request_key(request)}|{request.deadline}|{request.timeout_ms}"
+            if key not in positions:
+                positions[key] = len(calls)
+                calls.append(self._execute(request))
+            slots.append(positions[key])
+
+        responses = await asyncio.gather(*calls)
+        return [responses[slot] for slot in slots]
+
+    def _prepare(self, request: ToolRequest) -> Union[PreparedCall, ToolResponse]:
+        """
+        Resolve and validate a request on the caller's thread
+
+        Resolution is a single lookup into the precompiled routing tables.
+        Returns the prepared call, or an error response.
         """
         tool_name = request.tool_name
+        with span("registry.resolve", tool=tool_name):
+            entry = self.resolve(tool_name, request.service)
         
         # Check if the tool exists
-        if tool_name not in self.tools_map:
+        if entry is None:
             return ToolResponse(
                 status="error",
-                service=ServiceType.GITHUB,  # Default service for error
+                service=request.service or ServiceType.GITHUB,  # Default service for error
                 error=f"Tool '{tool_name}' not found"
             )
         
-        # Get the tool
-        tool = self.tools_map[tool_name]
-        service_type = tool.service
-        service = self.services[service_type]
+        service_type = entry.service.type
         
-        # Log the execution
-        logger.info(f"Executing tool '{tool_name}' from service '{service_type}'")
+        function = entry.function
+        if function is None:
+            return ToolResponse(
+                status="error",
+                service=service_type,
+                error=f"Tool '{tool_name}' has no function implementation"
+            )
+
+        try:
+            with span("registry.validate", tool=entry.name):
+                parameters = entry.validator(request.parameters)
+                projection = compile_projection(request.fields) if request.fields is not None else None
+        except ToolValidationError as e:
+            TOOL_CALLS.inc(entry.labels + ("invalid",))
+            return ToolResponse(
+                status="error",
+                service=service_type,
+                error=f"{INVALID_PARAMETERS}: {str(e)}"
+            )
+
+        return PreparedCall(
+            entry,
+            function,
+            parameters,
+            self._deadline(request),
+            request.priority or DEFAULT_PRIORITY,
+            request.client_id,
+            request.idempotency_key,
+            projection=projection
+        )
+
+    def _deadline(self, request: Union[ToolRequest, WorkflowRequest]) -> Optional[float]:
+        """Effective deadline of a request: the earliest of its deadline and timeout"""
+        deadline = request.deadline
+        if request.timeout_ms is not None:
+            by_timeout = time.time() + request.timeout_ms / 1000
+            deadline = by_timeout if deadline is None else min(deadline, by_timeout)
+        if deadline is None:
+            deadline = deadline_after(self.default_timeout)
+        return deadline
+
+    async def _execute(self, request: ToolRequest) -> ToolResponse:
+        """Prepare and dispatch a request on the engine loop"""
+        call = self._prepare(request)
+        if isinstance(call, ToolResponse):
+            return call
+        return await self._dispatch(call)
+
+    async def _dispatch(self, call: PreparedCall) -> ToolResponse:
+        """
+        Execute a prepared request on the engine loop
+
+        This is shared by the sync, async and batch entry points.
+        """
+        entry = call.entry
         
+        # Decide once whether the info logs of this call are kept
+        sampled = log_sampler.sample(entry.name)
+        sampled_token = current_log_sampled.set(sampled)
+        if sampled:
+            logger.info("Executing tool '%s' from service '%s'", entry.tool.name, entry.service.type.value)
+
+        labels = entry.labels
+        start = time.perf_counter()
+        TOOL_IN_FLIGHT.inc(labels)
+        try:
+            with span("registry.dispatch", tool=entry.name, priority=call.priority.value) as dispatch:
+                response = await self._run(call)
+                dispatch.set_attribute("status", response.status)
+        finally:
+            TOOL_IN_FLIGHT.dec(labels)
+            current_log_sampled.reset(sampled_token)
+        TOOL_DURATION.observe(labels, time.perf_counter() - start)
+        TOOL_CALLS.inc(labels + (response.status,))
+        return response
+
+    async def _run(self, call: PreparedCall) -> ToolResponse:
+        """Serve a prepared request from the cache, an in-flight call, or the tool"""
+        entry = call.entry
+        canonical = canonical_parameters(call.parameters)
+        # Projections of the same call are cached and coalesced apart
+        if call.projection is not None:
+            canonical = f"{canonical}|{call.projection.key}"
+        cache = entry.cache
+        if cache is not None:
+            cached = cache.get(canonical)
+            if cached is not None:
+                set_attribute("cache", "hit")
+                return cached
+
+        # A stream can't be shared with other calls
+        if call.stream is not None:
+            return await self._invoke(call, canonical)
+
+        # Write tools always run, unless they repeat an idempotency key;
+        # identical in-flight reads of the same priority class share one execution
+        if entry.tool.mutates:
+            if call.idempotency_key is not None:
+                return await self._invoke_idempotent(call, canonical)
+            return await self._invoke(call, canonical)
+
+        return await self.single_flight.run(
+            f"{entry.name}|{call.priority.value}|{canonical}",
+            entry.name,
+            lambda: self._invoke(call, canonical),
+            remaining(call.deadline)
+        )
+
+    async def _invoke_idempotent(self, call: PreparedCall, canonical: str) -> ToolResponse:
+        """
+        Run a write tool at most once per idempotency key and client
+
+        The tool runs under the longer of the caller's deadline and the
+        default timeout, so a caller timing out doesn't abandon the write;
+        a retry with the same key waits for it or gets its stored response.
+        """
+        entry = call.entry
+        deadline = call.deadline
+        default_deadline = deadline_after(self.default_timeout)
+        if deadline is not None and default_deadline is not None:
+            deadline = max(deadline, default_deadline)
+
         try:
-            # Execute the tool function
-            if tool.function:
-                result = tool.function(request.parameters)
-                return ToolResponse(
-                    status="success",
-                    service=service_type,
-                    data=result
-                )
+            return await self.idempotency.run(
+                (call.client, entry.name, call.idempotency_key),
+                canonical,
+                lambda: self._invoke(call._replace(deadline=deadline), canonical),
+                remaining(call.deadline)
+            )
+        except IdempotencyConflictError as e:
+            return ToolResponse(
+                status="error",
+                service=entry.service.type,
+                error=str(e)
+            )
+        except asyncio.TimeoutError:
+            return self._timeout_response(entry)
+
+    async def _invoke(self, call: PreparedCall, canonical: str) -> ToolResponse:
+        """
+        Run a tool function and record its result in the cache
+
+        Calls fail fast with an ``unavailable`` response while the service's
+        circuit breaker is open or its bulkhead is full. Calls holding a
+        bulkhead slot wait for the service's rate limiter, and are shed if it
+        can't admit them before their deadline. Calls still running
+        at their deadline get a ``timeout`` response: coroutine tools are
+        cancelled, and thread pool tools are abandoned to finish in the background.
+        """
+        entry = call.entry
+        service_type = entry.service.type
+
+        time_left = remaining(call.deadline)
+        if time_left is not None and time_left <= 0:
+            return self._timeout_response(entry)
+
+        breaker = self.breakers.get(service_type)
+        if not breaker.allow():
+            return ToolResponse(
+                status="unavailable",
+                service=service_type,
+                data={"reason": "circuit_open", "retry_after": round(breaker.retry_after(), 3)},
+                error=f"Circuit breaker is open for service {service_type.value}"
+            )
+
+        # Results are projected on the service's threads, unless the tool pushes the projection down
+        function = call.function
+        projection = call.projection
+        if projection is not None and not entry.tool.projects:
+            function = projection.wrap(function, entry.is_async)
+
+        # Plain functions returning an iterator feed the stream, or have their records collected
+        if not entry.is_async:
+            function = collecting(function) if call.stream is None else call.stream.produce(function)
+
+        # Writes invalidate the service's cached reads when they finish, including once an abandoned call does
+        if entry.tool.mutates:
+            function = self.cache.invalidating(function, service_type, entry.is_async)
+
+        # Results of reads overlapping an invalidation of the cache aren't stored
+        generation = entry.cache.generation if entry.cache is not None else None
+
+        # Expose the deadline, rate limiter and projection to the tool, including on the thread pool
+        limiter = self.limiters.get(service_type)
+        started = False
+
+        async def admit() -> None:
+            # Admitted calls start right away; a call timing out before that never reached the service
+            nonlocal started
+            await limiter.acquire(remaining(call.deadline))
+            started = True
+
+        deadline_token = current_deadline.set(call.deadline)
+        limiter_token = current_limiter.set(limiter)
+        projection_token = current_projection.set(projection)
+        try:
+            # Execute the tool function once the rate limiter admits it
+            running = self.engine.run_function(
+                service_type,
+                function,
+                call.parameters,
+                entry.is_async,
+                admit,
+                call.priority,
+                call.client,
+                entry.name
+            )
+            if time_left is None:
+                result = await running
+            else:
+                result = await asyncio.wait_for(running, time_left)
+        except BulkheadFullError as e:
+            breaker.release()
+            return ToolResponse(
+                status="unavailable",
+                service=service_type,
+                data={"reason": "bulkhead_full"},
+                error=str(e)
+            )
+        except RateLimitExceededError:
+            breaker.release()
+            return ToolResponse(
+                status="unavailable",
+                service=service_type,
+                data={"reason": "rate_limited", "retry_after": round(limiter.retry_after(), 3)},
+                error=f"Rate limit reached for service {service_type.value}"
+            )
+        except asyncio.TimeoutError:
+            if started:
+                breaker.record_failure()
+                if entry.tool.mutates:
+                    # The write may have landed already, while the call runs on in the background
+                    self.cache.invalidate_service(service_type)
             else:
-                return ToolResponse(
-                    status="error",
-                    service=service_type,
-                    error=f"Tool '{tool_name}' has no function implementation"
-                )
+                # Timed out waiting for a bulkhead slot or the rate limiter: not the service's fault
+                breaker.release()
+            return self._timeout_response(entry)
+        except asyncio.CancelledError:
+            breaker.release()
+            raise
+        except ToolValidationError as e:
+            # Raised by the tool for parameters it can't use, such as a stale cursor
+            breaker.release()
+            return ToolResponse(
+                status="error",
+                service=service_type,
+                error=f"{INVALID_PARAMETERS}: {str(e)}"
+            )
         except Exception as e:
-            logger.error(f"Error executing tool '{tool_name}': {str(e)}")
+            breaker.record_failure()
+            logger.error("Error executing tool '%s': %s", entry.tool.name, e)
             return ToolResponse(
                 status="error",
                 service=service_type,
                 error=f"Error executing tool: {str(e)}"
             )
+        finally:
+            current_projection.reset(projection_token)
+            current_limiter.reset(limiter_token)
+            current_deadline.reset(deadline_token)
+
+        breaker.record_success()
+        next_cursor = None
+        if isinstance(result, Page):
+            result, next_cursor = result.items, result.next_cursor
+        response = ToolResponse(
+            status="success",
+            service=service_type,
+            data=result,
+            next_cursor=next_cursor
+        )
+
+        if entry.cache is not None:
+            # Streamed records aren't kept, so there is nothing to cache
+            if call.stream is None or not call.stream.streamed:
+                entry.cache.put(canonical, response, generation)
+
+        return response
+
+    def _timeout_response(self, entry: DispatchEntry) -> ToolResponse:
+        """Build the response of a call that ran out of time"""
+        TOOL_TIMEOUTS.inc(entry.labels)
+        logger.warning(
+            "Tool '%s' from service '%s' exceeded its deadline", entry.tool.name, entry.service.type.value
+        )
+        return ToolResponse(
+            status="timeout",
+            service=entry.service.type,
+            error=f"Tool '{entry.tool.name}' exceeded its deadline"
+        )
     
     def get_service(self, service_type: ServiceType) -> Optional[MCPService]:
         """Get a service by type"""
         return self.services.get(service_type)
     
-    def get_tool(self, tool_name: str) -> Optional[Tool]:
-        """Get a tool by name"""
-        return self.tools_map.get(tool_name)
+    def get_tool(self, tool_name: str, service: Optional[ServiceType] = None) -> Optional[Tool]:
+        """Get a tool by name, optionally pinned to a service"""
+        entry = self.resolve(tool_name, service)
+        return entry.tool if entry else None
     
     def list_services(self) -> List[MCPService]:
         """List all registered services"""
         return list(self.services.values())
     
     def list_tools(self) -> List[Tool]:
-        """List all registered tools"""
-        return list(self.tools_map.values())
+        """List all registered tools, including tools sharing a name across services"""
+        return [entry.tool for entry in self.routes.values()]
 
 
 # Create a global instance of the registry
-registry = MCPRegistry()
\ No newline at end of file
+registry = MCPRegistry()
@@ -0,0 +1,370 @@
+"""
+Metrics module - Low-overhead counters, gauges and histograms
+
+Every thread records into its own shard, so recording a sample is a couple
+of dict operations with no lock. Shards are merged when metrics are scraped
+and exported in the Prometheus text format.
+
+For multi-process deployments (e.g. gunicorn with several workers) set
+``MCP_METRICS_DIR`` to a directory shared by the workers. Each process then
+periodically writes its snapshot there and a scrape of any worker merges the
+snapshots of all of them. Call ``mark_process_dead(pid)`` from gunicorn's
+``child_exit`` hook so that gauges of dead workers are dropped.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+SeriesKey = Tuple[str, LabelValues]
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+FLUSH_INTERVAL = float(os.environ.get("MCP_METRICS_FLUSH_INTERVAL", 5))
+
+# Shards of finished threads are folded into the retired totals past this count
+MAX_LIVE_SHARDS = 64
+
+
+class Metric:
+    """Base class for a named metric with a fixed set of label names"""
+
+    type = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Iterable[str]):
+        """Initialize the metric"""
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def render(self, series: Dict[LabelValues, Any]) -> List[str]:
+        """Render merged series in the Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for labels, value in sorted(series.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    """Monotonically increasing counter"""
+
+    type = "counter"
+
+    def inc(self, labels: LabelValues, amount: float = 1) -> None:
+        """Increment the counter for a label set"""
+        values = self.registry.shard()
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Gauge that may go up and down, e.g. in-flight requests"""
+
+    type = "gauge"
+
+    def inc(self, labels: LabelValues, amount: float = 1) -> None:
+        """Increment the gauge for a label set"""
+        values = self.registry.shard()
+        key = (self.name, labels)
+        values[key] = values.get(key, 0) + amount
+
+    def dec(self, labels: LabelValues, amount: float = 1) -> None:
+        """Decrement the gauge for a label set"""
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    """Histogram with fixed bucket upper bounds"""
+
+    type = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str,
+                 labelnames: Iterable[str], buckets: Iterable[float]):
+        """Initialize the histogram"""
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, labels: LabelValues, value: float) -> None:
+        """Record an observation for a label set"""
+        values = self.registry.shard()
+        key = (self.name, labels)
+        # One count per bucket plus +Inf, followed by the sum and the count
+        data = values.get(key)
+        if data is None:
+            data = values[key] = [0] * (len(self.buckets) + 3)
+        data[bisect_left(self.buckets, value)] += 1
+        data[-2] += value
+        data[-1] += 1
+
+    def render(self, series: Dict[LabelValues, Any]) -> List[str]:
+        """Render cumulative buckets, sum and count per label set"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, data in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, data):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (bound,))
+                lines.append(f"{self.name}_bucket{bucket_labels} {_format_value(cumulative)}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(data[-2])}")
+            lines.append(f"{self.name}_count{label_str} {_format_value(data[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics recorded into per-thread shards"""
+
+    def __init__(self, multiprocess_dir: Optional[str] = None):
+        """Initialize the metrics registry"""
+        self.multiprocess_dir = multiprocess_dir
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[SeriesKey, Any]]] = []
+        self._retired: Dict[SeriesKey, Any] = {}
+        self._flusher: Optional[threading.Thread] = None
+
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+            atexit.register(self.flush, True)
+
+    def _reset(self) -> None:
+        """Start from empty shards in a forked child process"""
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._flusher = None
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Define a counter"""
+        return self._define(Counter(self, name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """Define a gauge"""
+        return self._define(Gauge(self, name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        """Define a histogram"""
+        return self._define(Histogram(self, name, documentation, labelnames, buckets))
+
+    def _define(self, metric: Metric) -> Any:
+        """Register a metric definition"""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric '{metric.name}' is already defined")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def shard(self) -> Dict[SeriesKey, Any]:
+        """Get the calling thread's shard"""
+        try:
+            return self._local.values
+        except AttributeError:
+            return self._new_shard()
+
+    def _new_shard(self) -> Dict[SeriesKey, Any]:
+        """Create and register a shard for the calling thread"""
+        values: Dict[SeriesKey, Any] = {}
+        with self._lock:
+            if len(self._shards) >= MAX_LIVE_SHARDS:
+                self._retire_dead_shards()
+            self._shards.append((threading.current_thread(), values))
+            if self.multiprocess_dir and self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="mcp-metrics", daemon=True)
+                self._flusher.start()
+        self._local.values = values
+        return values
+
+    def _retire_dead_shards(self) -> None:
+        """Fold shards of finished threads into the retired totals (lock held)"""
+        live = []
+        for thread, values in self._shards:
+            if thread.is_alive():
+                live.append((thread, values))
+            else:
+                _merge_into(self._retired, values)
+        self._shards = live
+
+    def snapshot(self) -> Dict[SeriesKey, Any]:
+        """Merge all shards of this process"""
+        with self._lock:
+            self._retire_dead_shards()
+            merged = _copy_series(self._retired)
+            shards = [values for _, values in self._shards]
+        for values in shards:
+            _merge_into(merged, dict(values))
+        return merged
+
+    def collect(self) -> Dict[SeriesKey, Any]:
+        """Merge this process's snapshot with those of the other workers"""
+        merged = self.snapshot()
+        if not self.multiprocess_dir:
+            return merged
+
+        own_file = self._process_file(self.multiprocess_dir, os.getpid())
+        for filename in os.listdir(self.multiprocess_dir):
+            path = os.path.join(self.multiprocess_dir, filename)
+            if path == own_file or not filename.endswith(".json"):
+                continue
+            try:
+                with open(path) as f:
+                    series = json.load(f)
+            except (OSError, ValueError):
+                continue
+            _merge_into(merged, {(name, tuple(labels)): value for name, labels, value in series})
+        return merged
+
+    def export(self) -> str:
+        """Render every metric in the Prometheus text format"""
+        by_metric: Dict[str, Dict[LabelValues, Any]] = {name: {} for name in self._metrics}
+        for (name, labels), value in self.collect().items():
+            if name in by_metric:
+                by_metric[name][labels] = value
+
+        lines: List[str] = []
+        for name, metric in self._metrics.items():
+            lines.extend(metric.render(by_metric[name]))
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _process_file(directory: str, pid: int) -> str:
+        """Snapshot file of a worker process"""
+        return os.path.join(directory, f"metrics-{pid}.json")
+
+    def flush(self, exiting: bool = False) -> None:
+        """Write this process's snapshot for the other workers to merge"""
+        if not self.multiprocess_dir:
+            return
+
+        gauges = {name for name, metric in self._metrics.items() if isinstance(metric, Gauge)}
+        series = [
+            [name, list(labels), value]
+            for (name, labels), value in self.snapshot().items()
+            if not (exiting and name in gauges)
+        ]
+        path = self._process_file(self.multiprocess_dir, os.getpid())
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(series, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {str(e)}")
+
+    def _flush_loop(self) -> None:
+        """Periodically flush this process's snapshot"""
+        event = threading.Event()
+        while not event.wait(FLUSH_INTERVAL):
+            self.flush()
+
+    def mark_process_dead(self, pid: int) -> None:
+        """Drop the gauges of a worker that exited without flushing"""
+        if not self.multiprocess_dir:
+            return
+
+        path = self._process_file(self.multiprocess_dir, pid)
+        gauges = {name for name, metric in self._metrics.items() if isinstance(metric, Gauge)}
+        try:
+            with open(path) as f:
+                series = [item for item in json.load(f) if item[0] not in gauges]
+            with open(path, "w") as f:
+                json.dump(series, f)
+        except (OSError, ValueError):
+            pass
+
+
+def _merge_into(target: Dict[SeriesKey, Any], source: Dict[SeriesKey, Any]) -> None:
+    """Add the series of ``source`` into ``target``"""
+    for key, value in source.items():
+        current = target.get(key)
+        if isinstance(value, list):
+            if current is None:
+                target[key] = list(value)
+            else:
+                for i, item in enumerate(value):
+                    current[i] += item
+        else:
+            target[key] = (current or 0) + value
+
+
+def _copy_series(series: Dict[SeriesKey, Any]) -> Dict[SeriesKey, Any]:
+    """Copy series so that merging into the copy leaves the original intact"""
+    return {key: list(value) if isinstance(value, list) else value for key, value in series.items()}
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues) -> str:
+    """Format a label set, e.g. ``{service="github",tool="list_issues"}``"""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+# Create a global metrics registry
+metrics = MetricsRegistry(os.environ.get("MCP_METRICS_DIR"))
+
+# Tool execution metrics
+TOOL_CALLS = metrics.counter(
+    "mcp_tool_calls_total",
+    "Tool calls by service, tool and response status",
+    ("service", "tool", "status")
+)
+TOOL_DURATION = metrics.histogram(
+    "mcp_tool_duration_seconds",
+    "Tool execution latency in seconds",
+    ("service", "tool")
+)
+TOOL_TIMEOUTS = metrics.counter(
+    "mcp_tool_timeouts_total",
+    "Tool calls that exceeded their deadline",
+    ("service", "tool")
+)
+TOOL_QUEUE_WAIT = metrics.histogram(
+    "mcp_tool_queue_wait_seconds",
+    "Time tool calls waited for a bulkhead slot, by priority class",
+    ("service", "priority")
+)
+TOOL_IN_FLIGHT = metrics.gauge(
+    "mcp_tool_in_flight",
+    "Tool calls currently executing",
+    ("service", "tool")
+)
+
+# HTTP payload metrics
+REQUEST_BYTES = metrics.histogram(
+    "mcp_http_request_bytes",
+    "HTTP request body size in bytes",
+    ("endpoint",),
+    BYTES_BUCKETS
+)
+RESPONSE_BYTES = metrics.histogram(
+    "mcp_http_response_bytes",
+    "HTTP response body size in bytes",
+    ("endpoint",),
+    BYTES_BUCKETS
+)
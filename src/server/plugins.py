@@ -0,0 +1,273 @@
+"""
+Service plugin module - Lazy discovery and loading of MCP services
+
+Services are discovered from a manifest (``src/services/manifest.json``) and
+from the ``mcp_server.services`` entry point group. Each plugin names the
+initializer that builds its ``MCPService`` (``module:function``).
+
+The manifest also caches each service's metadata and tool schemas. At startup
+the registry gets lightweight stub tools built from that metadata; the
+service module is only imported and initialized on the first call to one of
+its tools, at which point the real service replaces the stubs. Plugins
+without cached metadata are loaded at startup.
+
+Regenerate the manifest after changing a service's tools:
+
+    python -m src.server.plugins --write-manifest
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from src.server.mcp_registry import MCPRegistry, registry
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "mcp_server.services"
+DEFAULT_MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "services", "manifest.json"
+)
+MANIFEST_PATH = os.environ.get("MCP_SERVICE_MANIFEST", DEFAULT_MANIFEST_PATH)
+
+# Tool fields cached in the manifest, in addition to the parameter schema
+TOOL_METADATA_FIELDS = ("name", "description", "cache_ttl", "cache_max_entries", "mutates", "projects")
+SERVICE_METADATA_FIELDS = ("type", "name", "description", "base_url")
+
+
+class ServicePlugin:
+    """A service that is initialized on demand"""
+
+    def __init__(self, entry_point: str, metadata: Optional[Dict[str, Any]] = None):
+        """Initialize the plugin from its initializer path and cached metadata"""
+        self.entry_point = entry_point
+        self.metadata = metadata
+        self.service: Optional[MCPService] = None
+        self.lock = threading.Lock()
+
+    @property
+    def service_type(self) -> Optional[ServiceType]:
+        """Service type from the cached metadata, or of the loaded service"""
+        if self.service is not None:
+            return self.service.type
+        if self.metadata is not None:
+            return ServiceType(self.metadata["service"]["type"])
+        return None
+
+    def initializer(self) -> Callable[[], MCPService]:
+        """Import the plugin module and return its initializer"""
+        module_name, _, attribute = self.entry_point.partition(":")
+        module = importlib.import_module(module_name)
+        return getattr(module, attribute)
+
+    def initialize(self) -> MCPService:
+        """Build a fresh service instance"""
+        service = self.initializer()()
+        self._check_metadata(service)
+        return service
+
+    def _check_metadata(self, service: MCPService) -> None:
+        """Warn when the cached metadata no longer matches the service"""
+        if self.metadata is None:
+            return
+        cached = {tool["name"] for tool in self.metadata["tools"]}
+        actual = {tool.name for tool in service.tools}
+        if cached != actual:
+            logger.warning(
+                f"Service manifest is stale for {service.type}: cached tools {sorted(cached)}, "
+                f"actual tools {sorted(actual)}. Regenerate it with "
+                f"'python -m src.server.plugins --write-manifest'."
+            )
+
+
+def service_metadata(service: MCPService) -> Dict[str, Any]:
+    """Extract the cacheable metadata of a service"""
+    return {
+        "service": {field: getattr(service, field) for field in SERVICE_METADATA_FIELDS},
+        "tools": [
+            dict(
+                {field: getattr(tool, field) for field in TOOL_METADATA_FIELDS},
+                parameters=tool.parameters.dict()
+            )
+            for tool in service.tools
+        ]
+    }
+
+
+class PluginLoader:
+    """
+    Discovers service plugins and registers them with the registry
+
+    Stub tools forward their first call to the real service, loading it
+    once under the plugin's lock.
+    """
+
+    def __init__(self, registry: MCPRegistry, manifest_path: str = MANIFEST_PATH):
+        """Initialize the loader"""
+        self.registry = registry
+        self.manifest_path = manifest_path
+        self.plugins: Dict[ServiceType, ServicePlugin] = {}
+
+    def discover(self) -> List[ServicePlugin]:
+        """Read plugins from the manifest and the entry point group"""
+        manifest = read_manifest(self.manifest_path)
+        plugins = {
+            item["entry_point"]: ServicePlugin(item["entry_point"], item)
+            for item in manifest.get("services", [])
+        }
+
+        for entry_point in discover_entry_points():
+            if entry_point not in plugins:
+                plugins[entry_point] = ServicePlugin(entry_point)
+
+        return list(plugins.values())
+
+    def register_all(self, eager: bool = False) -> None:
+        """
+        Register every discovered service
+
+        Services with cached metadata are registered as stubs unless
+        ``eager`` is set, in which case every service is initialized now.
+        """
+        for plugin in self.discover():
+            if eager or plugin.metadata is None:
+                self._load(plugin)
+                continue
+
+            service = self._stub_service(plugin.metadata)
+            self.plugins[service.type] = plugin
+            self.registry.register_service(service)
+            logger.info(f"Registered lazy service {service.type} from {plugin.entry_point}")
+
+    def _load(self, plugin: ServicePlugin) -> MCPService:
+        """Initialize a plugin's service and register it"""
+        service = plugin.initialize()
+        # Swapping in the real service for the plugin's stubs, or reloading it, is expected
+        replace = self.plugins.get(service.type) is plugin
+        self.plugins[service.type] = plugin
+        self.registry.register_service(service, replace)
+        # Only mark the plugin loaded once the registry routes to the real service
+        plugin.service = service
+        return service
+
+    def ensure_loaded(self, service_type: ServiceType) -> MCPService:
+        """Load a service on first use; concurrent callers wait for one load"""
+        plugin = self.plugins[service_type]
+        if plugin.service is not None:
+            return plugin.service
+
+        with plugin.lock:
+            service = plugin.service
+            if service is None:
+                logger.info(f"Loading service {service_type} from {plugin.entry_point}")
+                service = self._load(plugin)
+            return service
+
+    def reload(self, service_type: ServiceType) -> MCPService:
+        """Re-run a service's initializer and swap the new service in"""
+        plugin = self.plugins[service_type]
+        with plugin.lock:
+            return self._load(plugin)
+
+    def _stub_service(self, metadata: Dict[str, Any]) -> MCPService:
+        """Build a service from a plugin's cached metadata, whose tools load the real service when called"""
+        service = MCPService(**metadata["service"])
+        service.tools = [
+            Tool(
+                service=service.type,
+                function=self._stub_function(service.type, item["name"]),
+                parameters=ToolSchema(**item["parameters"]),
+                **{field: item[field] for field in TOOL_METADATA_FIELDS if field in item}
+            )
+            for item in metadata["tools"]
+        ]
+        return service
+
+    def _stub_function(self, service_type: ServiceType, tool_name: str) -> Callable[[Dict[str, Any]], Any]:
+        """Build a stub that loads the service and forwards to the real tool"""
+        def call(params: Dict[str, Any]) -> Any:
+            self.ensure_loaded(service_type)
+            entry = self.registry.resolve(tool_name, service_type)
+            if entry is None or entry.function is None or entry.function is call:
+                raise RuntimeError(f"Tool '{tool_name}' is not provided by service {service_type}")
+
+            if entry.is_async:
+                # Stubs run on the tool thread pool; run the coroutine on the engine loop
+                future = asyncio.run_coroutine_threadsafe(entry.function(params), self.registry.engine.loop)
+                return future.result()
+            return entry.function(params)
+
+        return call
+
+
+def discover_entry_points() -> List[str]:
+    """Initializer paths registered under the ``mcp_server.services`` group"""
+    from importlib.metadata import entry_points
+
+    if sys.version_info >= (3, 10):
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    else:
+        found = entry_points().get(ENTRY_POINT_GROUP, [])
+    return [entry_point.value for entry_point in found]
+
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    """Read the service manifest, or an empty one if it doesn't exist"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"services": []}
+
+
+def write_manifest(path: str, entry_points: List[str]) -> Dict[str, Any]:
+    """Initialize every service and cache its metadata in the manifest"""
+    services = []
+    for entry_point in entry_points:
+        plugin = ServicePlugin(entry_point)
+        metadata = service_metadata(plugin.initialize())
+        services.append(dict(entry_point=entry_point, **metadata))
+
+    manifest = {"services": services}
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+# Create a global plugin loader for the global registry
+plugin_loader = PluginLoader(registry)
+
+
+def main() -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Manage MCP service plugins")
+    parser.add_argument("--write-manifest", action="store_true",
+                        help="Regenerate the service manifest, including installed entry points")
+    parser.add_argument("--add", action="append", default=[], metavar="MODULE:FUNCTION",
+                        help="Add a service initializer to the manifest")
+    parser.add_argument("--manifest", default=MANIFEST_PATH, help="Manifest path")
+    args = parser.parse_args()
+
+    if not args.write_manifest and not args.add:
+        for plugin in PluginLoader(registry, args.manifest).discover():
+            cached = "cached" if plugin.metadata else "not cached"
+            print(f"{plugin.entry_point} ({cached})")
+        return
+
+    entry_points = [item["entry_point"] for item in read_manifest(args.manifest).get("services", [])]
+    for entry_point in discover_entry_points() + args.add:
+        if entry_point not in entry_points:
+            entry_points.append(entry_point)
+    manifest = write_manifest(args.manifest, entry_points)
+    print(f"Wrote {len(manifest['services'])} services to {args.manifest}")
+
+
+if __name__ == "__main__":
+    main()
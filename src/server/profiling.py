@@ -0,0 +1,258 @@
+"""
+Profiling module - On-demand cProfile sessions for tool requests
+
+An admin arms a session for the next ``requests`` tool requests, optionally
+only those for one tool. Each claimed request runs under its own
+``cProfile.Profile`` on the request thread, and the thread pool call of a
+plain function tool gets one as well; the results are aggregated per part
+(``request`` and ``tool``) and can be downloaded as a pstats dump or as
+folded stacks for flame graphs. Coroutine tools and the engine loop's
+scheduling aren't profiled: they show up as time the request thread spends
+waiting. While no session is armed, a request costs one attribute check
+and a thread pool call one context variable lookup.
+"""
+import cProfile
+import logging
+import marshal
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Most requests a single profiling session may cover
+MAX_REQUESTS = int(os.environ.get("MCP_PROFILE_MAX_REQUESTS", 10000))
+
+# Stacks under this fraction of the total time are left out of the folded output
+FOLDED_MIN_FRACTION = 1e-4
+
+# Session profiling the request being served, if any
+current_profile: ContextVar[Optional["ProfileSession"]] = ContextVar("mcp_current_profile", default=None)
+
+FunctionKey = Tuple[str, int, str]
+
+
+def function_label(function: FunctionKey) -> str:
+    """Short name of a pstats function key"""
+    filename, lineno, name = function
+    if filename == "~" and lineno == 0:
+        # Built-in function
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def stats_table(stats: pstats.Stats) -> Dict[FunctionKey, Tuple[Any, ...]]:
+    """The ``{function: (cc, nc, tt, ct, callers)}`` table of a profile, as ``dump_stats`` writes it"""
+    # The table is missing from the type stubs
+    return stats.stats  # type: ignore[attr-defined]
+
+
+def folded_stacks(stats: pstats.Stats, root: str) -> Dict[str, float]:
+    """
+    Approximate folded stacks from a profile's call graph
+
+    cProfile only records caller/callee pairs, so the time of a function is
+    split between its callers in proportion to the time each call edge
+    took. Recursive edges are cut. Returns seconds per ``;``-joined stack.
+    """
+    entries = stats_table(stats)
+    callees: Dict[FunctionKey, Dict[FunctionKey, float]] = defaultdict(dict)
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][function] = edge[3]
+
+    total = sum(entries[function][3] for function, entry in entries.items() if not entry[4])
+    minimum = total * FOLDED_MIN_FRACTION
+    folded: Dict[str, float] = defaultdict(float)
+    on_path = set()
+
+    def walk(function: FunctionKey, path: str, share: float) -> None:
+        _, _, own, cumulative, _ = entries[function]
+        path = f"{path};{function_label(function)}"
+        if own * share >= minimum:
+            folded[path] += own * share
+        on_path.add(function)
+        for callee, edge_time in callees[function].items():
+            callee_time = entries[callee][3]
+            if callee in on_path or callee_time <= 0 or edge_time * share < minimum:
+                continue
+            walk(callee, path, edge_time * share / callee_time)
+        on_path.discard(function)
+
+    for function, entry in entries.items():
+        if not entry[4]:
+            walk(function, root, 1.0)
+    return folded
+
+
+class ProfileSession:
+    """
+    A profiling session and its aggregated results
+
+    Claims and merges happen under the profiler's lock; profiles are taken
+    without it.
+    """
+
+    def __init__(self, requests: int, tool: Optional[str], lock: threading.Lock):
+        """Initialize a session covering the next ``requests`` matching requests"""
+        self.requests = requests
+        self.tool = tool
+        self.remaining = requests
+        self.profiled = 0
+        self.skipped = 0
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._lock = lock
+        self._parts: Dict[str, pstats.Stats] = {}
+
+    def run(self, part: str, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``function`` under a profiler and add the result to ``part``"""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is active on this interpreter (Python 3.12+)
+            if part == "request":
+                with self._lock:
+                    self.skipped += 1
+            return function(*args, **kwargs)
+
+        token = current_profile.set(self)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profile.disable()
+            current_profile.reset(token)
+            self._add(part, profile)
+
+    def wrap(self, part: str, function: Callable[..., T]) -> Callable[..., T]:
+        """Profile every call of ``function`` into ``part``"""
+        def profiled(*args: Any, **kwargs: Any) -> T:
+            return self.run(part, function, *args, **kwargs)
+        return profiled
+
+    def _add(self, part: str, profile: cProfile.Profile) -> None:
+        """Merge a finished profile"""
+        stats = pstats.Stats(profile)
+        with self._lock:
+            if part in self._parts:
+                self._parts[part].add(stats)
+            else:
+                self._parts[part] = stats
+            if part == "request":
+                self.profiled += 1
+                if self.profiled + self.skipped >= self.requests:
+                    self.finished_at = time.time()
+
+    def stats(self) -> pstats.Stats:
+        """All parts merged into one ``pstats.Stats``"""
+        merged = pstats.Stats()
+        with self._lock:
+            for stats in self._parts.values():
+                merged.add(stats)
+        return merged
+
+    def dump(self) -> bytes:
+        """The merged stats in the ``pstats`` file format (``pstats.Stats(path)`` loads it)"""
+        return marshal.dumps(stats_table(self.stats()))
+
+    def folded(self) -> str:
+        """Folded stacks of every part, one ``frame;frame;... microseconds`` line per stack"""
+        with self._lock:
+            parts = list(self._parts.items())
+        lines = []
+        for part, stats in parts:
+            for stack, seconds in folded_stacks(stats, part).items():
+                microseconds = round(seconds * 1e6)
+                if microseconds:
+                    lines.append(f"{stack} {microseconds}")
+        lines.sort()
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def top(self, sort: str = "tottime", limit: int = 20) -> List[Dict[str, Any]]:
+        """The functions taking the most time, by own (``tottime``) or cumulative (``cumtime``) time"""
+        index = 3 if sort == "cumtime" else 2
+        entries = sorted(stats_table(self.stats()).items(), key=lambda item: item[1][index], reverse=True)
+        return [{
+            "function": function_label(function),
+            "ncalls": calls,
+            "tottime": round(own, 6),
+            "cumtime": round(cumulative, 6)
+        } for function, (_, calls, own, cumulative, _) in entries[:limit]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the session"""
+        return {
+            "tool": self.tool,
+            "requests": self.requests,
+            "remaining": self.remaining,
+            "profiled": self.profiled,
+            "skipped": self.skipped,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+
+class Profiler:
+    """
+    Arms profiling sessions and hands out their requests
+
+    ``armed`` is the only thing request handling reads while profiling is
+    off. A new session replaces the previous one and its results.
+    """
+
+    def __init__(self):
+        """Initialize the profiler with no session"""
+        self.armed = False
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, requests: int, tool: Optional[str] = None) -> ProfileSession:
+        """Profile the next ``requests`` tool requests, only those for ``tool`` if given"""
+        if not 0 < requests <= MAX_REQUESTS:
+            raise ValueError(f"Requests must be between 1 and {MAX_REQUESTS}")
+        with self._lock:
+            self.session = ProfileSession(requests, tool, self._lock)
+            self.armed = True
+        logger.info("Profiling the next %d requests%s", requests, f" for tool {tool}" if tool else "")
+        return self.session
+
+    def stop(self) -> Optional[ProfileSession]:
+        """Stop handing out requests; the session's results are kept"""
+        with self._lock:
+            self.armed = False
+            session = self.session
+            if session is not None and session.remaining:
+                session.requests -= session.remaining
+                session.remaining = 0
+                if session.profiled + session.skipped >= session.requests:
+                    session.finished_at = time.time()
+        return session
+
+    def claim(self, tool_names: Collection[str]) -> Optional[ProfileSession]:
+        """
+        Claim a request for the armed session
+
+        ``tool_names`` are the names the request's tool goes by (bare and
+        namespaced). Returns the session when the request is to be profiled.
+        """
+        with self._lock:
+            session = self.session
+            if not self.armed or session is None:
+                return None
+            if session.tool is not None and session.tool not in tool_names:
+                return None
+            session.remaining -= 1
+            if not session.remaining:
+                self.armed = False
+            return session
+
+
+# Create the global profiler
+profiler = Profiler()
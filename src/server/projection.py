@@ -0,0 +1,150 @@
+"""
+Projection module - Sparse fieldsets of tool results
+
+A tool request's ``fields`` lists the fields of each record to return, as
+dotted paths into nested records (``assignee.login``). Other fields are
+dropped before the result is cached or serialized. Each distinct field set
+is compiled once into a ``Projection``: a plan of nested functions building
+the projected records, kept in an LRU cache of ``PROJECTION_CACHE_SIZE``
+plans so repeated field sets skip parsing.
+
+The registry projects a tool's result on the service's thread pool, record by
+record for iterators so streams stay streamed. Tools marked ``projects`` get
+the projection through ``current_projection`` instead, to push it down to the
+upstream API, and return records that are already projected.
+"""
+import functools
+import os
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.server.validation import ToolValidationError
+from src.utils.types import Page
+
+# Compiled projection plans kept for reuse
+PROJECTION_CACHE_SIZE = int(os.environ.get("MCP_PROJECTION_CACHE_SIZE", 256))
+# Largest number of fields a request may select
+MAX_FIELDS = int(os.environ.get("MCP_MAX_FIELDS", 100))
+
+Plan = Callable[[Any], Any]
+
+
+class ProjectionError(ToolValidationError):
+    """Raised when a request's fields can't be compiled into a projection"""
+
+
+class Projection:
+    """A compiled sparse fieldset"""
+
+    def __init__(self, fields: Tuple[str, ...], record: Plan):
+        """Initialize the projection of the normalized ``fields`` with its plan"""
+        self.fields = fields
+        self.key = ",".join(fields)
+        self.record = record
+
+    def project(self, result: Any) -> Any:
+        """Project each record of a tool result; iterators are projected as they are consumed"""
+        if isinstance(result, list):
+            record = self.record
+            return [record(item) for item in result]
+        if isinstance(result, Page):
+            return Page(items=self.project(result.items), next_cursor=result.next_cursor)
+        if isinstance(result, Iterator):
+            return self._project_records(result)
+        return self.record(result)
+
+    def _project_records(self, records: Iterator[Any]) -> Iterator[Any]:
+        """Project the records of an iterator one at a time"""
+        record = self.record
+        try:
+            for item in records:
+                yield record(item)
+        finally:
+            # Stopping early closes the tool's generator too
+            close = getattr(records, "close", None)
+            if close is not None:
+                close()
+
+    def wrap(self, function: Callable[[Dict[str, Any]], Any], is_async: bool) -> Callable[[Dict[str, Any]], Any]:
+        """Wrap a tool function to project its result"""
+        if is_async:
+            async def call_async(parameters: Dict[str, Any]) -> Any:
+                return self.project(await function(parameters))
+            return call_async
+
+        def call(parameters: Dict[str, Any]) -> Any:
+            return self.project(function(parameters))
+        return call
+
+
+# Projection of the running tool call, for tools pushing it down to their upstream API
+current_projection: ContextVar[Optional[Projection]] = ContextVar("current_projection", default=None)
+
+
+def _field_tree(fields: Sequence[str]) -> Dict[str, Any]:
+    """Nest dotted field paths into a tree; a leaf (None) selects the whole value"""
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        names = path.split(".")
+        if not all(names):
+            raise ProjectionError(f"Invalid field '{path}'")
+        node = tree
+        for name in names[:-1]:
+            child = node.get(name, {})
+            if child is None:
+                # The whole value is already selected
+                break
+            node = node.setdefault(name, child)
+        else:
+            node[names[-1]] = None
+    return tree
+
+
+def _compile_plan(tree: Dict[str, Any]) -> Plan:
+    """Compile a field tree into a function projecting one record, or each record of a list"""
+    names = tuple(name for name, child in tree.items() if child is None)
+    nested: List[Tuple[str, Plan]] = [
+        (name, _compile_plan(child)) for name, child in tree.items() if child is not None
+    ]
+
+    if not nested:
+        def project(value: Any) -> Any:
+            if isinstance(value, dict):
+                return {name: value[name] for name in names if name in value}
+            if isinstance(value, list):
+                return [project(item) for item in value]
+            return value
+        return project
+
+    def project_nested(value: Any) -> Any:
+        if isinstance(value, dict):
+            projected = {name: value[name] for name in names if name in value}
+            for name, plan in nested:
+                if name in value:
+                    projected[name] = plan(value[name])
+            return projected
+        if isinstance(value, list):
+            return [project_nested(item) for item in value]
+        return value
+    return project_nested
+
+
+@functools.lru_cache(maxsize=PROJECTION_CACHE_SIZE)
+def _compile(fields: Tuple[str, ...]) -> Projection:
+    """Compile normalized fields into a projection"""
+    return Projection(fields, _compile_plan(_field_tree(fields)))
+
+
+def compile_projection(fields: Sequence[str]) -> Projection:
+    """The projection selecting ``fields``, compiled once per distinct field set"""
+    if not fields:
+        raise ProjectionError("fields must select at least one field")
+    if len(fields) > MAX_FIELDS:
+        raise ProjectionError(f"{len(fields)} fields exceed the limit of {MAX_FIELDS}")
+    return _compile(tuple(sorted(set(fields))))
+
+
+def projection_stats() -> Dict[str, int]:
+    """Counters of the projection plan cache"""
+    info = _compile.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "plans": info.currsize}
@@ -0,0 +1,381 @@
+"""
+Rate limiting module - Per-service rate limiters tuned by upstream quotas
+
+Every service has a rate limiter in front of its tool calls, combining:
+
+- a token bucket with the configured rate and burst (``MCP_RATE_LIMIT``,
+  unlimited by default)
+- the upstream quota, tuned from the rate-limit headers of upstream
+  responses: ``X-RateLimit-Limit`` / ``X-RateLimit-Remaining`` /
+  ``X-RateLimit-Reset`` give the calls left in the current window, and
+  ``Retry-After`` blocks the service for a while
+
+Calls wait for both; calls that would have to wait longer than ``max_wait``
+or their deadline are shed instead of being sent to fail upstream.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from src.utils.types import ServiceType
+
+DEFAULT_RATE = float(os.environ.get("MCP_RATE_LIMIT", 0)) or None
+DEFAULT_BURST = int(os.environ.get("MCP_RATE_LIMIT_BURST", 0)) or None
+DEFAULT_MAX_WAIT = float(os.environ.get("MCP_RATE_LIMIT_MAX_WAIT", 5))
+# Seconds to back off after a 429 response without a Retry-After header
+DEFAULT_BACKOFF = 1.0
+# Seconds by which reset times must differ to belong to different windows,
+# at most a quarter of the window for short windows
+WINDOW_TOLERANCE = 0.5
+# Seconds around a window reset in which no calls are sent, as a call sent
+# just before the reset may reach the upstream just after it; at most an
+# eighth of the window for short windows
+SEND_MARGIN = 0.25
+
+LIMIT_HEADERS = ("x-ratelimit-limit", "x-ratelimit-requests-limit")
+REMAINING_HEADERS = ("x-ratelimit-remaining", "x-ratelimit-requests-remaining")
+RESET_HEADERS = ("x-ratelimit-reset", "x-ratelimit-requests-reset")
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a call can't be admitted by its service's rate limiter in time"""
+
+
+class RateLimiter:
+    """
+    Rate limiter for the upstream API of a single service
+
+    ``acquire`` is awaited on the execution engine loop, while ``observe`` is
+    called from the thread that made the upstream request, so state changes
+    are guarded by a lock.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: Optional[int] = DEFAULT_BURST,
+        max_wait: float = DEFAULT_MAX_WAIT
+    ):
+        """Initialize the limiter with a full bucket; a rate of None means unlimited"""
+        self.rate = rate
+        self.burst = burst or max(1, math.ceil(rate or 1))
+        self.max_wait = max_wait
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+        # Upstream quota; None until the upstream reports one. Window ends
+        # are Unix times, like the reset times reported by the upstream.
+        self.quota: Optional[float] = None
+        self.upstream_limit: Optional[int] = None
+        self.window_end = 0.0
+        self.window_confirmed = False
+        self.window_length = 0.0
+        self.last_window_end = 0.0
+        self.blocked_until = 0.0
+        self.in_flight = 0
+        # Quota windows started so far
+        self.windows = 0
+
+        self.queued = 0
+        self.throttled = 0
+        self.shed = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Refill the bucket, and the quota once its window is over; lock must be held"""
+        if self.rate is not None:
+            self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        # Calls sent from here on may land in the next window, so they are counted there
+        if self.window_end and time.time() >= self.window_end - self._margin():
+            self._next_window()
+
+    def _margin(self) -> float:
+        """Seconds around a window reset in which no calls are sent; lock must be held"""
+        return min(SEND_MARGIN, self.window_length / 8)
+
+    def _next_window(self) -> None:
+        """Start the next quota window; lock must be held"""
+        self.windows += 1
+        self.last_window_end = self.window_end
+        self.window_confirmed = False
+        if self.upstream_limit is None or self.quota is None:
+            self.quota = None
+            self.window_end = 0.0
+            return
+        # Calls already waiting for the quota keep their claim on the new window
+        self.quota = self.upstream_limit + min(self.quota, 0.0)
+        # Expect the next window to be as long as the last one until told otherwise
+        self.window_end = max(self.window_end + self.window_length, time.time())
+
+    def _windows_ahead(self) -> int:
+        """Number of window resets it takes to cover the quota deficit; lock must be held"""
+        if self.quota is None or self.quota >= 1:
+            return 0
+        return math.ceil((1 - self.quota) / self.upstream_limit) if self.upstream_limit else 1
+
+    def _window_wait(self, windows: int) -> float:
+        """Seconds until ``windows`` more windows have started, by the current estimate; lock must be held"""
+        if windows <= 0:
+            return 0.0
+        if not self.window_end:
+            return DEFAULT_BACKOFF + (windows - 1) * self.window_length
+        # Calls counted in the next window are sent once it has surely started upstream
+        return self.window_end + self._margin() - time.time() + (windows - 1) * self.window_length
+
+    def _reset_wait(self) -> float:
+        """Seconds until the upstream has surely started the current window; lock must be held"""
+        if not self.last_window_end:
+            return 0.0
+        return max(0.0, self.last_window_end + self._margin() - time.time())
+
+    def _wait_time(self, now: float) -> float:
+        """Seconds until both a token and the quota are available; lock must be held"""
+        wait = max(0.0, self.blocked_until - now)
+        if self.rate is not None and self.tokens < 1:
+            wait = max(wait, (1 - self.tokens) / self.rate)
+        # Wait for as many window resets as it takes to cover the deficit
+        return max(wait, self._reset_wait(), self._window_wait(self._windows_ahead()))
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[Tuple[float, int]]:
+        """
+        Take a token and a unit of quota, returning how many seconds to wait for them
+
+        Also returns the number of the quota window the call may be sent in.
+        Returns None, without taking anything, when the wait would exceed
+        ``max_wait`` (capped at the limiter's own ``max_wait``).
+        """
+        limit = self.max_wait if max_wait is None else min(self.max_wait, max_wait)
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = self._wait_time(now)
+            if wait > limit:
+                self.shed += 1
+                return None
+            window = self.windows + self._windows_ahead()
+            if self.rate is not None:
+                self.tokens -= 1
+            if self.quota is not None:
+                self.quota -= 1
+            if wait > 0:
+                self.throttled += 1
+            return wait, window
+
+    def refund(self) -> None:
+        """Give back the token and quota of a reserved call that was never sent"""
+        with self._lock:
+            if self.rate is not None:
+                self.tokens = min(float(self.burst), self.tokens + 1)
+            if self.quota is not None:
+                self.quota += 1
+
+    async def acquire(self, max_wait: Optional[float] = None) -> None:
+        """
+        Wait for a token and a unit of quota
+
+        Raises ``RateLimitExceededError`` when the call should be shed, including
+        when a ``Retry-After`` received while waiting pushes it past ``max_wait``.
+        """
+        reservation = self.reserve(max_wait)
+        if reservation is None:
+            raise RateLimitExceededError(f"Rate limit reached (retry after {self.retry_after():.3f}s)")
+        wait, window = reservation
+        if wait <= 0:
+            return
+
+        limit = time.monotonic() + (self.max_wait if max_wait is None else min(self.max_wait, max_wait))
+        self.queued += 1
+        try:
+            while wait > 0:
+                await asyncio.sleep(wait)
+                # A Retry-After received in the meantime, or a window ending
+                # later than estimated, pushes the call back
+                wait = self._wait_for_window(window)
+                if time.monotonic() + wait > limit:
+                    self.shed += 1
+                    self.refund()
+                    raise RateLimitExceededError(f"Rate limit reached (retry after {wait:.3f}s)")
+        except asyncio.CancelledError:
+            self.refund()
+            raise
+        finally:
+            self.queued -= 1
+
+    def _wait_for_window(self, window: int) -> float:
+        """Seconds until a call reserved in quota window ``window`` can be sent"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return max(0.0, self.blocked_until - now, self._reset_wait(), self._window_wait(window - self.windows))
+
+    def retry_after(self) -> float:
+        """Seconds until the next call could be sent"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._wait_time(now)
+
+    def update(
+        self,
+        remaining: Optional[int] = None,
+        reset_at: Optional[float] = None,
+        retry_after: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> None:
+        """
+        Tune the quota from the upstream's view of it
+
+        ``remaining`` out of ``limit`` calls are left in a window ending at
+        Unix time ``reset_at``; ``retry_after`` blocks all calls for that
+        many seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if limit is not None:
+                self.upstream_limit = limit
+            if retry_after is not None:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+            if remaining is None:
+                return
+
+            reset_in = None if reset_at is None else reset_at - time.time()
+            if reset_at is not None and reset_in is not None and reset_in > 0:
+                tolerance = min(WINDOW_TOLERANCE, self.window_length / 4) if self.window_length else WINDOW_TOLERANCE
+                if reset_at <= self.last_window_end + tolerance:
+                    # Answered during a window that is already over here
+                    return
+                if self.window_confirmed and reset_at > self.window_end + tolerance:
+                    # The upstream started the next window before it was due here
+                    self._next_window()
+                if not self.window_confirmed and self.last_window_end:
+                    # Consecutive reset times are exactly one window apart
+                    self.window_length = max(self.window_length, reset_at - self.last_window_end)
+                self.window_end = reset_at
+                self.window_confirmed = True
+                self.window_length = max(self.window_length, reset_in)
+            elif remaining <= 0:
+                self.blocked_until = max(self.blocked_until, now + DEFAULT_BACKOFF)
+
+            # Responses can arrive out of order and don't count requests still
+            # in flight, so the lowest estimate of the quota wins
+            if self.quota is None:
+                self.quota = float(remaining - self.in_flight)
+            else:
+                self.quota = min(self.quota, float(remaining))
+
+    def request_started(self) -> None:
+        """Count an upstream request as in flight"""
+        with self._lock:
+            self.in_flight += 1
+
+    def request_finished(self) -> None:
+        """Count an upstream request as answered, before its response is observed"""
+        with self._lock:
+            self.in_flight -= 1
+
+    def observe(self, headers: Mapping[str, str], status_code: Optional[int] = None) -> None:
+        """Tune the quota from the headers of an upstream response"""
+        headers = {key.lower(): value for key, value in headers.items()}
+        limit = _int_header(headers, LIMIT_HEADERS)
+        remaining = _int_header(headers, REMAINING_HEADERS)
+        reset_at = _reset_at(headers)
+        retry_after = _retry_after(headers.get("retry-after"))
+        if retry_after is None and reset_at is None and status_code == 429:
+            retry_after = DEFAULT_BACKOFF
+        if remaining is None and reset_at is None and retry_after is None:
+            return
+        self.update(remaining, reset_at, retry_after, limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current budget of the limiter"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "burst": None if self.rate is None else self.burst,
+                "tokens": None if self.rate is None else round(self.tokens, 3),
+                "upstream_limit": self.upstream_limit,
+                "upstream_remaining": None if self.quota is None else math.floor(self.quota),
+                "window_reset": round(max(0.0, self.window_end - time.time()), 3) if self.window_end else None,
+                "retry_after": round(self._wait_time(now), 3),
+                "queued": self.queued,
+                "throttled": self.throttled,
+                "shed": self.shed
+            }
+
+
+class RateLimiters:
+    """Rate limiters keyed by service"""
+
+    def __init__(self):
+        """Initialize the limiters"""
+        self._limiters: Dict[ServiceType, RateLimiter] = {}
+
+    def configure(self, service_type: ServiceType, **options: Any) -> RateLimiter:
+        """Replace a service's limiter with one using the given options"""
+        limiter = self._limiters[service_type] = RateLimiter(**options)
+        return limiter
+
+    def get(self, service_type: ServiceType) -> RateLimiter:
+        """Get a service's limiter, creating it with the defaults"""
+        limiter = self._limiters.get(service_type)
+        if limiter is None:
+            limiter = self._limiters[service_type] = RateLimiter()
+        return limiter
+
+    def stats(self, service_type: ServiceType) -> Optional[Dict[str, Any]]:
+        """Budget of a service's limiter, or None if it has not been used"""
+        limiter = self._limiters.get(service_type)
+        return limiter.stats() if limiter else None
+
+
+# Limiter of the service whose tool is being executed
+current_limiter: ContextVar[Optional[RateLimiter]] = ContextVar("mcp_current_limiter", default=None)
+
+
+def _int_header(headers: Mapping[str, str], names: Any) -> Optional[int]:
+    """First of ``names`` present in ``headers``, as an int"""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                return None
+    return None
+
+
+def _reset_at(headers: Mapping[str, str]) -> Optional[float]:
+    """Unix time at which the quota window resets"""
+    for name in RESET_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                reset = float(value)
+            except ValueError:
+                return None
+            # GitHub sends epoch seconds, Linear epoch milliseconds
+            return reset / 1000 if reset > 10 ** 11 else reset
+    return None
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,123 @@
+"""
+Resilience module - Per-service circuit breakers
+
+A breaker counts consecutive failed tool calls for its service. Once the
+failure threshold is reached it opens and calls fail fast until the recovery
+timeout has elapsed. It then lets a limited number of probe calls through
+(half-open): a successful probe closes the breaker, a failed one re-opens it.
+"""
+import os
+import time
+from typing import Any, Dict, Optional
+
+from src.utils.types import ServiceType
+
+DEFAULT_FAILURE_THRESHOLD = int(os.environ.get("MCP_BREAKER_FAILURE_THRESHOLD", 5))
+DEFAULT_RECOVERY_TIMEOUT = float(os.environ.get("MCP_BREAKER_RECOVERY_TIMEOUT", 30))
+DEFAULT_HALF_OPEN_CALLS = int(os.environ.get("MCP_BREAKER_HALF_OPEN_CALLS", 1))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single service
+
+    Used on the execution engine loop only, so it needs no locking.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        half_open_calls: int = DEFAULT_HALF_OPEN_CALLS
+    ):
+        """Initialize the breaker in the closed state"""
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_calls = half_open_calls
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may proceed; counts the call as a probe when half-open"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self.probes = 0
+
+        if self.state == HALF_OPEN:
+            if self.probes >= self.half_open_calls:
+                self.rejected += 1
+                return False
+            self.probes += 1
+
+        return True
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def release(self) -> None:
+        """Give back the probe slot of an allowed call that never reached the service"""
+        if self.state == HALF_OPEN and self.probes > 0:
+            self.probes -= 1
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        self.failures = 0
+        if self.state == HALF_OPEN:
+            self.state = CLOSED
+
+    def record_failure(self) -> None:
+        """Record a failed call"""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current state of the breaker"""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "retry_after": round(self.retry_after(), 3),
+            "rejected": self.rejected
+        }
+
+
+class CircuitBreakers:
+    """Circuit breakers keyed by service"""
+
+    def __init__(self):
+        """Initialize the breakers"""
+        self._breakers: Dict[ServiceType, CircuitBreaker] = {}
+
+    def configure(self, service_type: ServiceType, **options: Any) -> CircuitBreaker:
+        """Replace a service's breaker with one using the given options"""
+        breaker = self._breakers[service_type] = CircuitBreaker(**options)
+        return breaker
+
+    def get(self, service_type: ServiceType) -> CircuitBreaker:
+        """Get a service's breaker, creating it with the defaults"""
+        breaker = self._breakers.get(service_type)
+        if breaker is None:
+            breaker = self._breakers[service_type] = CircuitBreaker()
+        return breaker
+
+    def stats(self, service_type: ServiceType) -> Optional[Dict[str, Any]]:
+        """State of a service's breaker, or None if it has not been used"""
+        breaker = self._breakers.get(service_type)
+        return breaker.stats() if breaker else None
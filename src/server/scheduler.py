@@ -0,0 +1,167 @@
+"""
+Scheduler module - Priority and fair-share admission to tool execution
+
+Calls waiting for a slot in a service's bulkhead are ordered by priority
+class first (interactive, then batch, then background) and, within a class,
+by weighted fair queuing across API clients, so a client's bulk workload
+can't push back the calls of everyone else. The wait queue is bounded: when
+it is full, a new call displaces the most recently queued call of a lower
+class, or is shed if there is none.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.types import Priority
+
+# Classes in the order they are served
+PRIORITIES = (Priority.INTERACTIVE, Priority.BATCH, Priority.BACKGROUND)
+DEFAULT_PRIORITY = Priority.INTERACTIVE
+ANONYMOUS_CLIENT = ""
+
+
+def parse_weights(value: str) -> Dict[str, float]:
+    """Parse client weights given as ``client=weight`` pairs separated by commas"""
+    weights = {}
+    for pair in filter(None, (part.strip() for part in value.split(","))):
+        client, _, weight = pair.partition("=")
+        weights[client.strip()] = float(weight)
+    return weights
+
+
+DEFAULT_CLIENT_WEIGHTS = parse_weights(os.environ.get("MCP_CLIENT_WEIGHTS", ""))
+
+
+class QueueFullError(Exception):
+    """Raised when a call is shed from, or displaced out of, a full wait queue"""
+
+
+class _Waiter:
+    """A call waiting for a slot"""
+
+    __slots__ = ("priority", "start", "seq", "future")
+
+    def __init__(self, priority: Priority, start: float, seq: int, future: "asyncio.Future[None]"):
+        self.priority = priority
+        self.start = start
+        self.seq = seq
+        self.future = future
+
+
+class FairScheduler:
+    """
+    Slot scheduler of a single bulkhead
+
+    Must be used on the execution engine loop. Within a class, each client's
+    calls get virtual finish tags spaced by ``1 / weight`` and are served in
+    tag order, so backlogged clients share the slots in proportion to their
+    weights (1 unless configured).
+    """
+
+    def __init__(self, slots: int, max_queue: int, weights: Optional[Dict[str, float]] = None):
+        """Initialize the scheduler with every slot free"""
+        self.slots = slots
+        self.max_queue = max_queue
+        self.weights = DEFAULT_CLIENT_WEIGHTS if weights is None else weights
+        self.active = 0
+        self.queued = 0
+        self.shed: Dict[Priority, int] = {priority: 0 for priority in PRIORITIES}
+
+        self._queues: Dict[Priority, List[Tuple[float, int, _Waiter]]] = {priority: [] for priority in PRIORITIES}
+        self._waiting: Dict[Priority, int] = {priority: 0 for priority in PRIORITIES}
+        self._virtual_time: Dict[Priority, float] = {priority: 0.0 for priority in PRIORITIES}
+        self._finish_tags: Dict[Priority, Dict[str, float]] = {priority: {} for priority in PRIORITIES}
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: Priority = DEFAULT_PRIORITY, client: Optional[str] = None) -> None:
+        """
+        Wait for a slot
+
+        Raises ``QueueFullError`` when the queue is full of calls of the same
+        or a higher class, or when a higher class call displaces this one.
+        """
+        if self.active < self.slots and not self.queued:
+            self.active += 1
+            return
+
+        if self.queued >= self.max_queue and not self._displace(priority):
+            self.shed[priority] += 1
+            raise QueueFullError(f"Wait queue is full ({self.queued} {priority.value} or higher priority calls)")
+
+        waiter = self._enqueue(priority, client or ANONYMOUS_CLIENT)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.cancelled():
+                self._forget(waiter)
+            elif waiter.future.exception() is None:
+                # The slot was handed over just as the call was cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot, handing it straight to the next waiter if there is one"""
+        waiter = self._next()
+        if waiter is None:
+            self.active -= 1
+        else:
+            waiter.future.set_result(None)
+
+    def _enqueue(self, priority: Priority, client: str) -> _Waiter:
+        """Queue a call with its fair queuing tags"""
+        finish_tags = self._finish_tags[priority]
+        start = max(self._virtual_time[priority], finish_tags.get(client, 0.0))
+        finish = start + 1.0 / self.weights.get(client, 1.0)
+        finish_tags[client] = finish
+
+        waiter = _Waiter(priority, start, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queues[priority], (finish, waiter.seq, waiter))
+        self._waiting[priority] += 1
+        self.queued += 1
+        return waiter
+
+    def _forget(self, waiter: _Waiter) -> None:
+        """Account for a waiter that left the queue; its heap entry is skipped later"""
+        self._waiting[waiter.priority] -= 1
+        self.queued -= 1
+
+    def _next(self) -> Optional[_Waiter]:
+        """Pop the next live waiter, highest class first"""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue:
+                waiter = heapq.heappop(queue)[2]
+                if waiter.future.done():
+                    continue
+                self._forget(waiter)
+                self._virtual_time[priority] = waiter.start
+                if not self._waiting[priority]:
+                    # Idle class: start the next busy period with fresh tags
+                    queue.clear()
+                    self._finish_tags[priority].clear()
+                return waiter
+        return None
+
+    def _displace(self, priority: Priority) -> bool:
+        """Shed the most recently queued call of the lowest class below ``priority``"""
+        for lower in reversed(PRIORITIES[PRIORITIES.index(priority) + 1:]):
+            if not self._waiting[lower]:
+                continue
+            victim = max(
+                (entry[2] for entry in self._queues[lower] if not entry[2].future.done()),
+                key=lambda waiter: waiter.seq
+            )
+            self._forget(victim)
+            self.shed[lower] += 1
+            victim.future.set_exception(QueueFullError(f"Displaced by a higher priority ({priority.value}) call"))
+            return True
+        return False
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Queued and shed calls by class"""
+        return {
+            "queued": {priority.value: self._waiting[priority] for priority in PRIORITIES},
+            "shed": {priority.value: self.shed[priority] for priority in PRIORITIES}
+        }
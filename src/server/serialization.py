@@ -0,0 +1,74 @@
+"""
+Serialization module - Fast JSON encoding of API responses
+
+``dumps`` encodes a response straight to UTF-8 bytes, with orjson when it is
+installed and the standard library otherwise. Pydantic models are encoded
+from their field values, without the deep copy made by ``.dict()``, so a
+``ToolResponse`` envelope and its ``data`` are only walked once, by the
+encoder. The output matches Flask's default JSON provider: sorted keys,
+compact separators, enums as their values and dates as HTTP dates. orjson
+differs only in ways JSON parsers don't see: non-ASCII characters are sent
+as UTF-8 rather than escaped, floats use the shortest exponent form
+(``1e16``), and non-string keys are sorted as strings.
+``JSONProvider`` plugs this into ``jsonify`` for the whole app.
+"""
+import json
+from enum import Enum
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider, _default as flask_default
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def _default(value: Any) -> Any:
+    """Encode the values the JSON encoders don't handle natively"""
+    if isinstance(value, BaseModel):
+        # Shallow: nested values are encoded in place, not copied
+        return dict(value)
+    if isinstance(value, Enum):
+        return value.value
+    return flask_default(value)
+
+
+def _stdlib_dumps(value: Any) -> bytes:
+    """Encode with the standard library, as Flask's default provider does"""
+    return json.dumps(value, default=_default, sort_keys=True, separators=(",", ":")).encode()
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value, pydantic models included, to compact JSON bytes"""
+    if orjson is None:
+        return _stdlib_dumps(value)
+    try:
+        return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+    except TypeError:
+        # orjson.JSONEncodeError: e.g. integers beyond 64 bits, which the standard library handles
+        return _stdlib_dumps(value)
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask JSON provider encoding responses with ``dumps``"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as JSON text; keyword arguments fall back to the standard library"""
+        if kwargs:
+            kwargs.setdefault("default", _default)
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize data to a JSON response without an intermediate string"""
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            # Pretty-printed for debugging
+            return super().response(*args, **kwargs)
+        body = dumps(self._prepare_response_obj(args, kwargs))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
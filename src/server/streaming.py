@@ -0,0 +1,142 @@
+"""
+Streaming module - Record by record delivery of iterator tool results
+
+Tool functions may return an iterator, such as a generator paging through an
+upstream API, instead of a list. Regular calls collect it into a list on the
+service's thread pool. A streamed call hands the records over to its response
+as they are produced, through a ``ToolStream``: a buffer of up to
+``STREAM_BUFFER`` records between the tool's thread, which waits while the
+buffer is full, and the response, which sends the buffered records as one
+chunk. The tool keeps its bulkhead slot until its iterator is exhausted, and
+stops early when the client goes away or the call runs out of time.
+"""
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from src.utils.types import ServiceType, ToolResponse
+
+# Content type of streamed responses
+NDJSON = "application/x-ndjson"
+# Records buffered between a streaming tool and its response
+STREAM_BUFFER = int(os.environ.get("MCP_STREAM_BUFFER", 256))
+
+
+def collect(result: Any) -> Any:
+    """Collect an iterator result into a list; other results are returned as they are"""
+    if isinstance(result, Iterator):
+        return list(result)
+    return result
+
+
+def collecting(function: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+    """Wrap a tool function to collect an iterator result on the thread calling it"""
+    def call(parameters: Dict[str, Any]) -> Any:
+        return collect(function(parameters))
+    return call
+
+
+class ToolStream:
+    """
+    The records of a streamed tool call, on their way from the tool to the response
+
+    The registry runs the tool function wrapped with ``produce`` and
+    ``finish``es the stream with the call's response. The response waits for
+    the stream's header, sends its ``batches`` and closes it once sent or
+    when the client goes away.
+    """
+
+    def __init__(self, service: ServiceType, buffer: int = STREAM_BUFFER):
+        """Initialize an empty stream"""
+        self.service = service
+        self.buffer = buffer
+        # Whether the tool returned an iterator feeding the stream, and whether a record was produced yet
+        self.streamed = False
+        self.started = False
+        self.count = 0
+        self.response: Optional[ToolResponse] = None
+        self._records: Deque[Any] = deque()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def produce(self, function: Callable[[Dict[str, Any]], Any]) -> Callable[[Dict[str, Any]], Any]:
+        """Wrap a tool function to feed the stream with the records of an iterator result"""
+        def call(parameters: Dict[str, Any]) -> Any:
+            result = function(parameters)
+            if not isinstance(result, Iterator):
+                return result
+            self.feed(result)
+            return None
+        return call
+
+    def _stopped(self) -> bool:
+        """Whether the records are no longer wanted"""
+        return self._closed or self.response is not None
+
+    def feed(self, records: Iterator[Any]) -> None:
+        """Add the records of an iterator as it produces them, waiting while the buffer is full"""
+        condition = self._condition
+        self.streamed = True
+        try:
+            # The stream only starts with its first record, so a call failing before it gets an error header
+            for record in records:
+                with condition:
+                    while len(self._records) >= self.buffer and not self._stopped():
+                        condition.wait()
+                    if self._stopped():
+                        return
+                    self._records.append(record)
+                    self.started = True
+                    condition.notify_all()
+        finally:
+            # Let a generator clean up, e.g. release its upstream connection
+            close = getattr(records, "close", None)
+            if close is not None:
+                close()
+
+    def finish(self, response: ToolResponse) -> None:
+        """End the stream with the call's response; the data of a tool that didn't stream becomes its records"""
+        with self._condition:
+            if not self.started and response.status == "success" and response.data is not None:
+                data = response.data
+                self._records.extend(data if isinstance(data, list) else [data])
+            self.response = response
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Stop the tool from producing more records"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def wait(self) -> ToolResponse:
+        """Wait for the tool to start producing records or the call to end, and return the stream's header"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.started or self.response is not None)
+            response = self.response
+        # Once records were produced, a failure is reported after them
+        if response is not None and response.status != "success" and not self.started:
+            return response
+        return ToolResponse(status="success", service=self.service)
+
+    def result(self) -> ToolResponse:
+        """Wait for the call to end and return its response"""
+        with self._condition:
+            while self.response is None:
+                self._condition.wait()
+            return self.response
+
+    def batches(self) -> Iterator[List[Any]]:
+        """The records buffered so far, as they become available, until the call is over; counts those taken"""
+        condition = self._condition
+        records = self._records
+        while True:
+            with condition:
+                condition.wait_for(lambda: records or self.response is not None)
+                if not records:
+                    return
+                batch = [records.popleft() for _ in range(min(len(records), self.buffer))]
+                condition.notify_all()
+            self.count += len(batch)
+            yield batch
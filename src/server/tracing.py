@@ -0,0 +1,300 @@
+"""
+Tracing module - Lightweight request tracing with spans
+
+Every HTTP request gets a request ID (``X-Request-ID``, generated when the
+client doesn't send one) that is propagated to the registry and the tool
+functions through context variables, including on the engine loop and the
+service thread pools. Requests are sampled at the head: a sampled request
+records a tree of timed spans, which is handed to the configured exporters
+once the request finishes. When a request isn't sampled, ``span`` returns a
+shared no-op span and nothing is recorded.
+
+A request carrying a W3C ``traceparent`` header continues the caller's
+trace: its spans get the caller's trace ID, the root span the caller's span
+as parent, and the caller's sampling decision is kept. ``traceparent()``
+gives the header to send upstream from within a sampled request.
+"""
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar, Token
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests traced; requests sent with X-MCP-Trace: 1 are always traced
+DEFAULT_SAMPLE_RATE = float(os.environ.get("MCP_TRACE_SAMPLE_RATE", 0))
+# Number of recent traces kept in memory for /admin/traces
+DEFAULT_BUFFER_SIZE = int(os.environ.get("MCP_TRACE_BUFFER_SIZE", 256))
+# JSONL file receiving every trace, one per line; unset disables it
+DEFAULT_TRACE_FILE = os.environ.get("MCP_TRACE_FILE")
+
+# Version 00 of the W3C trace context header: trace ID, parent span ID and flags
+TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+SAMPLED_FLAG = 0x01
+
+# ID of the request being served, set whether or not it is sampled
+current_request_id: ContextVar[Optional[str]] = ContextVar("mcp_current_request_id", default=None)
+# Innermost open span of a sampled request
+current_span: ContextVar[Optional["Span"]] = ContextVar("mcp_current_span", default=None)
+
+
+class TraceContext(NamedTuple):
+    """The caller's trace, from a ``traceparent`` header"""
+    trace_id: str
+    parent_id: str
+    sampled: bool
+
+
+def parse_traceparent(value: Optional[str]) -> Optional[TraceContext]:
+    """Parse a ``traceparent`` header; None when absent or invalid"""
+    match = TRACEPARENT.fullmatch(value.strip().lower()) if value else None
+    if match is None:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return TraceContext(trace_id, parent_id, bool(int(flags, 16) & SAMPLED_FLAG))
+
+
+class Trace:
+    """The spans recorded for one sampled request"""
+
+    __slots__ = ("trace_id", "start_time", "start", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.start_time = time.time()
+        self.start = time.perf_counter()
+        self.spans: List["Span"] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the trace with its finished spans in start order"""
+        spans = [span.to_dict(self) for span in sorted(self.spans, key=lambda span: span.start)]
+        return {
+            "trace_id": self.trace_id,
+            "start_time": self.start_time,
+            "duration_ms": spans[0]["duration_ms"] if spans else None,
+            "spans": spans
+        }
+
+
+class Span:
+    """
+    A timed operation within a trace
+
+    Use as a context manager: entering makes the span current for the
+    spans opened inside it, exiting finishes it and records any exception.
+    """
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start", "duration", "error", "_token")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._token: Optional[Token[Optional[Span]]] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach a value to the span"""
+        self.attributes[key] = value
+
+    def finish(self) -> None:
+        """End the span and add it to its trace"""
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.start
+            self.trace.spans.append(self)
+
+    def __enter__(self) -> "Span":
+        self._token = current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        if self._token is not None:
+            current_span.reset(self._token)
+        self.finish()
+
+    def to_dict(self, trace: Trace) -> Dict[str, Any]:
+        """Serialize the span, with its start relative to the trace"""
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ms": round((self.start - trace.start) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+class NoopSpan:
+    """Stand-in for spans of requests that aren't sampled"""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Discard the value"""
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Open a child of the current span, or a no-op span outside a sampled request"""
+    parent = current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Attach a value to the current span, if any"""
+    current = current_span.get()
+    if current is not None:
+        current.attributes[key] = value
+
+
+def traceparent() -> Optional[str]:
+    """``traceparent`` header continuing the current span upstream, or None outside a sampled request"""
+    current = current_span.get()
+    if current is None:
+        return None
+    return f"00-{current.trace.trace_id}-{current.span_id}-{SAMPLED_FLAG:02x}"
+
+
+class RingBufferExporter:
+    """Keep the most recent traces in memory"""
+
+    def __init__(self, size: int = DEFAULT_BUFFER_SIZE):
+        """Initialize an empty buffer"""
+        self._traces: Deque[Dict[str, Any]] = deque(maxlen=size)
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        """Add a trace, evicting the oldest one when the buffer is full"""
+        self._traces.append(trace)
+
+    def traces(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """The most recent traces, newest first"""
+        traces = list(self._traces)
+        traces.reverse()
+        return traces[:limit]
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Find a buffered trace by ID"""
+        for trace in list(self._traces):
+            if trace["trace_id"] == trace_id:
+                return trace
+        return None
+
+
+class JsonlExporter:
+    """Append traces to a file, one JSON document per line"""
+
+    def __init__(self, path: str):
+        """Initialize the exporter; the file is opened on first export"""
+        self.path = path
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        """Write a trace to the file"""
+        line = json.dumps(trace, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+
+class Tracer:
+    """
+    Head-sampling tracer
+
+    ``start_request`` decides once per request whether it is traced; only
+    sampled requests open spans and reach the exporters.
+    """
+
+    def __init__(self, sample_rate: float = DEFAULT_SAMPLE_RATE, exporters: Optional[List[Any]] = None):
+        """Initialize the tracer"""
+        self.sample_rate = sample_rate
+        self.exporters = list(exporters or [])
+
+    def add_exporter(self, exporter: Any) -> None:
+        """Register an exporter; it must have an ``export(trace)`` method taking a dict"""
+        self.exporters.append(exporter)
+
+    def start_request(
+        self,
+        name: str,
+        request_id: Optional[str] = None,
+        force: bool = False,
+        parent: Optional[TraceContext] = None,
+        **attributes: Any
+    ) -> Tuple[Optional[Span], Token]:
+        """
+        Start serving a request
+
+        Sets the request ID (generated when not given) and, if the request is
+        sampled, opens its root span and makes it current. A request with a
+        ``parent`` trace context joins that trace, sampled as the caller
+        decided, and its request ID defaults to the trace ID. Returns the root
+        span, or None, and a token to pass to ``finish_request``.
+        """
+        request_id = request_id or (parent.trace_id if parent is not None else uuid.uuid4().hex)
+        token = current_request_id.set(request_id)
+        if parent is not None:
+            sampled = force or parent.sampled
+        else:
+            sampled = force or bool(self.sample_rate and random.random() < self.sample_rate)
+        if not sampled:
+            return None, token
+
+        if parent is None:
+            root = Span(Trace(request_id), name, None, attributes)
+        else:
+            root = Span(Trace(parent.trace_id), name, parent.parent_id, attributes)
+        root.__enter__()
+        return root, token
+
+    def finish_request(self, root: Optional[Span], token: Token, **attributes: Any) -> None:
+        """End a request started with ``start_request`` and export its trace"""
+        if root is not None:
+            root.attributes.update(attributes)
+            root.__exit__(None, None, None)
+            self.export(root.trace)
+        current_request_id.reset(token)
+
+    def export(self, trace: Trace) -> None:
+        """Hand a finished trace to every exporter"""
+        document = trace.to_dict()
+        for exporter in self.exporters:
+            try:
+                exporter.export(document)
+            except Exception as e:
+                logger.error(f"Error exporting trace {trace.trace_id}: {str(e)}")
+
+
+# Create the global tracer with its default exporters
+trace_buffer = RingBufferExporter()
+tracer = Tracer(exporters=[trace_buffer])
+if DEFAULT_TRACE_FILE:
+    tracer.add_exporter(JsonlExporter(DEFAULT_TRACE_FILE))
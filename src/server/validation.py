@@ -0,0 +1,188 @@
+"""
+Parameter validation module - Compiles tool schemas into validators
+
+Each ``ToolSchema`` is compiled once, at registration time, into a closure
+that checks required parameters and the declared type of every property.
+Values that unambiguously represent the declared type (e.g. ``"5"`` for an
+integer) are coerced; anything else is rejected with ``ToolValidationError``
+before the tool runs.
+"""
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.utils.types import ToolSchema
+
+Validator = Callable[[Dict[str, Any]], Dict[str, Any]]
+Check = Callable[[Any], Any]
+
+TRUE_STRINGS = frozenset(("true", "1", "yes"))
+FALSE_STRINGS = frozenset(("false", "0", "no"))
+
+
+class ToolValidationError(ValueError):
+    """Raised when tool parameters don't match the tool schema"""
+
+
+def _integer_check(name: str) -> Check:
+    """Build a check for an ``integer`` property"""
+    def check(value: Any) -> Any:
+        if type(value) is int:
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                pass
+        raise ToolValidationError(f"Parameter '{name}' must be an integer")
+    return check
+
+
+def _number_check(name: str) -> Check:
+    """Build a check for a ``number`` property"""
+    def check(value: Any) -> Any:
+        if type(value) is int or type(value) is float:
+            return value
+        if isinstance(value, str):
+            try:
+                return float(value.strip())
+            except ValueError:
+                pass
+        raise ToolValidationError(f"Parameter '{name}' must be a number")
+    return check
+
+
+def _string_check(name: str) -> Check:
+    """Build a check for a ``string`` property"""
+    def check(value: Any) -> Any:
+        if type(value) is str:
+            return value
+        raise ToolValidationError(f"Parameter '{name}' must be a string")
+    return check
+
+
+def _boolean_check(name: str) -> Check:
+    """Build a check for a ``boolean`` property"""
+    def check(value: Any) -> Any:
+        if type(value) is bool:
+            return value
+        if isinstance(value, str):
+            lowered = value.strip().lower()
+            if lowered in TRUE_STRINGS:
+                return True
+            if lowered in FALSE_STRINGS:
+                return False
+        raise ToolValidationError(f"Parameter '{name}' must be a boolean")
+    return check
+
+
+def _bounded(name: str, check: Check, minimum: Any, maximum: Any) -> Check:
+    """Wrap a numeric check to enforce the property's ``minimum`` and ``maximum``"""
+    def bounded(value: Any) -> Any:
+        value = check(value)
+        if minimum is not None and value < minimum:
+            raise ToolValidationError(f"Parameter '{name}' must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            raise ToolValidationError(f"Parameter '{name}' must be at most {maximum}")
+        return value
+    return bounded
+
+
+def _enumerated(name: str, check: Check, options: List[Any]) -> Check:
+    """Wrap a check to only accept the property's ``enum`` values"""
+    allowed = tuple(options)
+
+    def enumerated(value: Any) -> Any:
+        value = check(value)
+        if value not in allowed:
+            raise ToolValidationError(
+                f"Parameter '{name}' must be one of {', '.join(str(option) for option in allowed)}"
+            )
+        return value
+    return enumerated
+
+
+def _any_check(value: Any) -> Any:
+    """Check of a property without a known type"""
+    return value
+
+
+def _array_check(name: str) -> Check:
+    """Build a check for an ``array`` property"""
+    def check(value: Any) -> Any:
+        if type(value) is list:
+            return value
+        if isinstance(value, tuple):
+            return list(value)
+        raise ToolValidationError(f"Parameter '{name}' must be an array")
+    return check
+
+
+def _object_check(name: str) -> Check:
+    """Build a check for an ``object`` property"""
+    def check(value: Any) -> Any:
+        if isinstance(value, dict):
+            return value
+        raise ToolValidationError(f"Parameter '{name}' must be an object")
+    return check
+
+
+CHECK_BUILDERS: Dict[str, Callable[[str], Check]] = {
+    "integer": _integer_check,
+    "number": _number_check,
+    "string": _string_check,
+    "boolean": _boolean_check,
+    "array": _array_check,
+    "object": _object_check,
+}
+
+
+def compile_validator(schema: ToolSchema) -> Validator:
+    """
+    Compile a tool schema into a parameter validator
+
+    The validator returns the parameters unchanged when no value needs
+    coercion, and a coerced copy otherwise. ``None`` values count as missing.
+    Properties without a known type, and parameters not declared in the
+    schema, are passed through as-is. Numeric properties may set a
+    ``minimum`` and ``maximum``, and any property an ``enum`` of the values
+    it accepts (checked after coercion).
+    """
+    required = tuple(schema.required)
+    checks: List[Tuple[str, Check]] = []
+    for name, spec in schema.properties.items():
+        if not isinstance(spec, dict):
+            continue
+        builder = CHECK_BUILDERS.get(spec.get("type", ""))
+        check = builder(name) if builder is not None else None
+        if check is not None and spec["type"] in ("integer", "number") and ("minimum" in spec or "maximum" in spec):
+            check = _bounded(name, check, spec.get("minimum"), spec.get("maximum"))
+        if isinstance(spec.get("enum"), list):
+            check = _enumerated(name, check or _any_check, spec["enum"])
+        if check is not None:
+            checks.append((name, check))
+    checks_tuple = tuple(checks)
+
+    if not required and not checks_tuple:
+        return lambda params: params
+
+    def validate(params: Dict[str, Any]) -> Dict[str, Any]:
+        if required:
+            missing = [name for name in required if params.get(name) is None]
+            if missing:
+                raise ToolValidationError(f"Missing required parameters: {', '.join(missing)}")
+
+        coerced = None
+        for name, check in checks_tuple:
+            value = params.get(name)
+            if value is None:
+                continue
+            result = check(value)
+            if result is not value:
+                if coerced is None:
+                    coerced = dict(params)
+                coerced[name] = result
+
+        return params if coerced is None else coerced
+
+    return validate
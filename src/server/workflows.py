@@ -0,0 +1,231 @@
+"""
+Workflows module - Server-side execution of DAGs of tool calls
+
+A workflow is a list of steps, each a tool call with an ID. Parameters can
+reference the output of earlier steps with ``${step_id.path}``, where the
+path walks into the step's data by key or list index (``${repos.0.id}``). A
+parameter that is a single reference takes the referenced value as is;
+references inside longer strings are interpolated. Each step runs as soon as
+the steps it references (and its ``depends_on`` steps) have succeeded, so
+independent steps run in parallel. Step data stays on the server: only the
+workflow's outputs are returned.
+"""
+import asyncio
+import json
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.server.tracing import span
+from src.utils.types import (
+    Priority, ToolRequest, ToolResponse, WorkflowRequest, WorkflowResponse, WorkflowStep, WorkflowStepResult
+)
+
+REFERENCE = re.compile(r"\$\{([^}]+)\}")
+
+
+class WorkflowError(Exception):
+    """Raised for workflows that can't be run: bad IDs, unknown references or cycles"""
+
+
+class ReferenceResolutionError(Exception):
+    """Raised when a reference doesn't match the data of the step it points to"""
+
+
+class CompiledStep(NamedTuple):
+    """A workflow step with its dependencies"""
+    step: WorkflowStep
+    dependencies: Tuple[str, ...]
+
+
+class CompiledWorkflow(NamedTuple):
+    """A validated workflow, with its steps in dependency order"""
+    steps: Tuple[CompiledStep, ...]
+    outputs: Dict[str, Any]
+
+
+def _references(value: Any) -> Iterator[str]:
+    """Yield the step IDs referenced anywhere in a parameter value"""
+    if isinstance(value, str):
+        for match in REFERENCE.finditer(value):
+            yield match.group(1).split(".", 1)[0]
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _references(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _references(item)
+
+
+def compile_workflow(request: WorkflowRequest) -> CompiledWorkflow:
+    """
+    Validate a workflow and order its steps
+
+    Raises ``WorkflowError`` on duplicate or malformed step IDs, references
+    to unknown steps and dependency cycles.
+    """
+    steps: Dict[str, WorkflowStep] = {}
+    for step in request.steps:
+        if not step.id or "." in step.id or "}" in step.id:
+            raise WorkflowError(f"Invalid step ID '{step.id}'")
+        if step.id in steps:
+            raise WorkflowError(f"Duplicate step ID '{step.id}'")
+        steps[step.id] = step
+
+    dependencies: Dict[str, Tuple[str, ...]] = {}
+    for step in steps.values():
+        needed = dict.fromkeys(list(_references(step.parameters)) + step.depends_on)
+        for dependency in needed:
+            if dependency not in steps:
+                raise WorkflowError(f"Step '{step.id}' depends on unknown step '{dependency}'")
+            if dependency == step.id:
+                raise WorkflowError(f"Step '{step.id}' depends on itself")
+        dependencies[step.id] = tuple(needed)
+
+    # Topological order (Kahn), keeping the request order among ready steps
+    waiting = {step_id: set(needed) for step_id, needed in dependencies.items()}
+    ordered: List[CompiledStep] = []
+    while waiting:
+        ready = [step_id for step_id, needed in waiting.items() if not needed]
+        if not ready:
+            raise WorkflowError(f"Dependency cycle between steps {', '.join(sorted(waiting))}")
+        for step_id in ready:
+            del waiting[step_id]
+            ordered.append(CompiledStep(steps[step_id], dependencies[step_id]))
+        for pending in waiting.values():
+            pending.difference_update(ready)
+
+    if request.outputs is None:
+        depended_on = {dependency for needed in dependencies.values() for dependency in needed}
+        outputs = {step_id: f"${{{step_id}}}" for step_id in steps if step_id not in depended_on}
+    elif isinstance(request.outputs, list):
+        outputs = {step_id: f"${{{step_id}}}" for step_id in request.outputs}
+    else:
+        outputs = dict(request.outputs)
+    for name, value in outputs.items():
+        for step_id in _references(value):
+            if step_id not in steps:
+                raise WorkflowError(f"Output '{name}' references unknown step '{step_id}'")
+
+    return CompiledWorkflow(tuple(ordered), outputs)
+
+
+def _lookup(path: str, data: Dict[str, Any]) -> Any:
+    """Resolve a reference path against the data of finished steps"""
+    step_id, *keys = path.split(".")
+    value = data[step_id]
+    for key in keys:
+        try:
+            if isinstance(value, list):
+                value = value[int(key)]
+            elif isinstance(value, dict):
+                value = value[key]
+            else:
+                raise KeyError(key)
+        except (KeyError, IndexError, ValueError):
+            raise ReferenceResolutionError(f"Reference '${{{path}}}' has no value at '{key}'") from None
+    return value
+
+
+def resolve(value: Any, data: Dict[str, Any]) -> Any:
+    """Substitute the references in a parameter value"""
+    if isinstance(value, str):
+        match = REFERENCE.fullmatch(value)
+        if match is not None:
+            return _lookup(match.group(1), data)
+
+        def interpolate(match: "re.Match[str]") -> str:
+            resolved = _lookup(match.group(1), data)
+            return resolved if isinstance(resolved, str) else json.dumps(resolved, default=str)
+
+        return REFERENCE.sub(interpolate, value)
+    if isinstance(value, dict):
+        return {key: resolve(item, data) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, data) for item in value]
+    return value
+
+
+async def run_workflow(
+    workflow: CompiledWorkflow,
+    execute: Callable[[ToolRequest], Awaitable[ToolResponse]],
+    deadline: Optional[float],
+    priority: Optional[Priority] = None,
+    client_id: Optional[str] = None
+) -> WorkflowResponse:
+    """
+    Run a compiled workflow with ``execute`` running each tool request
+
+    Every step starts as soon as its dependencies succeed and runs under the
+    workflow's deadline. Steps whose dependencies failed are skipped.
+    """
+    data: Dict[str, Any] = {}
+    results: Dict[str, WorkflowStepResult] = {}
+    tasks: Dict[str, "asyncio.Task[bool]"] = {}
+
+    async def run_step(compiled: CompiledStep) -> bool:
+        step = compiled.step
+        succeeded = await asyncio.gather(*(tasks[dependency] for dependency in compiled.dependencies))
+        if not all(succeeded):
+            failed = [dependency for dependency, ok in zip(compiled.dependencies, succeeded) if not ok]
+            results[step.id] = WorkflowStepResult(
+                status="skipped",
+                error=f"Dependency {', '.join(repr(dependency) for dependency in failed)} did not succeed"
+            )
+            return False
+
+        start = time.perf_counter()
+        with span("workflow.step", step=step.id, tool=step.tool_name):
+            try:
+                parameters = resolve(step.parameters, data)
+            except ReferenceResolutionError as e:
+                results[step.id] = WorkflowStepResult(status="error", error=str(e))
+                return False
+
+            response = await execute(ToolRequest(
+                tool_name=step.tool_name,
+                parameters=parameters,
+                service=step.service,
+                fields=step.fields,
+                deadline=deadline,
+                priority=priority,
+                client_id=client_id
+            ))
+
+        results[step.id] = WorkflowStepResult(
+            status=response.status,
+            service=response.service,
+            error=response.error,
+            duration_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+        if response.status != "success":
+            return False
+        data[step.id] = response.data
+        return True
+
+    # Steps are in dependency order, so every dependency's task exists already
+    for compiled in workflow.steps:
+        tasks[compiled.step.id] = asyncio.ensure_future(run_step(compiled))
+    await asyncio.gather(*tasks.values())
+
+    outputs: Dict[str, Any] = {}
+    missing = []
+    for name, value in workflow.outputs.items():
+        try:
+            outputs[name] = resolve(value, data)
+        except (KeyError, ReferenceResolutionError):
+            missing.append(name)
+
+    failed = [step_id for step_id, result in results.items() if result.status != "success"]
+    error = None
+    if failed:
+        error = f"{len(failed)} of {len(results)} steps did not succeed"
+    elif missing:
+        error = f"Outputs {', '.join(missing)} could not be resolved"
+
+    return WorkflowResponse(
+        status="error" if error else "success",
+        outputs=outputs,
+        steps={compiled.step.id: results[compiled.step.id] for compiled in workflow.steps},
+        error=error
+    )
@@ -3,15 +3,18 @@ GitHub MCP Service implementation
 """
 import os
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, Union
 
-from src.utils.types import MCPService, Tool, ToolSchema, ServiceType
+from src.services.pagination import PAGINATION_PROPERTIES, keyset_page, paginated
+from src.utils.types import MCPService, Page, Tool, ToolSchema, ServiceType
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Mock GitHub data - In a real scenario, this would be fetched from the GitHub API
+# How long results of read-only tools may be served from the registry cache
+READ_CACHE_TTL = float(os.environ.get("MCP_READ_CACHE_TTL", 30))
+
+# Mock GitHub data - In a real scenario, this would be fetched from the GitHub API.
+# Records are sorted by ID, which list tools page through.
 MOCK_GITHUB_REPOS = [
     {"id": 1, "name": "security-project", "private": False, "description": "A project about security"},
     {"id": 2, "name": "private-repo", "private": True, "description": "Contains sensitive data"},
@@ -61,22 +64,24 @@ MOCK_GITHUB_USERS = [
 
 
 # GitHub tool implementations
-def list_repos(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """List GitHub repositories"""
+def list_repos(params: Dict[str, Any]) -> Union[Iterator[Dict[str, Any]], Page]:
+    """List GitHub repositories, one at a time or a page at a time"""
     logger.info("Executing GitHub list_repos tool")
     
     # Filter private repos if specified
     include_private = params.get("include_private", False)
     
-    if not include_private:
-        return [repo for repo in MOCK_GITHUB_REPOS if not repo["private"]]
+    def matches(repo: Dict[str, Any]) -> bool:
+        return include_private or not repo["private"]
     
-    return MOCK_GITHUB_REPOS
+    if paginated(params):
+        return keyset_page(MOCK_GITHUB_REPOS, params, "id", matches)
+    return (repo for repo in MOCK_GITHUB_REPOS if matches(repo))
 
 
-def list_issues(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+def list_issues(params: Dict[str, Any]) -> Union[Iterator[Dict[str, Any]], Page]:
     """
-    List GitHub issues
+    List GitHub issues, one at a time or a page at a time
     
     This function has the same name as the Linear service's list_issues,
     which creates the name conflict vulnerability
@@ -88,21 +93,18 @@ def list_issues(params: Dict[str, Any]) -> List[Dict[str, Any]]:
     labels = params.get("labels", [])
     
     # Filter issues
-    filtered_issues = MOCK_GITHUB_ISSUES
-    
-    if repo_id is not None:
-        filtered_issues = [issue for issue in filtered_issues if issue["repo_id"] == repo_id]
-    
-    if state:
-        filtered_issues = [issue for issue in filtered_issues if issue["state"] == state]
-    
-    if labels:
-        filtered_issues = [
-            issue for issue in filtered_issues 
-            if any(label in issue["labels"] for label in labels)
-        ]
+    def matches(issue: Dict[str, Any]) -> bool:
+        if repo_id is not None and issue["repo_id"] != repo_id:
+            return False
+        if state and issue["state"] != state:
+            return False
+        if labels and not any(label in issue["labels"] for label in labels):
+            return False
+        return True
     
-    return filtered_issues
+    if paginated(params):
+        return keyset_page(MOCK_GITHUB_ISSUES, params, "id", matches)
+    return (issue for issue in MOCK_GITHUB_ISSUES if matches(issue))
 
 
 def get_user(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -173,12 +175,14 @@ def initialize_github_service() -> MCPService:
         name="list_repos",
         service=ServiceType.GITHUB,
         description="List GitHub repositories",
+        cache_ttl=READ_CACHE_TTL,
         parameters=ToolSchema(
             properties={
                 "include_private": {
                     "type": "boolean",
                     "description": "Whether to include private repositories"
-                }
+                },
+                **PAGINATION_PROPERTIES
             },
             required=[]
         )
@@ -190,6 +194,7 @@ def initialize_github_service() -> MCPService:
         name="list_issues",
         service=ServiceType.GITHUB,
         description="List GitHub issues",
+        cache_ttl=READ_CACHE_TTL,
         parameters=ToolSchema(
             properties={
                 "repo_id": {
@@ -203,7 +208,8 @@ def initialize_github_service() -> MCPService:
                 "labels": {
                     "type": "array",
                     "description": "Labels to filter issues by"
-                }
+                },
+                **PAGINATION_PROPERTIES
             },
             required=[]
         )
@@ -215,6 +221,7 @@ def initialize_github_service() -> MCPService:
         name="get_user",
         service=ServiceType.GITHUB,
         description="Get a GitHub user by ID or username",
+        cache_ttl=READ_CACHE_TTL,
         parameters=ToolSchema(
             properties={
                 "user_id": {
@@ -236,6 +243,7 @@ def initialize_github_service() -> MCPService:
         name="create_issue",
         service=ServiceType.GITHUB,
         description="Create a new GitHub issue",
+        mutates=True,
         parameters=ToolSchema(
             properties={
                 "repo_id": {
@@ -3,14 +3,20 @@ Linear MCP Service implementation
 """
 import os
 import logging
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple, Union
 
-from src.utils.types import MCPService, Tool, ToolSchema, ServiceType
+from src.server.projection import Projection, current_projection
+from src.services.pagination import PAGINATION_PROPERTIES, paginated, upstream_page, upstream_records
+from src.utils.types import MCPService, Page, Tool, ToolSchema, ServiceType
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# How long results of read-only tools may be served from the registry cache
+READ_CACHE_TTL = float(os.environ.get("MCP_READ_CACHE_TTL", 30))
+
+# Page size of the Linear API's connections
+LINEAR_PAGE_SIZE = 50
+
 # Mock Linear data - In a real scenario, this would be fetched from the Linear API
 MOCK_LINEAR_TEAMS = [
     {"id": "team1", "name": "Engineering", "key": "ENG", "description": "Engineering team"},
@@ -88,16 +94,47 @@ MOCK_LINEAR_PRIVATE_DATA = {
 }
 
 
+def query_connection(
+    nodes: List[Dict[str, Any]],
+    where: Callable[[Dict[str, Any]], bool],
+    after: Optional[str],
+    selection: Optional[Projection] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Stand-in for a Linear GraphQL connection query (``first``, ``after``, ``filter`` and the selection set)
+    
+    Returns up to ``LINEAR_PAGE_SIZE`` matching nodes after the ``after``
+    cursor, with only the fields of ``selection`` when given, and the
+    ``endCursor`` of the page when there are more.
+    """
+    index = int(after) if after is not None else 0
+    page: List[Dict[str, Any]] = []
+    while index < len(nodes) and len(page) < LINEAR_PAGE_SIZE:
+        if where(nodes[index]):
+            page.append(nodes[index])
+        index += 1
+    if selection is not None:
+        page = selection.project(page)
+    return page, (str(index) if index < len(nodes) else None)
+
+
 # Linear tool implementations
-def list_teams(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """List Linear teams"""
+def list_teams(params: Dict[str, Any]) -> Union[Iterator[Dict[str, Any]], Page]:
+    """List Linear teams, one at a time or a page at a time, selecting only the requested fields"""
     logger.info("Executing Linear list_teams tool")
-    return MOCK_LINEAR_TEAMS
+    selection = current_projection.get()
+    
+    def fetch(after: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return query_connection(MOCK_LINEAR_TEAMS, lambda team: True, after, selection)
+    
+    if paginated(params):
+        return upstream_page(fetch, params)
+    return upstream_records(fetch)
 
 
-def list_issues(params: Dict[str, Any]) -> List[Dict[str, Any]]:
+def list_issues(params: Dict[str, Any]) -> Union[Iterator[Dict[str, Any]], Page]:
     """
-    List Linear issues
+    List Linear issues, one at a time or a page at a time, selecting only the requested fields
     
     This function has the same name as the GitHub service's list_issues,
     creating an efficient implementation for similar functionality.
@@ -108,23 +145,26 @@ def list_issues(params: Dict[str, Any]) -> List[Dict[str, Any]]:
     state = params.get("state")
     assignee_id = params.get("assignee_id")
     priority = params.get("priority")
+    selection = current_projection.get()
     
     # Filter issues
-    filtered_issues = MOCK_LINEAR_ISSUES
-    
-    if team_id:
-        filtered_issues = [issue for issue in filtered_issues if issue["team_id"] == team_id]
-    
-    if state:
-        filtered_issues = [issue for issue in filtered_issues if issue["state"] == state]
+    def matches(issue: Dict[str, Any]) -> bool:
+        if team_id and issue["team_id"] != team_id:
+            return False
+        if state and issue["state"] != state:
+            return False
+        if assignee_id and issue["assignee_id"] != assignee_id:
+            return False
+        if priority is not None and issue["priority"] != priority:
+            return False
+        return True
     
-    if assignee_id:
-        filtered_issues = [issue for issue in filtered_issues if issue["assignee_id"] == assignee_id]
+    def fetch(after: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return query_connection(MOCK_LINEAR_ISSUES, matches, after, selection)
     
-    if priority is not None:
-        filtered_issues = [issue for issue in filtered_issues if issue["priority"] == priority]
-    
-    return filtered_issues
+    if paginated(params):
+        return upstream_page(fetch, params)
+    return upstream_records(fetch)
 
 
 def get_user(params: Dict[str, Any]) -> Dict[str, Any]:
@@ -221,8 +261,10 @@ def initialize_linear_service() -> MCPService:
         name="list_teams",
         service=ServiceType.LINEAR,
         description="List Linear teams",
+        cache_ttl=READ_CACHE_TTL,
+        projects=True,
         parameters=ToolSchema(
-            properties={},
+            properties=dict(PAGINATION_PROPERTIES),
             required=[]
         )
     )
@@ -233,6 +275,8 @@ def initialize_linear_service() -> MCPService:
         name="list_issues",
         service=ServiceType.LINEAR,
         description="List Linear issues",
+        cache_ttl=READ_CACHE_TTL,
+        projects=True,
         parameters=ToolSchema(
             properties={
                 "team_id": {
@@ -250,7 +294,8 @@ def initialize_linear_service() -> MCPService:
                 "priority": {
                     "type": "integer",
                     "description": "Priority to filter issues by (0-3)"
-                }
+                },
+                **PAGINATION_PROPERTIES
             },
             required=[]
         )
@@ -262,6 +307,7 @@ def initialize_linear_service() -> MCPService:
         name="get_user",
         service=ServiceType.LINEAR,
         description="Get a Linear user by ID or email",
+        cache_ttl=READ_CACHE_TTL,
         parameters=ToolSchema(
             properties={
                 "user_id": {
@@ -283,6 +329,7 @@ def initialize_linear_service() -> MCPService:
         name="create_issue",
         service=ServiceType.LINEAR,
         description="Create a new Linear issue",
+        mutates=True,
         parameters=ToolSchema(
             properties={
                 "team_id": {
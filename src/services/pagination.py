@@ -0,0 +1,172 @@
+"""
+Pagination helpers for service implementations
+
+List tools take an optional ``limit`` and ``cursor``. When either is given,
+they return a ``Page`` of records along with the cursor of the next page,
+which the registry sends as the response's ``next_cursor``. Without them,
+they return every record.
+
+Cursors are opaque to clients: URL-safe base64 of a small JSON document
+holding the position to resume from and a digest of the query's other
+parameters, so a cursor can't be resumed with different filters.
+
+- ``keyset_page`` pages through records sorted by a key. The position is the
+  key of the last record returned, found again with a binary search: a page
+  costs the records it scans rather than every record before it, and
+  records added or removed elsewhere don't shift the pages.
+- ``upstream_page`` pages through a paginated upstream API. The position is
+  the upstream's own token for its page, and how many of that page's records
+  were returned already, so a page of any ``limit`` only fetches the
+  upstream pages it needs.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.server.validation import ToolValidationError
+from src.utils.canonical import canonical_parameters
+from src.utils.types import Page
+
+# Page size of requests with a cursor and no limit, and the largest limit accepted
+DEFAULT_PAGE_SIZE = int(os.environ.get("MCP_DEFAULT_PAGE_SIZE", 100))
+MAX_PAGE_SIZE = int(os.environ.get("MCP_MAX_PAGE_SIZE", 1000))
+
+PAGING_PARAMETERS = ("limit", "cursor")
+
+# Schema properties of the paging parameters, for the tool definitions of list tools
+PAGINATION_PROPERTIES: Dict[str, Dict[str, Any]] = {
+    "limit": {
+        "type": "integer",
+        "minimum": 1,
+        "maximum": MAX_PAGE_SIZE,
+        "description": "Maximum number of records to return; the response's next_cursor fetches the next page"
+    },
+    "cursor": {
+        "type": "string",
+        "description": "The next_cursor of the previous page"
+    }
+}
+
+# A fetch function returns the records of the upstream page at a token, and the next page's token
+UpstreamFetch = Callable[[Optional[Any]], Tuple[Sequence[Any], Optional[Any]]]
+
+
+class CursorError(ToolValidationError):
+    """Raised when a cursor is malformed or belongs to a different query"""
+
+
+def paginated(params: Dict[str, Any]) -> bool:
+    """Whether a list tool call asks for a page"""
+    return params.get("limit") is not None or params.get("cursor") is not None
+
+
+def _query_digest(params: Dict[str, Any]) -> str:
+    """Digest of the parameters of a query other than the paging parameters"""
+    query = {name: value for name, value in params.items() if name not in PAGING_PARAMETERS}
+    return hashlib.blake2b(canonical_parameters(query).encode(), digest_size=8).hexdigest()
+
+
+def encode_cursor(position: Dict[str, Any], params: Dict[str, Any]) -> str:
+    """Build the cursor resuming the query made with ``params`` at ``position``"""
+    document = canonical_parameters({"p": position, "q": _query_digest(params)})
+    return base64.urlsafe_b64encode(document.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The position of the request's cursor, or None without one"""
+    cursor = params.get("cursor")
+    if cursor is None:
+        return None
+    try:
+        document = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position, digest = document["p"], document["q"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise CursorError("Malformed cursor") from e
+    if not isinstance(position, dict):
+        raise CursorError("Malformed cursor")
+    if digest != _query_digest(params):
+        raise CursorError("Cursor belongs to a query with different parameters")
+    return position
+
+
+def _limit(params: Dict[str, Any]) -> int:
+    """Page size of a request"""
+    return params.get("limit") or DEFAULT_PAGE_SIZE
+
+
+def _seek(records: Sequence[Dict[str, Any]], key: str, after: Any) -> int:
+    """Index of the first record whose key is greater than ``after``, in records sorted by key"""
+    low, high = 0, len(records)
+    try:
+        while low < high:
+            middle = (low + high) // 2
+            if records[middle][key] <= after:
+                low = middle + 1
+            else:
+                high = middle
+    except TypeError as e:
+        raise CursorError("Malformed cursor") from e
+    return low
+
+
+def keyset_page(
+    records: Sequence[Dict[str, Any]],
+    params: Dict[str, Any],
+    key: str,
+    where: Callable[[Dict[str, Any]], bool]
+) -> Page:
+    """A page of the records matching ``where``, from records sorted by ``key``"""
+    limit = _limit(params)
+    position = decode_cursor(params)
+    start = 0 if position is None else _seek(records, key, position.get("after"))
+
+    items: List[Dict[str, Any]] = []
+    for index in range(start, len(records)):
+        record = records[index]
+        if not where(record):
+            continue
+        if len(items) == limit:
+            return Page(items=items, next_cursor=encode_cursor({"after": items[-1][key]}, params))
+        items.append(record)
+    return Page(items=items)
+
+
+def upstream_page(fetch: UpstreamFetch, params: Dict[str, Any]) -> Page:
+    """
+    A page of records from a paginated upstream API
+
+    ``fetch(token)`` returns the records of the upstream page at ``token``
+    (None for the first page) and the token of the next upstream page, or
+    None after the last one.
+    """
+    limit = _limit(params)
+    position = decode_cursor(params)
+    token, offset = (None, 0) if position is None else (position.get("token"), position.get("offset", 0))
+    if not isinstance(offset, int) or offset < 0:
+        raise CursorError("Malformed cursor")
+
+    items: List[Any] = []
+    while True:
+        records, next_token = fetch(token)
+        wanted = limit - len(items)
+        items.extend(records[offset:offset + wanted])
+        if len(records) - offset > wanted:
+            # The page ends inside this upstream page
+            return Page(items=items, next_cursor=encode_cursor({"token": token, "offset": offset + wanted}, params))
+        if next_token is None:
+            return Page(items=items)
+        if len(items) == limit:
+            return Page(items=items, next_cursor=encode_cursor({"token": next_token, "offset": 0}, params))
+        token, offset = next_token, 0
+
+
+def upstream_records(fetch: UpstreamFetch) -> Iterator[Any]:
+    """Every record of a paginated upstream API, fetching its pages as they are needed"""
+    records, token = fetch(None)
+    yield from records
+    while token is not None:
+        records, token = fetch(token)
+        yield from records
@@ -0,0 +1,27 @@
+"""
+Canonical forms of tool requests used for deduplication and caching
+"""
+import json
+from typing import Any, Dict, Optional
+
+from src.utils.types import ServiceType, ToolRequest
+
+
+def canonical_parameters(parameters: Dict[str, Any]) -> str:
+    """Serialize parameters so that equal parameter sets produce equal strings"""
+    return json.dumps(parameters, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def request_key(request: ToolRequest, service: Optional[ServiceType] = None) -> str:
+    """
+    Build a key identifying a tool call
+
+    ``service`` overrides the request's own service, e.g. once a bare
+    tool name has been resolved.
+    """
+    service = service or request.service
+    service_name = service.value if service else ""
+    key = f"{service_name}|{request.tool_name}|{canonical_parameters(request.parameters)}"
+    if request.fields is not None:
+        key = f"{key}|{','.join(sorted(set(request.fields)))}"
+    return key
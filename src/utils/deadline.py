@@ -0,0 +1,37 @@
+"""
+Deadline propagation for tool calls
+
+The registry sets ``current_deadline`` while a tool runs, including in the
+thread pool, so that code making upstream calls on behalf of a tool can
+bound them by the time the caller has left.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Absolute deadline of the tool call being executed (Unix time in seconds)
+current_deadline: ContextVar[Optional[float]] = ContextVar("mcp_current_deadline", default=None)
+
+
+def deadline_after(timeout: Optional[float]) -> Optional[float]:
+    """Absolute deadline ``timeout`` seconds from now"""
+    return None if timeout is None else time.time() + timeout
+
+
+def remaining(deadline: Optional[float]) -> Optional[float]:
+    """Seconds left before ``deadline``, or None when there is no deadline"""
+    return None if deadline is None else deadline - time.time()
+
+
+def remaining_budget(default: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds left for the current tool call, capped at ``default``
+
+    Use this as the timeout of upstream requests. Returns ``default`` when
+    no deadline is set, and 0 once the deadline has passed.
+    """
+    left = remaining(current_deadline.get())
+    if left is None:
+        return default
+    left = max(0.0, left)
+    return left if default is None else min(left, default)
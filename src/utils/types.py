@@ -2,7 +2,7 @@
 Types and models for the MCP server
 """
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 from pydantic import BaseModel, Field
 
 
@@ -12,6 +12,13 @@ class ServiceType(str, Enum):
     LINEAR = "linear"
 
 
+class Priority(str, Enum):
+    """Scheduling class of a tool request, from most to least urgent"""
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+    BACKGROUND = "background"
+
+
 class ToolParameter(BaseModel):
     """Model for a tool parameter"""
     type: str
@@ -33,6 +40,16 @@ class Tool(BaseModel):
     description: str
     parameters: ToolSchema
     
+    # Result caching is opt-in: read-only tools set a TTL (in seconds) to enable it
+    cache_ttl: Optional[float] = None
+    cache_max_entries: int = 256
+    
+    # Write tools invalidate cached results of their service when they succeed
+    mutates: bool = False
+    
+    # Tools that apply a request's fields themselves, e.g. by selecting them in the upstream query
+    projects: bool = False
+    
     # This will be set programmatically and not part of the JSON schema
     function: Optional[Callable] = None
 
@@ -51,6 +68,23 @@ class ToolRequest(BaseModel):
     """Tool request model"""
     tool_name: str
     parameters: Dict[str, Any] = {}
+    
+    # Pins the request to a service; unset requests route by tool name
+    service: Optional[ServiceType] = None
+    
+    # Absolute deadline (Unix time in seconds), or a timeout relative to receipt
+    deadline: Optional[float] = None
+    timeout_ms: Optional[float] = None
+    
+    # Scheduling class (interactive when unset) and API client, for fair queuing
+    priority: Optional[Priority] = None
+    client_id: Optional[str] = None
+    
+    # Write tools run once per key and client; retries get the stored response
+    idempotency_key: Optional[str] = None
+    
+    # Fields of each record to return, as dotted paths; every field when unset
+    fields: Optional[List[str]] = None
 
 
 class ToolResponse(BaseModel):
@@ -58,4 +92,58 @@ class ToolResponse(BaseModel):
     status: str = "success"
     service: ServiceType
     data: Optional[Any] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    
+    # Cursor of the next page of a paginated list tool; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class Page(BaseModel):
+    """A page of records, returned by list tools called with a limit or cursor"""
+    items: List[Any]
+    next_cursor: Optional[str] = None
+
+
+class WorkflowStep(BaseModel):
+    """A tool call within a workflow"""
+    id: str
+    tool_name: str
+    parameters: Dict[str, Any] = {}
+    service: Optional[ServiceType] = None
+    
+    # Steps that must finish first, besides the steps referenced in the parameters
+    depends_on: List[str] = []
+    
+    # Fields of each record to keep, as for tool requests
+    fields: Optional[List[str]] = None
+
+
+class WorkflowRequest(BaseModel):
+    """Workflow request model: a DAG of tool calls"""
+    steps: List[WorkflowStep]
+    
+    # Values returned to the caller: a list of step IDs, or names mapped to
+    # references such as "${repos.0.id}". Defaults to the steps nothing depends on
+    outputs: Optional[Union[List[str], Dict[str, Any]]] = None
+    
+    # Deadline and scheduling of the workflow as a whole, as for tool requests
+    deadline: Optional[float] = None
+    timeout_ms: Optional[float] = None
+    priority: Optional[Priority] = None
+    client_id: Optional[str] = None
+
+
+class WorkflowStepResult(BaseModel):
+    """Outcome of a workflow step; its data stays on the server"""
+    status: str
+    service: Optional[ServiceType] = None
+    error: Optional[str] = None
+    duration_ms: Optional[float] = None
+
+
+class WorkflowResponse(BaseModel):
+    """Workflow response model"""
+    status: str = "success"
+    outputs: Dict[str, Any] = {}
+    steps: Dict[str, WorkflowStepResult] = {}
+    error: Optional[str] = None
@@ -0,0 +1,73 @@
+"""
+Shared fixtures of the test suite
+"""
+import logging
+from typing import Any, Callable, Dict
+
+import pytest
+
+from src.server import app as app_module
+from src.server.app import app, initialize_services
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.utils.types import MCPService, ServiceType, Tool, ToolSchema
+
+logging.disable(logging.CRITICAL)
+
+
+@pytest.fixture
+def registry():
+    """A registry with its own execution engine"""
+    registry = MCPRegistry(ExecutionEngine())
+    yield registry
+    registry.engine.shutdown()
+
+
+@pytest.fixture
+def make_service() -> Callable[..., MCPService]:
+    """Build a service from tool functions; keyword options apply to every tool"""
+    def build(service_type: ServiceType, functions: Dict[str, Callable[[Dict[str, Any]], Any]], **options: Any):
+        service = MCPService(
+            type=service_type,
+            name=service_type.value,
+            description="Test service",
+            base_url="http://localhost"
+        )
+        service.tools = [
+            Tool(
+                name=name,
+                service=service_type,
+                description=f"Test tool {name}",
+                parameters=ToolSchema(properties={}, required=[]),
+                function=function,
+                **options
+            )
+            for name, function in functions.items()
+        ]
+        return service
+    return build
+
+
+@pytest.fixture
+def client():
+    """A test client of the app, with the bundled services registered as lazy stubs"""
+    initialize_services(eager=False)
+    return app.test_client()
+
+
+@pytest.fixture
+def admin(monkeypatch) -> Dict[str, str]:
+    """Configure an admin token, returning the headers that authenticate with it"""
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", "test-admin-token")
+    return {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def registry_logs(caplog):
+    """Capture the registry's log records, which the suite otherwise silences"""
+    logging.disable(logging.NOTSET)
+    caplog.set_level(logging.DEBUG, logger="src.server.mcp_registry")
+    try:
+        yield caplog
+    finally:
+        logging.disable(logging.CRITICAL)
@@ -0,0 +1,42 @@
+"""
+Tests of access to the admin endpoints
+"""
+import pytest
+
+from src.server import app as app_module
+
+ADMIN_ENDPOINTS = [
+    ("post", "/admin/services/github/reload"),
+    ("get", "/admin/traces"),
+    ("get", "/admin/traces/missing"),
+    ("post", "/admin/profile"),
+    ("get", "/admin/profile"),
+    ("delete", "/admin/profile"),
+    ("get", "/admin/profile/pstats"),
+    ("get", "/admin/profile/folded"),
+]
+
+
+@pytest.mark.parametrize("method, path", ADMIN_ENDPOINTS)
+def test_admin_endpoints_are_disabled_without_a_token(client, monkeypatch, method, path):
+    monkeypatch.setattr(app_module, "ADMIN_TOKEN", None)
+
+    response = getattr(client, method)(path, headers={"X-Admin-Token": ""})
+
+    assert response.status_code == 403
+    assert "MCP_ADMIN_TOKEN" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("method, path", ADMIN_ENDPOINTS)
+@pytest.mark.parametrize("headers", [{}, {"X-Admin-Token": "wrong"}, {"X-Admin-Token": ""}])
+def test_admin_endpoints_need_the_token(client, admin, method, path, headers):
+    response = getattr(client, method)(path, headers=headers)
+
+    assert response.status_code == 403
+    assert response.get_json()["error"] == "Admin token required"
+
+
+def test_admin_token_grants_access(client, admin):
+    response = client.get("/admin/traces", headers=admin)
+
+    assert response.status_code == 200
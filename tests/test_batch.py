@@ -0,0 +1,127 @@
+"""
+Tests of the batch endpoint
+"""
+import threading
+import time
+
+import pytest
+
+from src.server import app as app_module
+from src.server.app import app
+from src.utils.types import ServiceType, ToolRequest, ToolSchema
+
+
+def echo(params):
+    """A tool returning its parameters"""
+    return params
+
+
+def failing(params):
+    """A tool whose backend fails"""
+    raise RuntimeError("backend down")
+
+
+@pytest.fixture
+def batch_client(registry, make_service, monkeypatch):
+    """A test client of the app serving test tools from the ``registry`` fixture"""
+    service = make_service(ServiceType.GITHUB, {"echo": echo, "failing": failing, "typed": echo})
+    service.tools[2].parameters = ToolSchema(properties={"id": {"type": "integer"}}, required=["id"])
+    registry.register_service(service)
+    monkeypatch.setattr(app_module, "registry", registry)
+    return app.test_client()
+
+
+def test_results_come_back_in_request_order(batch_client, registry, make_service):
+    def slow(params):
+        time.sleep(0.2)
+        return "slow"
+
+    registry.register_service(make_service(ServiceType.LINEAR, {"slow": slow}))
+
+    response = batch_client.post("/execute/batch", json=[
+        {"tool_name": "slow"},
+        {"tool_name": "echo", "parameters": {"n": 1}},
+        {"tool_name": "echo", "parameters": {"n": 2}},
+    ])
+
+    assert response.status_code == 200
+    assert [result["data"] for result in response.get_json()["results"]] == ["slow", {"n": 1}, {"n": 2}]
+
+
+def test_failures_stay_with_their_item(batch_client):
+    response = batch_client.post("/execute/batch", json={"requests": [
+        {"tool_name": "echo", "parameters": {"n": 1}},
+        {"parameters": {}},
+        {"tool_name": "missing"},
+        {"tool_name": "failing"},
+        {"tool_name": "typed", "parameters": {"id": "one"}},
+        {"tool_name": "typed", "parameters": {"id": 1}},
+    ]})
+
+    results = response.get_json()["results"]
+    assert response.status_code == 200
+    assert [result["status"] for result in results] == ["success", "error", "error", "error", "error", "success"]
+    assert results[1]["error"].startswith("Error processing request: ")
+    assert results[2]["error"] == "Tool 'missing' not found"
+    assert results[3]["error"] == "Error executing tool: backend down"
+    assert results[4]["error"].startswith("Invalid parameters: ")
+    assert results[5]["data"] == {"id": 1}
+
+
+def test_items_run_concurrently(batch_client, registry, make_service):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(params):
+        # Only returns when the other item runs at the same time
+        barrier.wait()
+        return params["side"]
+
+    registry.register_service(make_service(ServiceType.LINEAR, {"meet": meet}))
+
+    response = batch_client.post("/execute/batch", json=[
+        {"tool_name": "meet", "parameters": {"side": "left"}},
+        {"tool_name": "meet", "parameters": {"side": "right"}},
+    ])
+
+    assert [result["data"] for result in response.get_json()["results"]] == ["left", "right"]
+
+
+def test_identical_reads_run_once_and_writes_every_time(registry, make_service):
+    reads, writes = [], []
+    registry.register_service(make_service(ServiceType.GITHUB, {"read": reads.append}))
+    registry.register_service(make_service(ServiceType.LINEAR, {"write": writes.append}, mutates=True))
+
+    responses = registry.execute_batch(
+        [ToolRequest(tool_name="read", parameters={"id": 1})] * 3
+        + [ToolRequest(tool_name="write", parameters={"id": 1})] * 2
+    )
+
+    assert [response.status for response in responses] == ["success"] * 5
+    assert len(reads) == 1
+    assert len(writes) == 2
+
+
+@pytest.mark.parametrize("body", [{"tool_name": "echo"}, {"requests": "echo"}, "echo"])
+def test_batches_must_be_lists(batch_client, body):
+    response = batch_client.post("/execute/batch", json=body)
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Expected a list of tool requests"
+
+
+def test_batch_size_is_limited(batch_client, monkeypatch):
+    monkeypatch.setattr(app_module, "MAX_BATCH_SIZE", 2)
+
+    too_large = batch_client.post("/execute/batch", json=[{"tool_name": "echo"}] * 3)
+    largest = batch_client.post("/execute/batch", json=[{"tool_name": "echo"}] * 2)
+
+    assert too_large.status_code == 400
+    assert too_large.get_json()["error"] == "Batch of 3 requests exceeds the limit of 2"
+    assert largest.status_code == 200
+    assert len(largest.get_json()["results"]) == 2
+
+
+def test_empty_batches_succeed(batch_client):
+    response = batch_client.post("/execute/batch", json=[])
+
+    assert response.get_json() == {"status": "success", "results": []}
@@ -0,0 +1,163 @@
+"""
+Tests of the result cache and its invalidation by write tools
+"""
+import asyncio
+import threading
+import time
+
+from src.server.cache import ResultCache
+from src.utils.types import ServiceType, Tool, ToolRequest, ToolSchema
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = ResultCache(ttl=30, max_entries=8)
+    cache.put("key", "value")
+
+    now[0] += 29
+    assert cache.get("key") == "value"
+    now[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(ttl=30, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_put_from_before_a_clear_is_dropped():
+    cache = ResultCache(ttl=30, max_entries=8)
+    generation = cache.generation
+    cache.clear()
+    cache.put("key", "stale", generation)
+
+    assert cache.get("key") is None
+    assert cache.stats()["stale_puts"] == 1
+
+
+def register_issues(registry, make_service, read, write=lambda params: {"id": 1}):
+    """Register a cached read tool and a write tool in one service"""
+    service = make_service(ServiceType.GITHUB, {"list_issues": read}, cache_ttl=60)
+    service.tools.append(Tool(
+        name="create_issue",
+        service=ServiceType.GITHUB,
+        description="Write tool",
+        parameters=ToolSchema(properties={}, required=[]),
+        mutates=True,
+        function=write
+    ))
+    registry.register_service(service)
+
+
+def counting_reads(calls):
+    """A read tool returning how many times it was called"""
+    return lambda params: calls.append(params) or len(calls)
+
+
+def test_reads_are_cached_until_a_write_succeeds(registry, make_service):
+    calls = []
+    register_issues(registry, make_service, counting_reads(calls))
+    read = ToolRequest(tool_name="list_issues")
+
+    assert registry.execute_tool(read).data == 1
+    assert registry.execute_tool(read).data == 1
+    assert registry.execute_tool(ToolRequest(tool_name="list_issues", parameters={"state": "open"})).data == 2
+
+    assert registry.execute_tool(ToolRequest(tool_name="create_issue")).status == "success"
+    assert registry.execute_tool(read).data == 3
+
+
+def test_read_overlapping_a_write_is_not_cached(registry, make_service):
+    started = threading.Event()
+    version = ["before"]
+
+    def read(params):
+        value = version[0]
+        started.set()
+        time.sleep(0.2)
+        return value
+
+    register_issues(registry, make_service, read)
+    responses = []
+
+    def call():
+        responses.append(registry.execute_tool(ToolRequest(tool_name="list_issues")))
+
+    reader = threading.Thread(target=call)
+    reader.start()
+    started.wait(1)
+    version[0] = "after"
+    assert registry.execute_tool(ToolRequest(tool_name="create_issue")).status == "success"
+    reader.join()
+
+    assert responses[0].data == "before"
+    assert registry.execute_tool(ToolRequest(tool_name="list_issues")).data == "after"
+
+
+def test_failed_writes_invalidate(registry, make_service):
+    def write(params):
+        raise ConnectionError("connection reset after the request was sent")
+
+    register_issues(registry, make_service, counting_reads([]), write)
+    read = ToolRequest(tool_name="list_issues")
+    assert registry.execute_tool(read).data == 1
+
+    assert registry.execute_tool(ToolRequest(tool_name="create_issue")).status == "error"
+    assert registry.execute_tool(read).data == 2
+
+
+def test_writes_past_their_deadline_invalidate_on_timeout_and_when_they_finish(registry, make_service):
+    release = threading.Event()
+
+    def write(params):
+        release.wait(5)
+        return {"id": 1}
+
+    register_issues(registry, make_service, counting_reads([]), write)
+    read = ToolRequest(tool_name="list_issues")
+    assert registry.execute_tool(read).data == 1
+
+    assert registry.execute_tool(ToolRequest(tool_name="create_issue", timeout_ms=50)).status == "timeout"
+    # Cached while the abandoned write still runs
+    assert registry.execute_tool(read).data == 2
+    assert registry.execute_tool(read).data == 2
+    release.set()
+
+    deadline = time.monotonic() + 2
+    while registry.execute_tool(read).data == 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert registry.execute_tool(read).data == 3
+
+
+def test_cancelled_coroutine_writes_invalidate(registry, make_service):
+    async def write(params):
+        await asyncio.sleep(5)
+
+    register_issues(registry, make_service, counting_reads([]), write)
+    read = ToolRequest(tool_name="list_issues")
+    assert registry.execute_tool(read).data == 1
+
+    assert registry.execute_tool(ToolRequest(tool_name="create_issue", timeout_ms=50)).status == "timeout"
+    assert registry.execute_tool(read).data == 2
+
+
+def test_writes_that_never_ran_leave_the_cache_alone(registry, make_service):
+    writes = []
+    register_issues(registry, make_service, counting_reads([]), writes.append)
+    read = ToolRequest(tool_name="list_issues")
+    assert registry.execute_tool(read).data == 1
+
+    assert registry.execute_tool(ToolRequest(tool_name="create_issue", deadline=time.time() - 1)).status == "timeout"
+    assert registry.execute_tool(read).data == 1
+    assert writes == []
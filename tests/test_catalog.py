@@ -0,0 +1,69 @@
+"""
+Tests of the precomputed tool and service catalogs
+"""
+from src.server.app import build_tool_catalog
+from src.server.catalog import Catalog
+from src.utils.types import ServiceType
+
+
+def test_catalog_is_built_once_per_registry_version(registry, make_service):
+    catalog = Catalog(registry, build_tool_catalog)
+    registry.register_service(make_service(ServiceType.GITHUB, {"read": len}))
+
+    first = catalog.get()
+    assert catalog.get() is first
+    assert catalog.builds == 1
+
+    registry.register_service(make_service(ServiceType.LINEAR, {"other": len}))
+    second = catalog.get()
+
+    assert catalog.builds == 2
+    assert second.etag != first.etag
+    assert [tool["name"] for tool in second.content] == ["read", "other"]
+
+
+def test_matching_etag_gets_not_modified(client):
+    first = client.get("/tools")
+    etag = first.headers["ETag"]
+
+    response = client.get("/tools", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert response.status_code == 304
+    assert response.get_data() == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_stale_etag_gets_the_catalog(client):
+    response = client.get("/tools", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert any(tool["name"] == "list_issues" for tool in response.get_json())
+
+
+def test_etag_survives_a_reload_that_keeps_the_catalog(client, admin):
+    etag = client.get("/tools").headers["ETag"]
+
+    client.post("/admin/services/github/reload", headers=admin)
+
+    assert client.get("/tools", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_compressed_variant_has_its_own_etag(client):
+    plain = client.get("/tools", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/tools", headers={"Accept-Encoding": "gzip"})
+
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+    # Any variant's ETag validates the cached copy
+    assert client.get("/tools", headers={
+        "Accept-Encoding": "gzip",
+        "If-None-Match": plain.headers["ETag"]
+    }).status_code == 304
+
+
+def test_services_without_stats_are_validated(client):
+    etag = client.get("/services?stats=0").headers["ETag"]
+
+    assert client.get("/services?stats=0", headers={"If-None-Match": etag}).status_code == 304
+    assert "ETag" not in client.get("/services").headers
@@ -0,0 +1,89 @@
+"""
+Tests of request coalescing
+"""
+import threading
+import time
+
+from src.utils.types import ServiceType, ToolRequest
+
+
+def counting(calls, seconds=0.2, result="done"):
+    """A slow tool function recording the parameters of each call"""
+    def call(params):
+        calls.append(params)
+        time.sleep(seconds)
+        return result
+    return call
+
+
+def run_concurrently(registry, requests):
+    """Execute requests on their own threads, and return the responses in request order"""
+    responses = [None] * len(requests)
+
+    def call(index, request):
+        responses[index] = registry.execute_tool(request)
+
+    threads = [threading.Thread(target=call, args=item) for item in enumerate(requests)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return responses
+
+
+def test_identical_reads_share_one_execution(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"read": counting(calls)}))
+
+    responses = run_concurrently(registry, [ToolRequest(tool_name="read", parameters={"id": 1})] * 5)
+
+    assert len(calls) == 1
+    assert [response.data for response in responses] == ["done"] * 5
+    assert registry.single_flight.stats()["github.read"]["coalesced"] == 4
+
+
+def test_reads_with_different_parameters_run_apart(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"read": counting(calls)}))
+
+    run_concurrently(registry, [ToolRequest(tool_name="read", parameters={"id": i}) for i in range(3)])
+
+    assert sorted(call["id"] for call in calls) == [0, 1, 2]
+
+
+def test_write_tools_are_never_coalesced(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": counting(calls)}, mutates=True))
+
+    run_concurrently(registry, [ToolRequest(tool_name="write", parameters={"id": 1})] * 3)
+
+    assert len(calls) == 3
+
+
+def test_errors_are_shared_with_waiters(registry, make_service):
+    calls = []
+
+    def failing(params):
+        calls.append(params)
+        time.sleep(0.2)
+        raise ValueError("upstream failed")
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"read": failing}))
+
+    responses = run_concurrently(registry, [ToolRequest(tool_name="read")] * 3)
+
+    assert len(calls) == 1
+    assert [response.status for response in responses] == ["error"] * 3
+    assert all("upstream failed" in response.error for response in responses)
+
+
+def test_waiter_runs_the_call_itself_after_max_wait(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"read": counting(calls, seconds=0.3)}))
+    registry.single_flight.max_wait = 0.05
+
+    responses = run_concurrently(registry, [ToolRequest(tool_name="read")] * 2)
+
+    assert len(calls) == 2
+    assert [response.status for response in responses] == ["success"] * 2
+    assert registry.single_flight.stats()["github.read"]["expired"] == 1
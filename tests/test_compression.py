@@ -0,0 +1,174 @@
+"""
+Tests of response compression and content negotiation
+"""
+import gzip
+import json
+import zlib
+
+import pytest
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+from werkzeug.wrappers import Response
+
+from src.server import compression
+from src.server.compression import compress_response, identity_acceptable, negotiate
+from src.server.metrics import RESPONSE_BYTES, metrics
+
+BODY = json.dumps([{"id": i, "title": "Implement new feature", "state": "open"} for i in range(100)]).encode()
+EXECUTE = {"tool_name": "linear.list_issues", "parameters": {}}
+
+
+@pytest.fixture
+def codecs(monkeypatch):
+    """Every codec available, in the order of preference of an install with zstandard and brotli"""
+    monkeypatch.setattr(compression, "CODECS", {
+        "zstd": lambda data: b"zstd",
+        "br": lambda data: b"br",
+        "gzip": compression._gzip,
+    })
+
+
+def accept(value: str) -> Accept:
+    """Parse an ``Accept-Encoding`` header"""
+    return parse_accept_header(value)
+
+
+@pytest.mark.parametrize("header, encoding", [
+    ("gzip", "gzip"),
+    ("gzip, deflate, br, zstd", "zstd"),
+    ("br, gzip", "br"),
+    ("zstd;q=0.5, br;q=0.8, gzip", "gzip"),
+    ("zstd;q=0, gzip;q=0.1", "gzip"),
+    ("*", "zstd"),
+    ("gzip;q=0, *", "zstd"),
+    ("*;q=0", None),
+    ("deflate", None),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiation_prefers_quality_then_the_fastest_codec(codecs, header, encoding):
+    assert negotiate(accept(header)) == encoding
+
+
+@pytest.mark.parametrize("header, acceptable", [
+    ("", True),
+    ("gzip", True),
+    ("gzip, identity;q=0", False),
+    ("identity;q=0.5", True),
+    ("*;q=0", False),
+    ("*;q=0, identity", True),
+    ("gzip;q=0", True),
+])
+def test_identity_is_acceptable_unless_refused(header, acceptable):
+    assert identity_acceptable(accept(header)) is acceptable
+
+
+def test_large_responses_are_compressed():
+    response = compress_response(Response(BODY, mimetype="application/json"), accept("gzip"))
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.get_data()) == BODY
+    assert response.headers["Content-Length"] == str(len(response.get_data()))
+    assert "Accept-Encoding" in response.vary
+
+
+def test_small_responses_are_sent_as_they_are():
+    response = compress_response(Response(b'{"status":"success"}', mimetype="application/json"), accept("gzip"))
+
+    assert "Content-Encoding" not in response.headers
+    # The representation still depends on Accept-Encoding
+    assert "Accept-Encoding" in response.vary
+
+
+def test_small_responses_are_compressed_when_identity_is_refused():
+    response = compress_response(
+        Response(b'{"status":"success"}', mimetype="application/json"),
+        accept("gzip, identity;q=0")
+    )
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.get_data()) == b'{"status":"success"}'
+
+
+@pytest.mark.parametrize("make_response", [
+    lambda: Response(BODY, mimetype="image/png"),
+    lambda: Response(BODY, mimetype="application/json", headers={"Content-Encoding": "br"}),
+    lambda: Response(BODY, mimetype="application/json", headers={"Cache-Control": "no-transform"}),
+    lambda: Response(status=304),
+    lambda: Response(BODY, status=206, mimetype="application/json"),
+])
+def test_responses_that_must_not_change_are_left_alone(make_response):
+    response = make_response()
+    before = response.get_data()
+
+    compress_response(response, accept("gzip"))
+
+    assert response.get_data() == before
+    assert response.headers.get("Content-Encoding") in (None, "br")
+    assert "Accept-Encoding" not in response.vary
+
+
+def test_streamed_responses_are_compressed_chunk_by_chunk():
+    closed = []
+
+    def chunks():
+        try:
+            yield b'{"n":0}\n'
+            yield '{"n":1}\n'
+        finally:
+            closed.append(True)
+
+    response = compress_response(Response(chunks(), mimetype="application/x-ndjson"), accept("gzip"))
+    body = iter(response.response)
+    decompressor = zlib.decompressobj(31)
+
+    # Each chunk is flushed, so it decodes on arrival
+    assert decompressor.decompress(next(body)) == b'{"n":0}\n'
+    assert decompressor.decompress(next(body)) == b'{"n":1}\n'
+    assert decompressor.decompress(b"".join(body)) == b""
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert closed == [True]
+
+
+def test_weak_etags_get_a_variant_per_encoding():
+    response = Response(BODY, mimetype="application/json")
+    response.set_etag("abc", weak=True)
+
+    compress_response(response, accept("gzip"))
+
+    assert response.get_etag() == ("abc-gzip", True)
+
+
+def test_compression_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(compression, "COMPRESSION", False)
+
+    response = compress_response(Response(BODY, mimetype="application/json"), accept("gzip"))
+
+    assert response.get_data() == BODY
+    assert negotiate(accept("gzip")) is None
+
+
+def test_app_responses_are_compressed_on_request(client, monkeypatch):
+    monkeypatch.setattr(compression, "MIN_SIZE", 64)
+
+    plain = client.post("/execute", json=EXECUTE, headers={"Accept-Encoding": "identity"})
+    gzipped = client.post("/execute", json=EXECUTE, headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["Vary"] == "Accept-Encoding"
+    assert json.loads(gzip.decompress(gzipped.get_data())) == plain.get_json()
+
+
+def test_response_size_metric_measures_the_body_on_the_wire(client, monkeypatch):
+    monkeypatch.setattr(compression, "MIN_SIZE", 64)
+
+    def recorded():
+        # Sum of the response sizes recorded for /execute
+        return metrics.collect().get((RESPONSE_BYTES.name, ("/execute",)), [0, 0])[-2]
+
+    before = recorded()
+    response = client.post("/execute", json=EXECUTE, headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert recorded() - before == len(response.get_data())
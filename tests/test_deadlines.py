@@ -0,0 +1,94 @@
+"""
+Tests of call deadlines
+"""
+import threading
+import time
+
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.utils.types import ServiceType, ToolRequest
+
+
+def slow(seconds):
+    """A tool function returning after ``seconds``"""
+    def call(params):
+        time.sleep(seconds)
+        return "done"
+    return call
+
+
+def test_call_past_its_deadline_times_out(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow(0.3)}))
+
+    start = time.monotonic()
+    response = registry.execute_tool(ToolRequest(tool_name="slow", timeout_ms=50))
+
+    assert response.status == "timeout"
+    assert time.monotonic() - start < 0.25
+
+
+def test_call_within_its_deadline_succeeds(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow(0.05)}))
+
+    response = registry.execute_tool(ToolRequest(tool_name="slow", timeout_ms=2000))
+
+    assert response.status == "success"
+    assert response.data == "done"
+
+
+def test_expired_deadline_is_rejected_before_dispatch(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"tool": calls.append}))
+
+    response = registry.execute_tool(ToolRequest(tool_name="tool", deadline=time.time() - 1))
+
+    assert response.status == "timeout"
+    assert calls == []
+
+
+def test_coalesced_caller_does_not_inherit_a_shorter_deadline(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow(0.3)}))
+    responses = {}
+
+    def call(name, timeout_ms):
+        responses[name] = registry.execute_tool(ToolRequest(tool_name="slow", timeout_ms=timeout_ms))
+
+    leader = threading.Thread(target=call, args=("leader", 100))
+    leader.start()
+    time.sleep(0.05)
+    call("waiter", 5000)
+    leader.join()
+
+    assert responses["leader"].status == "timeout"
+    assert responses["waiter"].status == "success"
+    assert registry.single_flight.stats()["github.slow"]["retried"] == 1
+
+
+def test_batch_items_with_different_deadlines_are_not_merged(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow(0.2)}))
+
+    short, long = registry.execute_batch([
+        ToolRequest(tool_name="slow", timeout_ms=50),
+        ToolRequest(tool_name="slow", timeout_ms=5000),
+    ])
+
+    assert short.status == "timeout"
+    assert long.status == "success"
+
+
+def test_calls_timing_out_before_they_start_do_not_open_the_breaker(make_service):
+    registry = MCPRegistry(ExecutionEngine(service_concurrency=1))
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow(0.5)}))
+    try:
+        responses = registry.execute_batch([
+            ToolRequest(tool_name="slow", parameters={"i": i}, timeout_ms=100) for i in range(8)
+        ])
+        breaker = registry.breakers.get(ServiceType.GITHUB)
+
+        assert [response.status for response in responses] == ["timeout"] * 8
+        # Only the call holding the single slot reached the service
+        assert breaker.failures == 1
+        assert breaker.state == "closed"
+        assert registry.execute_tool(ToolRequest(tool_name="slow", timeout_ms=5000)).status == "success"
+    finally:
+        registry.engine.shutdown()
@@ -0,0 +1,172 @@
+"""
+Tests of the asyncio execution engine and the async entry points of the registry
+"""
+import asyncio
+import threading
+import time
+
+from src.server.executor import ExecutionEngine
+from src.utils.types import ServiceType, ToolRequest
+
+
+def where(params):
+    """A plain tool function reporting the thread it runs on"""
+    return threading.current_thread().name
+
+
+async def where_async(params):
+    """A coroutine tool function reporting the thread it runs on"""
+    return threading.current_thread().name
+
+
+def test_plain_functions_run_in_the_service_pool_and_coroutines_on_the_loop(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"plain": where, "coroutine": where_async}))
+
+    plain = registry.execute_tool(ToolRequest(tool_name="plain"))
+    coroutine = registry.execute_tool(ToolRequest(tool_name="coroutine"))
+
+    assert plain.data.startswith("mcp-github")
+    assert coroutine.data == "mcp-engine"
+
+
+def test_async_calls_leave_the_callers_loop_free(registry, make_service):
+    def slow(params):
+        time.sleep(0.2)
+        return "done"
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow}))
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        ticker = asyncio.create_task(tick())
+        try:
+            return await registry.execute_tool_async(ToolRequest(tool_name="slow"))
+        finally:
+            ticker.cancel()
+
+    response = asyncio.run(run())
+
+    assert response.data == "done"
+    assert len(ticks) > 5
+
+
+def test_async_batches_keep_request_order(registry, make_service):
+    async def double(params):
+        # Later items finish first
+        await asyncio.sleep(0.05 * (3 - params["n"]))
+        return params["n"] * 2
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"double": double}))
+
+    responses = asyncio.run(registry.execute_batch_async([
+        ToolRequest(tool_name="double", parameters={"n": n}) for n in range(3)
+    ]))
+
+    assert [response.data for response in responses] == [0, 2, 4]
+
+
+def test_coroutine_tools_run_concurrently(registry, make_service):
+    arrived = []
+
+    async def meet(params):
+        # Only returns when the other call runs at the same time
+        arrived.append(params["side"])
+        while len(arrived) < 2:
+            await asyncio.sleep(0.01)
+        return params["side"]
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"meet": meet}))
+
+    async def run():
+        return await asyncio.gather(*(
+            registry.execute_tool_async(ToolRequest(tool_name="meet", parameters={"side": side}, timeout_ms=2000))
+            for side in ("left", "right")
+        ))
+
+    assert [response.data for response in asyncio.run(run())] == ["left", "right"]
+
+
+def test_coroutine_tools_are_cancelled_at_their_deadline(registry, make_service):
+    cancelled = threading.Event()
+
+    async def hang(params):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"hang": hang}))
+
+    response = asyncio.run(registry.execute_tool_async(ToolRequest(tool_name="hang", timeout_ms=50)))
+
+    assert response.status == "timeout"
+    assert cancelled.wait(1)
+
+
+def test_coroutine_tool_errors_become_error_responses(registry, make_service):
+    async def broken(params):
+        raise ValueError("bad upstream payload")
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"broken": broken}))
+
+    response = asyncio.run(registry.execute_tool_async(ToolRequest(tool_name="broken")))
+
+    assert response.status == "error"
+    assert response.error == "Error executing tool: bad upstream payload"
+
+
+def test_blocking_calls_from_the_loop_are_refused(registry, make_service):
+    async def nested(params):
+        return registry.execute_tool(ToolRequest(tool_name="plain"))
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"nested": nested, "plain": where}))
+
+    response = registry.execute_tool(ToolRequest(tool_name="nested"))
+
+    assert response.status == "error"
+    assert "Blocking engine call made from the engine loop" in response.error
+
+
+def test_unknown_tools_fail_without_reaching_the_engine(registry):
+    response = asyncio.run(registry.execute_tool_async(ToolRequest(tool_name="missing")))
+
+    assert response.status == "error"
+    assert response.error == "Tool 'missing' not found"
+    assert registry.engine._loop is None
+
+
+def test_engine_restarts_after_shutdown():
+    engine = ExecutionEngine()
+
+    async def answer():
+        return threading.current_thread().name
+
+    try:
+        assert engine.run(answer()) == "mcp-engine"
+        first = engine.loop
+        engine.shutdown()
+        assert engine.run(answer()) == "mcp-engine"
+        assert engine.loop is not first
+    finally:
+        engine.shutdown()
+
+
+def test_engine_calls_from_the_loop_are_awaited_directly():
+    engine = ExecutionEngine()
+
+    async def inner():
+        return "inner"
+
+    async def outer():
+        return await engine.call(inner())
+
+    try:
+        assert engine.run(outer()) == "inner"
+    finally:
+        engine.shutdown()
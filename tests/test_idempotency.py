@@ -0,0 +1,149 @@
+"""
+Tests of idempotent writes
+"""
+import itertools
+import time
+
+import pytest
+
+from src.server.mcp_registry import definitive_response, registry as app_registry
+from src.server.validation import ToolValidationError
+from src.utils.types import ServiceType, ToolRequest, ToolResponse
+
+
+def writer(calls, seconds=0.0):
+    """A write tool function returning a new ID per call"""
+    ids = itertools.count(1)
+
+    def call(params):
+        calls.append(params)
+        time.sleep(seconds)
+        return {"id": next(ids), **params}
+    return call
+
+
+def write(key, client_id="agent", **params):
+    """A keyed request to the ``write`` tool"""
+    return ToolRequest(tool_name="write", parameters=params, idempotency_key=key, client_id=client_id)
+
+
+def test_retry_with_the_same_key_replays_the_response(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": writer(calls)}, mutates=True))
+
+    first = registry.execute_tool(write("key-1", title="Bug"))
+    retry = registry.execute_tool(write("key-1", title="Bug"))
+
+    assert len(calls) == 1
+    assert retry.data == first.data == {"id": 1, "title": "Bug"}
+    assert registry.idempotency.stats()["replayed"] == 1
+
+
+def test_reusing_a_key_with_different_parameters_is_an_error(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": writer(calls)}, mutates=True))
+
+    registry.execute_tool(write("key-1", title="Bug"))
+    conflict = registry.execute_tool(write("key-1", title="Other"))
+
+    assert conflict.status == "error"
+    assert "different parameters" in conflict.error
+    assert len(calls) == 1
+    assert registry.idempotency.stats()["conflicts"] == 1
+
+
+def test_keys_are_scoped_to_the_client(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": writer(calls)}, mutates=True))
+
+    registry.execute_tool(write("key-1", client_id="a", title="Bug"))
+    registry.execute_tool(write("key-1", client_id="b", title="Bug"))
+
+    assert len(calls) == 2
+
+
+def test_writes_without_a_key_always_run(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": writer(calls)}, mutates=True))
+
+    registry.execute_tool(write(None, title="Bug"))
+    registry.execute_tool(write(None, title="Bug"))
+
+    assert len(calls) == 2
+
+
+def test_retry_after_a_timeout_gets_the_outcome_of_the_write(registry, make_service):
+    calls = []
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": writer(calls, seconds=0.3)}, mutates=True))
+
+    first = registry.execute_tool(write("key-1", title="Bug").copy(update={"timeout_ms": 50}))
+    retry = registry.execute_tool(write("key-1", title="Bug").copy(update={"timeout_ms": 5000}))
+
+    assert first.status == "timeout"
+    assert retry.status == "success"
+    assert retry.data == {"id": 1, "title": "Bug"}
+    assert len(calls) == 1
+
+
+def test_idempotency_key_header_applies_to_tool_requests(client):
+    body = {
+        "tool_name": "github.create_issue",
+        "parameters": {"repo_id": 1, "title": "Bug", "body": "Details"}
+    }
+    replayed = app_registry.idempotency.stats()["replayed"]
+
+    first = client.post("/execute", json=body, headers={"Idempotency-Key": "header-key"})
+    retry = client.post("/execute", json=body, headers={"Idempotency-Key": "header-key"})
+
+    assert first.get_json()["status"] == "success"
+    assert retry.get_json() == first.get_json()
+    assert app_registry.idempotency.stats()["replayed"] == replayed + 1
+
+
+def test_transient_errors_are_not_replayed(registry, make_service):
+    calls = []
+
+    def flaky(params):
+        calls.append(params)
+        if len(calls) == 1:
+            raise ConnectionError("upstream unavailable")
+        return {"id": len(calls), **params}
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": flaky}, mutates=True))
+
+    first = registry.execute_tool(write("key-1", title="Bug"))
+    retry = registry.execute_tool(write("key-1", title="Bug"))
+    again = registry.execute_tool(write("key-1", title="Bug"))
+
+    assert first.status == "error"
+    assert retry.status == "success"
+    assert again.data == retry.data == {"id": 2, "title": "Bug"}
+    assert len(calls) == 2
+
+
+def test_rejected_parameters_are_replayed(registry, make_service):
+    calls = []
+
+    def strict(params):
+        calls.append(params)
+        raise ToolValidationError("Parameter 'title' is too long")
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"write": strict}, mutates=True))
+
+    first = registry.execute_tool(write("key-1", title="Bug"))
+    retry = registry.execute_tool(write("key-1", title="Bug"))
+
+    assert first.status == retry.status == "error"
+    assert retry.error == first.error == "Invalid parameters: Parameter 'title' is too long"
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("response, definitive", [
+    (ToolResponse(service=ServiceType.GITHUB, data={"id": 1}), True),
+    (ToolResponse(status="error", service=ServiceType.GITHUB, error="Invalid parameters: bad title"), True),
+    (ToolResponse(status="error", service=ServiceType.GITHUB, error="Error executing tool: reset"), False),
+    (ToolResponse(status="unavailable", service=ServiceType.GITHUB, data={"reason": "circuit_open"}), False),
+    (ToolResponse(status="timeout", service=ServiceType.GITHUB, error="Tool 'write' exceeded its deadline"), False),
+])
+def test_only_definitive_responses_are_stored(response, definitive):
+    assert definitive_response(response) is definitive
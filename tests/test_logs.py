@@ -0,0 +1,140 @@
+"""
+Tests of the queued logging pipeline
+"""
+import io
+import json
+import logging
+
+import pytest
+
+from src.server import logs
+from src.server.logs import LogSampler, configure_logging, current_log_sampled, log_sampler, shutdown_logging
+from src.server.tracing import Tracer
+from src.utils.types import ServiceType, ToolRequest
+
+logger = logging.getLogger("tests.logs")
+
+
+class CountingStream(io.StringIO):
+    """A text stream counting its writes"""
+
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+@pytest.fixture
+def pipeline():
+    """Route logging through a JSON pipeline into a stream, restoring the test setup afterwards"""
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    flags = logging.logThreads, logging.logProcesses, logging.logMultiprocessing
+    stream = CountingStream()
+    logging.disable(logging.NOTSET)
+    try:
+        yield configure_logging("INFO", "json", stream, force=True)
+    finally:
+        shutdown_logging()
+        logging.disable(logging.CRITICAL)
+        root.handlers[:] = handlers
+        root.setLevel(level)
+        logging.logThreads, logging.logProcesses, logging.logMultiprocessing = flags
+
+
+def written(pipeline):
+    """Stop the pipeline and parse what it wrote"""
+    shutdown_logging()
+    return [json.loads(line) for line in pipeline.handler.stream.getvalue().splitlines()]
+
+
+def test_shutdown_writes_every_queued_record(pipeline):
+    for i in range(500):
+        logger.info("record %d", i)
+
+    records = written(pipeline)
+
+    assert [record["message"] for record in records] == [f"record {i}" for i in range(500)]
+    assert {record["logger"] for record in records} == {"tests.logs"}
+    # Records that queued up together are written together
+    assert pipeline.handler.stream.writes < 500
+
+
+def test_records_carry_the_request_id(pipeline):
+    tracer = Tracer(0)
+    root, token = tracer.start_request("GET /test", request_id="req-1")
+    logger.warning("inside")
+    tracer.finish_request(root, token)
+    logger.warning("outside")
+
+    inside, outside = written(pipeline)
+
+    assert inside["request_id"] == "req-1"
+    assert "request_id" not in outside
+
+
+def test_arguments_are_merged_when_logged(pipeline):
+    labels = ["bug"]
+    logger.info("labels %s", labels)
+    labels.append("ui")
+
+    assert written(pipeline)[0]["message"] == "labels ['bug']"
+
+
+def test_exceptions_are_formatted(pipeline):
+    try:
+        raise ValueError("upstream failed")
+    except ValueError:
+        logger.exception("call failed")
+
+    record = written(pipeline)[0]
+    assert record["level"] == "ERROR"
+    assert "ValueError: upstream failed" in record["exception"]
+
+
+def test_unsampled_calls_keep_only_warnings(pipeline):
+    token = current_log_sampled.set(False)
+    try:
+        logger.info("dropped")
+        logger.warning("kept")
+    finally:
+        current_log_sampled.reset(token)
+
+    assert [record["message"] for record in written(pipeline)] == ["kept"]
+
+
+def test_configure_leaves_existing_handlers_alone(pipeline):
+    assert configure_logging(stream=io.StringIO()) is pipeline
+    assert [handler for handler in logging.getLogger().handlers if isinstance(handler, logs.LazyQueueHandler)] == [
+        pipeline.queue_handler
+    ]
+
+
+@pytest.mark.parametrize("rate, draw, sampled", [(1, 0.99, True), (0, 0.0, False), (0.5, 0.4, True), (0.5, 0.6, False)])
+def test_sampler_rates(monkeypatch, rate, draw, sampled):
+    monkeypatch.setattr(logs.random, "random", lambda: draw)
+    sampler = LogSampler(1, {"github.noisy": rate})
+
+    assert sampler.sample("github.noisy") is sampled
+    assert sampler.sample("github.other")
+
+
+def test_tool_logs_are_sampled_per_tool_with_the_request_id(pipeline, registry, make_service, monkeypatch):
+    def noisy(params):
+        logger.info("tool info")
+        logger.warning("tool warning")
+        return []
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"noisy": noisy, "quiet": noisy}))
+    monkeypatch.setattr(log_sampler, "rates", {"github.noisy": 0})
+    tracer = Tracer(0)
+
+    root, token = tracer.start_request("POST /execute", request_id="req-2")
+    registry.execute_tool(ToolRequest(tool_name="noisy"))
+    registry.execute_tool(ToolRequest(tool_name="quiet"))
+    tracer.finish_request(root, token)
+
+    records = [record for record in written(pipeline) if record["logger"] == "tests.logs"]
+    assert [record["message"] for record in records] == ["tool warning", "tool info", "tool warning"]
+    assert {record["request_id"] for record in records} == {"req-2"}
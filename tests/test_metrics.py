@@ -0,0 +1,110 @@
+"""
+Tests of metrics recorded across threads and worker processes
+"""
+import os
+import subprocess
+import sys
+import threading
+from typing import Dict
+
+from src.server.metrics import TOOL_CALLS, MetricsRegistry, metrics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A worker process recording calls from several threads, then exiting
+WORKER = """
+import threading
+from src.server.metrics import TOOL_CALLS, TOOL_IN_FLIGHT
+
+def record():
+    for _ in range(250):
+        TOOL_CALLS.inc(("workers", "test", "success"))
+
+threads = [threading.Thread(target=record) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+TOOL_IN_FLIGHT.inc(("workers", "test"))
+"""
+
+
+def samples(exported: str) -> Dict[str, str]:
+    """Values of the series in the Prometheus text format, by series"""
+    return dict(line.rsplit(" ", 1) for line in exported.splitlines() if line and not line.startswith("#"))
+
+
+def test_threads_record_into_their_own_shards():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "Calls", ("tool",))
+    histogram = registry.histogram("sizes", "Sizes", ("tool",), (10, 100))
+    barrier = threading.Barrier(8)
+
+    def record():
+        barrier.wait()
+        for i in range(1000):
+            counter.inc(("read",))
+            histogram.observe(("read",), i % 200)
+
+    threads = [threading.Thread(target=record) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    exported = samples(registry.export())
+    assert exported['calls_total{tool="read"}'] == "8000"
+    assert exported['sizes_bucket{tool="read",le="10"}'] == str(8 * 5 * 11)
+    assert exported['sizes_bucket{tool="read",le="+Inf"}'] == "8000"
+    assert exported['sizes_count{tool="read"}'] == "8000"
+    assert exported['sizes_sum{tool="read"}'] == str(8 * 5 * sum(range(200)))
+
+
+def test_shards_of_finished_threads_are_kept(monkeypatch):
+    monkeypatch.setattr("src.server.metrics.MAX_LIVE_SHARDS", 2)
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "Calls")
+
+    for _ in range(10):
+        thread = threading.Thread(target=counter.inc, args=((),))
+        thread.start()
+        thread.join()
+
+    assert len(registry._shards) <= 2
+    assert samples(registry.export())["calls_total"] == "10"
+
+
+def test_worker_processes_are_merged_into_every_scrape(client, tmp_path, monkeypatch):
+    env = dict(os.environ, MCP_METRICS_DIR=str(tmp_path))
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", WORKER], cwd=ROOT, env=env, check=True, timeout=60)
+    # This process is one more worker
+    monkeypatch.setattr(metrics, "multiprocess_dir", str(tmp_path))
+    TOOL_CALLS.inc(("workers", "test", "success"), 5)
+
+    exported = samples(client.get("/metrics").get_data(as_text=True))
+
+    assert len(list(tmp_path.glob("metrics-*.json"))) == 3
+    assert exported['mcp_tool_calls_total{service="workers",tool="test",status="success"}'] == "3005"
+    # Workers drop their gauges when they exit
+    assert 'mcp_tool_in_flight{service="workers",tool="test"}' not in exported
+
+
+def test_gauges_of_dead_workers_are_dropped(tmp_path):
+    worker = MetricsRegistry(str(tmp_path))
+    worker.counter("calls_total", "Calls").inc(())
+    worker.gauge("in_flight", "In flight").inc((), 2)
+    worker.flush()
+
+    scraper = MetricsRegistry(str(tmp_path))
+    scraper.counter("calls_total", "Calls")
+    scraper.gauge("in_flight", "In flight")
+    # The snapshot of another worker, with PID 1
+    os.rename(worker._process_file(str(tmp_path), os.getpid()), worker._process_file(str(tmp_path), 1))
+    assert samples(scraper.export())["in_flight"] == "2"
+
+    scraper.mark_process_dead(1)
+
+    exported = samples(scraper.export())
+    assert exported["calls_total"] == "1"
+    assert "in_flight" not in exported
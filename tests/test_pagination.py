@@ -0,0 +1,135 @@
+"""
+Tests of cursor pagination
+"""
+import pytest
+
+from src.services.pagination import CursorError, decode_cursor, keyset_page, upstream_page, upstream_records
+
+RECORDS = [{"id": i, "state": "open" if i % 3 else "closed"} for i in range(1, 21)]
+
+
+def is_open(record):
+    return record["state"] == "open"
+
+
+def all_pages(page_function, params):
+    """Follow the cursors from the first page, and return the pages"""
+    pages = [page_function(params)]
+    while pages[-1].next_cursor is not None:
+        pages.append(page_function({**params, "cursor": pages[-1].next_cursor}))
+    return pages
+
+
+def test_keyset_pages_cover_every_matching_record_once():
+    pages = all_pages(lambda params: keyset_page(RECORDS, params, "id", is_open), {"state": "open", "limit": 4})
+
+    assert [len(page.items) for page in pages] == [4, 4, 4, 2]
+    assert [record for page in pages for record in page.items] == [r for r in RECORDS if is_open(r)]
+
+
+def test_keyset_page_is_not_shifted_by_earlier_deletions():
+    params = {"limit": 5}
+    first = keyset_page(RECORDS, params, "id", is_open)
+    expected = keyset_page(RECORDS, {**params, "cursor": first.next_cursor}, "id", is_open)
+
+    remaining = [record for record in RECORDS if record["id"] not in (1, 2)]
+    second = keyset_page(remaining, {**params, "cursor": first.next_cursor}, "id", is_open)
+
+    assert second.items == expected.items
+
+
+def test_cursor_is_bound_to_its_query():
+    first = keyset_page(RECORDS, {"state": "open", "limit": 2}, "id", is_open)
+
+    with pytest.raises(CursorError, match="different parameters"):
+        decode_cursor({"state": "closed", "limit": 2, "cursor": first.next_cursor})
+    # The page size may change between pages
+    assert decode_cursor({"state": "open", "limit": 10, "cursor": first.next_cursor}) == {"after": 2}
+
+
+@pytest.mark.parametrize("cursor", ["garbage!", "e30", "bm90IGpzb24"])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(CursorError, match="Malformed cursor"):
+        decode_cursor({"cursor": cursor})
+
+
+class FakeUpstream:
+    """An upstream API serving ``count`` records in pages of ``size``"""
+
+    def __init__(self, count, size):
+        self.records = list(range(count))
+        self.size = size
+        self.fetched = []
+
+    def fetch(self, token):
+        start = token or 0
+        self.fetched.append(start)
+        end = start + self.size
+        return self.records[start:end], (end if end < len(self.records) else None)
+
+
+def test_upstream_pages_of_any_limit_cover_every_record():
+    upstream = FakeUpstream(count=10, size=4)
+
+    pages = all_pages(lambda params: upstream_page(upstream.fetch, params), {"limit": 3})
+
+    assert [page.items for page in pages] == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
+def test_upstream_page_only_fetches_the_pages_it_needs():
+    upstream = FakeUpstream(count=100, size=10)
+    first = upstream_page(upstream.fetch, {"limit": 15})
+    upstream.fetched.clear()
+
+    second = upstream_page(upstream.fetch, {"limit": 3, "cursor": first.next_cursor})
+
+    assert second.items == [15, 16, 17]
+    assert upstream.fetched == [10]
+
+
+def test_upstream_records_fetch_pages_as_they_are_consumed():
+    upstream = FakeUpstream(count=10, size=4)
+    records = upstream_records(upstream.fetch)
+
+    assert [next(records) for _ in range(5)] == [0, 1, 2, 3, 4]
+    assert upstream.fetched == [0, 4]
+    assert list(records) == [5, 6, 7, 8, 9]
+
+
+def test_list_tool_pages_over_http(client):
+    def page(**parameters):
+        return client.post("/execute", json={"tool_name": "github.list_issues", "parameters": parameters}).get_json()
+
+    first = page(state="open", limit=2)
+    second = page(state="open", limit=2, cursor=first["next_cursor"])
+
+    assert [issue["id"] for issue in first["data"] + second["data"]] == [101, 103, 104]
+    assert second["next_cursor"] is None
+
+    mismatched = page(state="closed", limit=2, cursor=first["next_cursor"])
+    assert mismatched["status"] == "error"
+    assert mismatched["error"].startswith("Invalid parameters")
+
+
+@pytest.mark.parametrize("limit", [0, 1001])
+def test_limit_out_of_bounds_is_rejected(client, limit):
+    response = client.post("/execute", json={"tool_name": "github.list_issues", "parameters": {"limit": limit}})
+
+    assert response.get_json()["status"] == "error"
+    assert "limit" in response.get_json()["error"]
+
+
+def test_linear_pages_match_the_full_listing(client):
+    def call(**parameters):
+        return client.post("/execute", json={"tool_name": "linear.list_issues", "parameters": parameters}).get_json()
+
+    everything = call()["data"]
+    records, cursor = [], None
+    while True:
+        response = call(limit=1, **({"cursor": cursor} if cursor else {}))
+        records.extend(response["data"])
+        cursor = response["next_cursor"]
+        if cursor is None:
+            break
+
+    assert records == everything
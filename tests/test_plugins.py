@@ -0,0 +1,54 @@
+"""
+Tests of lazy service loading
+"""
+import logging
+
+from src.server.plugins import PluginLoader
+from src.utils.types import ServiceType, ToolRequest
+
+
+def test_services_are_registered_as_stubs(registry):
+    loader = PluginLoader(registry)
+    loader.register_all()
+
+    assert set(registry.services) == {ServiceType.GITHUB, ServiceType.LINEAR}
+    assert all(plugin.service is None for plugin in loader.plugins.values())
+    assert registry.resolve("github.list_repos") is not None
+
+
+def test_first_call_loads_the_service(registry):
+    loader = PluginLoader(registry)
+    loader.register_all()
+    stub = registry.resolve("github.list_repos")
+
+    response = registry.execute_tool(ToolRequest(tool_name="github.list_repos"))
+
+    assert response.status == "success"
+    assert [repo["id"] for repo in response.data] == [1, 3]
+    assert loader.plugins[ServiceType.GITHUB].service is not None
+    assert registry.resolve("github.list_repos").function is not stub.function
+    assert loader.plugins[ServiceType.LINEAR].service is None
+
+
+def test_loading_keeps_bare_name_routing(registry):
+    loader = PluginLoader(registry)
+    loader.register_all()
+    order = list(registry.services)
+    owner = registry.resolve("list_issues").service.type
+
+    for service_type in (ServiceType.GITHUB, ServiceType.LINEAR):
+        loader.ensure_loaded(service_type)
+        assert list(registry.services) == order
+        assert registry.resolve("list_issues").service.type == owner
+
+
+def test_loading_replaces_the_stubs_quietly(registry, registry_logs):
+    loader = PluginLoader(registry)
+    loader.register_all()
+    registry_logs.clear()
+
+    for service_type in (ServiceType.GITHUB, ServiceType.LINEAR):
+        loader.ensure_loaded(service_type)
+        loader.reload(service_type)
+
+    assert [record.getMessage() for record in registry_logs.records if record.levelno >= logging.WARNING] == []
@@ -0,0 +1,203 @@
+"""
+Tests of on-demand profiling sessions and the profiling endpoints
+"""
+import marshal
+import pstats
+import threading
+
+import pytest
+
+from src.server import app as app_module
+from src.server.profiling import MAX_REQUESTS, Profiler, current_profile
+from src.utils.types import ServiceType, ToolRequest
+
+
+def busy(n):
+    """Some work for the profiler to see"""
+    return sum(i * i for i in range(n))
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    """A fresh profiler in place of the app's"""
+    profiler = Profiler()
+    monkeypatch.setattr(app_module, "profiler", profiler)
+    return profiler
+
+
+@pytest.mark.parametrize("requests", [0, -1, MAX_REQUESTS + 1])
+def test_session_size_is_bounded(requests):
+    with pytest.raises(ValueError):
+        Profiler().start(requests)
+
+
+def test_sessions_cover_the_next_requests():
+    profiler = Profiler()
+    session = profiler.start(2)
+
+    assert profiler.claim({"list_issues"}) is session
+    assert profiler.claim({"get_user"}) is session
+    # The session is used up
+    assert not profiler.armed
+    assert profiler.claim({"list_issues"}) is None
+    assert session.remaining == 0
+
+
+def test_sessions_for_one_tool_skip_the_others():
+    profiler = Profiler()
+    session = profiler.start(1, "linear.list_issues")
+
+    assert profiler.claim({"get_user", "linear.get_user"}) is None
+    assert profiler.claim({"list_issues", "linear.list_issues"}) is session
+    assert not profiler.armed
+
+
+def test_stopping_keeps_the_results():
+    profiler = Profiler()
+    session = profiler.start(5)
+    profiler.claim({"list_issues"}).run("request", busy, 1000)
+
+    assert profiler.stop() is session
+    assert not profiler.armed
+    assert profiler.claim({"list_issues"}) is None
+    assert session.to_dict()["requests"] == 1
+    assert session.finished_at is not None
+    assert profiler.session is session
+
+
+def test_starting_replaces_the_previous_session():
+    profiler = Profiler()
+    first = profiler.start(1)
+    first.run("request", busy, 1000)
+
+    second = profiler.start(1)
+
+    assert profiler.session is second
+    assert second.profiled == 0
+    assert second.top() == []
+
+
+def test_runs_are_aggregated_per_part():
+    session = Profiler().start(2)
+
+    assert session.run("request", busy, 1000) == busy(1000)
+    session.run("request", session.wrap("tool", busy), 1000)
+
+    assert session.profiled == 2
+    assert session.finished_at is not None
+    # Tool calls made while a request is profiled see its session
+    assert session.run("request", current_profile.get) is session
+    assert current_profile.get() is None
+    stacks = session.folded().splitlines()
+    assert any(line.startswith("request;") for line in stacks)
+    assert any(line.startswith("tool;") and "busy (test_profiling.py" in line for line in stacks)
+    for line in stacks:
+        assert int(line.rsplit(" ", 1)[1]) > 0
+
+
+def test_top_functions_are_sorted():
+    session = Profiler().start(1)
+    session.run("request", busy, 10000)
+
+    by_own = session.top(limit=3)
+    by_cumulative = session.top("cumtime")
+
+    assert len(by_own) == 3
+    assert [entry["tottime"] for entry in by_own] == sorted((entry["tottime"] for entry in by_own), reverse=True)
+    assert by_cumulative[0]["cumtime"] == max(entry["cumtime"] for entry in by_cumulative)
+    assert any(entry["function"].startswith("busy (test_profiling.py") for entry in by_cumulative)
+
+
+def test_dump_loads_as_pstats(tmp_path):
+    session = Profiler().start(1)
+    session.run("request", busy, 1000)
+    path = tmp_path / "mcp.pstats"
+    path.write_bytes(session.dump())
+
+    stats = pstats.Stats(str(path))
+
+    assert any(name == "busy" for _, _, name in marshal.loads(path.read_bytes()))
+    assert stats.total_calls > 0
+
+
+def test_concurrent_requests_are_all_counted():
+    session = Profiler().start(8)
+    barrier = threading.Barrier(8)
+
+    def request():
+        barrier.wait()
+        session.run("request", busy, 1000)
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert session.profiled == 8
+    assert session.finished_at is not None
+
+
+def test_thread_pool_tool_calls_are_profiled(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": lambda params: busy(1000)}))
+    session = Profiler().start(1)
+
+    session.run("request", registry.execute_tool, ToolRequest(tool_name="issues"))
+
+    assert any(line.startswith("tool;") for line in session.folded().splitlines())
+
+
+def test_endpoints_profile_the_matching_requests(client, admin, profiler):
+    started = client.post("/admin/profile", json={"requests": 2, "tool": "linear.list_issues"}, headers=admin)
+    client.post("/execute", json={"tool_name": "linear.list_issues", "parameters": {}})
+    client.post("/execute", json={"tool_name": "linear.get_user", "parameters": {"user_id": "user1"}})
+    client.post("/linear/list_issues", json={})
+
+    profile = client.get("/admin/profile?sort=cumtime&limit=5", headers=admin).get_json()
+
+    assert started.get_json()["profile"]["requests"] == 2
+    assert profile["active"] is False
+    assert profile["profile"]["profiled"] == 2
+    assert profile["profile"]["remaining"] == 0
+    assert 0 < len(profile["top"]) <= 5
+    folded = client.get("/admin/profile/folded", headers=admin).get_data(as_text=True)
+    assert any(line.startswith("request;") for line in folded.splitlines())
+    download = client.get("/admin/profile/pstats", headers=admin)
+    assert download.mimetype == "application/octet-stream"
+    assert "mcp.pstats" in download.headers["Content-Disposition"]
+    assert marshal.loads(download.get_data())
+
+
+def test_unarmed_profiler_leaves_requests_alone(client, profiler):
+    response = client.post("/execute", json={"tool_name": "linear.list_issues", "parameters": {}})
+
+    assert response.status_code == 200
+    assert profiler.session is None
+
+
+def test_stop_endpoint_ends_the_session(client, admin, profiler):
+    client.post("/admin/profile", json={"requests": 10}, headers=admin)
+    client.post("/execute", json={"tool_name": "linear.list_issues", "parameters": {}})
+
+    stopped = client.delete("/admin/profile", headers=admin).get_json()
+    client.post("/execute", json={"tool_name": "linear.list_issues", "parameters": {}})
+
+    assert stopped["profile"]["requests"] == 1
+    assert client.get("/admin/profile", headers=admin).get_json()["profile"]["profiled"] == 1
+
+
+@pytest.mark.parametrize("body", [{"requests": 0}, {"requests": "many"}, {"requests": MAX_REQUESTS + 1}])
+def test_invalid_sessions_are_rejected(client, admin, profiler, body):
+    response = client.post("/admin/profile", json=body, headers=admin)
+
+    assert response.status_code == 400
+    assert response.get_json()["error"].startswith("Error starting profiling: ")
+    assert profiler.session is None
+
+
+@pytest.mark.parametrize("path", ["/admin/profile", "/admin/profile/pstats", "/admin/profile/folded"])
+def test_results_need_a_session(client, admin, profiler, path):
+    response = client.get(path, headers=admin)
+
+    assert response.status_code == 404
+    assert response.get_json()["error"] == "No profiling session"
@@ -0,0 +1,155 @@
+"""
+Tests of sparse fieldset projection
+"""
+import json
+
+import pytest
+
+from src.server.app import app, apply_request_headers, ndjson_lines
+from src.server.projection import MAX_FIELDS, ProjectionError, compile_projection, current_projection
+from src.utils.types import ServiceType, ToolRequest, WorkflowRequest
+
+ISSUE = {
+    "id": 1,
+    "title": "Bug",
+    "body": "Long description",
+    "assignee": {"login": "octocat", "id": 7, "url": "https://example.com/octocat"},
+    "labels": [{"name": "bug", "color": "red"}, {"name": "ui", "color": "blue"}],
+}
+
+
+def issues(count=3):
+    """A tool function returning ``count`` copies of ``ISSUE`` with their own IDs"""
+    def call(params):
+        return [dict(ISSUE, id=i) for i in range(count)]
+    return call
+
+
+def test_flat_fields():
+    assert compile_projection(["id", "title"]).project(ISSUE) == {"id": 1, "title": "Bug"}
+
+
+def test_dotted_paths_select_within_records_and_lists():
+    projection = compile_projection(["assignee.login", "labels.name"])
+
+    assert projection.project(ISSUE) == {
+        "assignee": {"login": "octocat"},
+        "labels": [{"name": "bug"}, {"name": "ui"}],
+    }
+
+
+def test_whole_value_wins_over_a_nested_path():
+    projection = compile_projection(["assignee.login", "assignee"])
+
+    assert projection.project(ISSUE)["assignee"] == ISSUE["assignee"]
+
+
+def test_missing_fields_and_scalar_values_are_left_alone():
+    projection = compile_projection(["id", "milestone"])
+
+    assert projection.project([ISSUE, "not a record"]) == [{"id": 1}, "not a record"]
+
+
+def test_plans_are_cached_per_field_set():
+    assert compile_projection(["title", "id"]) is compile_projection(["id", "title", "id"])
+
+
+@pytest.mark.parametrize("fields", [[], ["assignee..login"], ["."], [f"field_{i}" for i in range(MAX_FIELDS + 1)]])
+def test_invalid_fields_are_rejected(fields):
+    with pytest.raises(ProjectionError):
+        compile_projection(fields)
+
+
+def test_registry_projects_results(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": issues()}))
+
+    response = registry.execute_tool(ToolRequest(tool_name="issues", fields=["id", "assignee.login"]))
+
+    assert response.data == [{"id": i, "assignee": {"login": "octocat"}} for i in range(3)]
+
+
+def test_invalid_fields_fail_as_invalid_parameters(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": issues()}))
+
+    response = registry.execute_tool(ToolRequest(tool_name="issues", fields=["a..b"]))
+
+    assert response.status == "error"
+    assert response.error.startswith("Invalid parameters")
+
+
+def test_projections_are_cached_apart(registry, make_service):
+    calls = []
+
+    def counted(params):
+        calls.append(params)
+        return [ISSUE]
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": counted}, cache_ttl=60))
+
+    projected = registry.execute_tool(ToolRequest(tool_name="issues", fields=["id"]))
+    full = registry.execute_tool(ToolRequest(tool_name="issues"))
+    projected_again = registry.execute_tool(ToolRequest(tool_name="issues", fields=["id"]))
+
+    assert projected.data == projected_again.data == [{"id": 1}]
+    assert full.data == [ISSUE]
+    assert len(calls) == 2
+
+
+def test_batch_items_with_different_fields_are_not_merged(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": issues(1)}))
+
+    ids, titles = registry.execute_batch([
+        ToolRequest(tool_name="issues", fields=["id"]),
+        ToolRequest(tool_name="issues", fields=["title"]),
+    ])
+
+    assert ids.data == [{"id": 0}]
+    assert titles.data == [{"title": "Bug"}]
+
+
+def test_streamed_records_are_projected(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": lambda params: iter(issues()(params))}))
+
+    stream = registry.stream_tool(ToolRequest(tool_name="issues", fields=["id"]))
+    lines = [json.loads(line) for line in b"".join(ndjson_lines(stream)).splitlines()]
+
+    assert lines[1:-1] == [{"id": 0}, {"id": 1}, {"id": 2}]
+
+
+def test_tools_pushing_the_projection_down_get_it_and_are_left_alone(registry, make_service):
+    seen = []
+
+    def pushdown(params):
+        projection = current_projection.get()
+        seen.append(projection.fields)
+        return [{"id": 1, "selected_by": "upstream"}]
+
+    registry.register_service(make_service(ServiceType.LINEAR, {"issues": pushdown}, projects=True))
+
+    response = registry.execute_tool(ToolRequest(tool_name="issues", fields=["title", "id"]))
+
+    assert seen == [("id", "title")]
+    assert response.data == [{"id": 1, "selected_by": "upstream"}]
+
+
+def test_fields_header_with_linear_pagination(client):
+    response = client.post(
+        "/execute",
+        json={"tool_name": "linear.list_issues", "parameters": {"limit": 2}},
+        headers={"X-MCP-Fields": "id,title"},
+    ).get_json()
+
+    assert response["status"] == "success"
+    assert [set(issue) for issue in response["data"]] == [{"id", "title"}] * 2
+    assert response["next_cursor"] is not None
+
+
+def test_fields_header_only_applies_to_single_tool_requests():
+    with app.test_request_context(headers={"X-MCP-Fields": "id", "Idempotency-Key": "key"}):
+        single = apply_request_headers(ToolRequest(tool_name="issues"), single=True)
+        item = apply_request_headers(ToolRequest(tool_name="issues"))
+        workflow = apply_request_headers(WorkflowRequest(steps=[]))
+
+    assert (single.fields, single.idempotency_key) == (["id"], "key")
+    assert (item.fields, item.idempotency_key) == (None, None)
+    assert not hasattr(workflow, "fields")
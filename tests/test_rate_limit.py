@@ -0,0 +1,174 @@
+"""
+Tests of the upstream-aware rate limiter against a local fake upstream
+"""
+import asyncio
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.server.ratelimit import RateLimiter, current_limiter
+from src.utils.deadline import remaining_budget
+from src.utils.types import ServiceType, ToolRequest
+
+QUOTA = 5  # requests allowed per window
+WINDOW = 0.5  # seconds
+
+
+class FakeUpstream(ThreadingHTTPServer):
+    """HTTP server enforcing a fixed-window quota with GitHub style rate-limit headers"""
+
+    daemon_threads = True
+
+    def __init__(self, quota: int, window: float):
+        super().__init__(("127.0.0.1", 0), QuotaHandler)
+        self.quota = quota
+        self.window = window
+        self.lock = threading.Lock()
+        self.current = 0
+        self.used = 0
+        self.accepted = 0
+        self.rejected = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class QuotaHandler(BaseHTTPRequestHandler):
+    """Answer with rate-limit headers, or 429 and Retry-After once the window's quota is spent"""
+
+    server: FakeUpstream
+
+    def do_GET(self) -> None:
+        upstream = self.server
+        now = time.time()
+        window = math.floor(now / upstream.window)
+        reset = (window + 1) * upstream.window
+        with upstream.lock:
+            if window != upstream.current:
+                upstream.current, upstream.used = window, 0
+            allowed = upstream.used < upstream.quota
+            if allowed:
+                upstream.used += 1
+                upstream.accepted += 1
+            else:
+                upstream.rejected += 1
+            remaining = upstream.quota - upstream.used
+
+        self.send_response(200 if allowed else 429)
+        self.send_header("X-RateLimit-Limit", str(upstream.quota))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset", f"{reset:.3f}")
+        if not allowed:
+            self.send_header("Retry-After", f"{reset - now:.3f}")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def upstream():
+    """A fake upstream allowing QUOTA requests per WINDOW seconds"""
+    server = FakeUpstream(QUOTA, WINDOW)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(url: str) -> requests.Response:
+    """Send an upstream request the way a service does, reporting it to the running call's limiter"""
+    limiter = current_limiter.get()
+    limiter.request_started()
+    try:
+        response = requests.get(url, timeout=remaining_budget(5))
+    finally:
+        limiter.request_finished()
+    limiter.observe(response.headers, response.status_code)
+    return response
+
+
+def test_429_with_retry_after_blocks_the_service(upstream):
+    upstream.quota = 0
+    limiter = RateLimiter(rate=None, max_wait=5)
+    token = current_limiter.set(limiter)
+    try:
+        response = fetch(upstream.url)
+    finally:
+        current_limiter.reset(token)
+
+    assert response.status_code == 429
+    retry_after = float(response.headers["Retry-After"])
+    # Plus the margin keeping calls clear of the window reset
+    assert retry_after - 0.05 <= limiter.retry_after() <= retry_after + WINDOW / 8
+    # Calls that can't wait that long are shed instead of being sent
+    assert limiter.reserve(max_wait=0) is None
+    assert limiter.stats()["shed"] == 1
+
+    start = time.monotonic()
+    asyncio.run(limiter.acquire())
+    assert time.monotonic() - start >= retry_after - 0.05
+
+
+def test_headers_track_the_remaining_quota(upstream):
+    limiter = RateLimiter(rate=None)
+    token = current_limiter.set(limiter)
+    try:
+        for _ in range(2):
+            fetch(upstream.url)
+    finally:
+        current_limiter.reset(token)
+
+    stats = limiter.stats()
+    assert stats["upstream_limit"] == QUOTA
+    # Both requests may fall in different windows of the fake upstream
+    assert stats["upstream_remaining"] in (QUOTA - 1, QUOTA - 2)
+    assert 0 < stats["window_reset"] <= WINDOW
+
+
+def test_calls_are_throttled_to_the_upstream_quota(upstream, make_service):
+    calls = 4 * QUOTA
+    registry = MCPRegistry(ExecutionEngine(service_queue_limit=calls))
+    registry.limiters.configure(ServiceType.GITHUB, rate=None, max_wait=10)
+    registry.breakers.configure(ServiceType.GITHUB, failure_threshold=calls + 1)
+
+    def get(params):
+        response = fetch(upstream.url)
+        response.raise_for_status()
+        return params["i"]
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"get": get}))
+
+    async def gather():
+        return await asyncio.gather(*(
+            registry.execute_tool_async(ToolRequest(tool_name="get", parameters={"i": i})) for i in range(calls)
+        ))
+
+    # The limiter learns the quota from the first response, and the whole
+    # window's length when it is sent as an upstream window starts
+    time.sleep(WINDOW - time.time() % WINDOW)
+    assert registry.execute_tool(ToolRequest(tool_name="get", parameters={"i": -1})).status == "success"
+
+    start = time.monotonic()
+    try:
+        responses = asyncio.run(gather())
+    finally:
+        registry.engine.shutdown()
+    elapsed = time.monotonic() - start
+
+    # Calls wait for the quota instead of being sent to fail, and none are
+    # sent close enough to a window reset to straddle it
+    assert upstream.rejected == 0
+    assert all(response.status == "success" for response in responses)
+    # QUOTA requests per WINDOW: every window after the first is waited for
+    assert elapsed >= (calls / QUOTA - 2) * WINDOW
+    assert registry.limiters.stats(ServiceType.GITHUB)["throttled"] > 0
@@ -0,0 +1,84 @@
+"""
+Tests of registry routing, snapshots and hot reload
+"""
+import logging
+
+from src.server.mcp_registry import registry as app_registry
+from src.utils.types import ServiceType, ToolRequest
+
+
+def test_bare_name_routes_to_last_registered_service(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github"}))
+    registry.register_service(make_service(ServiceType.LINEAR, {"list_issues": lambda params: "linear"}))
+
+    assert registry.execute_tool(ToolRequest(tool_name="list_issues")).data == "linear"
+    assert registry.execute_tool(ToolRequest(tool_name="github.list_issues")).data == "github"
+
+
+def test_replacing_a_service_keeps_routing(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github"}))
+    registry.register_service(make_service(ServiceType.LINEAR, {"list_issues": lambda params: "linear"}))
+    version = registry.version
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github v2"}))
+
+    assert registry.version == version + 1
+    assert list(registry.services) == [ServiceType.GITHUB, ServiceType.LINEAR]
+    assert registry.execute_tool(ToolRequest(tool_name="list_issues")).data == "linear"
+    assert registry.execute_tool(ToolRequest(tool_name="github.list_issues")).data == "github v2"
+
+
+def warnings(logs):
+    """Messages of the captured warnings"""
+    return [record.getMessage() for record in logs.records if record.levelno >= logging.WARNING]
+
+
+def test_overlaps_are_reported_once(registry, make_service, registry_logs):
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github"}))
+    registry.register_service(make_service(ServiceType.LINEAR, {"list_issues": lambda params: "linear"}))
+    assert len(warnings(registry_logs)) == 1
+    assert "Tool name overlap: list_issues" in warnings(registry_logs)[0]
+
+    registry_logs.clear()
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github v2"}), True)
+    registry.register_service(make_service(ServiceType.LINEAR, {"list_issues": lambda params: "linear v2"}), True)
+
+    assert warnings(registry_logs) == []
+
+
+def test_new_overlaps_of_a_replaced_service_are_reported(registry, make_service, registry_logs):
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github"}))
+    registry.register_service(make_service(ServiceType.LINEAR, {"get_user": lambda params: "linear"}))
+
+    registry.register_service(make_service(ServiceType.GITHUB, {
+        "list_issues": lambda params: "github",
+        "get_user": lambda params: "github"
+    }), True)
+
+    assert len(warnings(registry_logs)) == 1
+    assert "Tool name overlap: get_user" in warnings(registry_logs)[0]
+
+
+def test_unexpected_replacements_are_reported(registry, make_service, registry_logs):
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github"}))
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github v2"}))
+    registry.register_service(make_service(ServiceType.GITHUB, {"list_issues": lambda params: "github v3"}), True)
+
+    assert warnings(registry_logs) == ["Service ServiceType.GITHUB is already registered. Overwriting."]
+
+
+def test_reload_endpoint_keeps_bare_name_routing(client, admin):
+    before = {name: app_registry.resolve(name).service.type for name in ("list_issues", "get_user", "create_issue")}
+
+    for service in ("github", "linear", "github"):
+        response = client.post(f"/admin/services/{service}/reload", headers=admin)
+        assert response.status_code == 200
+        after = {name: app_registry.resolve(name).service.type for name in before}
+        assert after == before
+
+    response = client.post("/execute", json={"tool_name": "list_issues", "parameters": {}})
+    assert response.get_json()["service"] == before["list_issues"].value
+
+
+def test_reload_of_unknown_service(client, admin):
+    assert client.post("/admin/services/jira/reload", headers=admin).status_code == 404
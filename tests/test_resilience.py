@@ -0,0 +1,141 @@
+"""
+Tests of the circuit breakers and bulkheads isolating services
+"""
+import asyncio
+import time
+
+from src.server.executor import ExecutionEngine
+from src.server.mcp_registry import MCPRegistry
+from src.server.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from src.utils.types import ServiceType, ToolRequest
+
+
+def failing(params):
+    """A tool function whose upstream is down"""
+    raise ConnectionError("upstream down")
+
+
+async def bulkhead_stats(engine):
+    """Usage of the GitHub bulkhead, read on the engine loop"""
+    return engine.bulkhead(ServiceType.GITHUB).stats()
+
+
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == CLOSED
+    # A success resets the count
+    breaker.record_success()
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+    assert 59 < breaker.retry_after() <= 60
+
+
+def test_breaker_probes_after_the_recovery_timeout_and_closes_on_success():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.retry_after() == 0.0
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=0.05)
+    for _ in range(5):
+        breaker.record_failure()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_breaker_limits_probes_until_released():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0, half_open_calls=2)
+    breaker.record_failure()
+
+    assert breaker.allow() and breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    # A probe that never reached the service gives its slot back
+    breaker.release()
+    assert breaker.allow()
+    assert not breaker.allow()
+    assert breaker.rejected == 2
+
+
+def test_open_breaker_fails_calls_fast(registry, make_service):
+    calls = []
+
+    def counted(params):
+        calls.append(params)
+        failing(params)
+
+    registry.breakers.configure(ServiceType.GITHUB, failure_threshold=2, recovery_timeout=60)
+    registry.register_service(make_service(ServiceType.GITHUB, {"down": counted}))
+
+    responses = [registry.execute_tool(ToolRequest(tool_name="down", parameters={"i": i})) for i in range(3)]
+
+    assert [response.status for response in responses] == ["error", "error", "unavailable"]
+    assert responses[-1].data["reason"] == "circuit_open"
+    assert responses[-1].data["retry_after"] > 0
+    assert len(calls) == 2
+
+
+def test_breakers_are_per_service(registry, make_service):
+    registry.breakers.configure(ServiceType.GITHUB, failure_threshold=1)
+    registry.register_service(make_service(ServiceType.GITHUB, {"down": failing}))
+    registry.register_service(make_service(ServiceType.LINEAR, {"up": lambda params: "ok"}))
+
+    registry.execute_tool(ToolRequest(tool_name="down"))
+
+    assert registry.execute_tool(ToolRequest(tool_name="down")).data["reason"] == "circuit_open"
+    assert registry.execute_tool(ToolRequest(tool_name="up")).status == "success"
+
+
+def test_full_bulkhead_sheds_calls_beyond_its_queue(make_service):
+    registry = MCPRegistry(ExecutionEngine(service_concurrency=1, service_queue_limit=1))
+
+    def slow(params):
+        time.sleep(0.2)
+        return params["i"]
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow}))
+
+    async def gather():
+        return await asyncio.gather(*(
+            registry.execute_tool_async(ToolRequest(tool_name="slow", parameters={"i": i})) for i in range(3)
+        ))
+
+    try:
+        responses = asyncio.run(gather())
+        stats = registry.engine.run(bulkhead_stats(registry.engine))
+    finally:
+        registry.engine.shutdown()
+
+    # One call runs, one waits for its slot, and the third is shed
+    assert sorted(response.status for response in responses) == ["success", "success", "unavailable"]
+    shed = next(response for response in responses if response.status == "unavailable")
+    assert shed.data["reason"] == "bulkhead_full"
+    assert stats["rejected"] == 1
+    assert stats["active"] == stats["queued"] == 0
+    # Shedding is not the service's fault
+    assert registry.breakers.get(ServiceType.GITHUB).failures == 0
@@ -0,0 +1,149 @@
+"""
+Tests of priority and fair-share admission to tool execution
+"""
+import asyncio
+
+import pytest
+
+from src.server.scheduler import FairScheduler, QueueFullError
+from src.utils.types import Priority
+
+
+def served_order(scheduler, calls, count=None):
+    """
+    Labels of ``calls`` in the order they get the scheduler's single slot
+
+    ``calls`` are ``(label, priority, client)`` tuples, all queued behind a
+    held slot before it is released; only the first ``count`` are served.
+    """
+    order = []
+
+    async def call(label, priority, client):
+        await scheduler.acquire(priority, client)
+        order.append(label)
+        if count is None or len(order) < count:
+            scheduler.release()
+
+    async def run():
+        await scheduler.acquire()
+        tasks = [asyncio.create_task(call(*spec)) for spec in calls]
+        await asyncio.sleep(0)
+        scheduler.release()
+        while len(order) < (len(calls) if count is None else count):
+            await asyncio.sleep(0)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    asyncio.run(run())
+    return order
+
+
+def test_classes_are_served_in_priority_order():
+    scheduler = FairScheduler(slots=1, max_queue=10)
+
+    order = served_order(scheduler, [
+        ("background", Priority.BACKGROUND, None),
+        ("batch", Priority.BATCH, None),
+        ("interactive", Priority.INTERACTIVE, None),
+    ])
+
+    assert order == ["interactive", "batch", "background"]
+
+
+def test_calls_of_one_class_are_first_come_first_served():
+    scheduler = FairScheduler(slots=1, max_queue=10)
+
+    order = served_order(scheduler, [(i, Priority.BATCH, None) for i in range(5)])
+
+    assert order == list(range(5))
+
+
+def test_backlogged_clients_share_slots_by_weight():
+    scheduler = FairScheduler(slots=1, max_queue=100, weights={"bulk": 1, "app": 3})
+    calls = [("bulk", Priority.BATCH, "bulk")] * 20 + [("app", Priority.BATCH, "app")] * 20
+
+    order = served_order(scheduler, calls, count=20)
+
+    assert order.count("app") == 15
+    assert order.count("bulk") == 5
+
+
+def test_unweighted_clients_alternate_regardless_of_arrival():
+    scheduler = FairScheduler(slots=1, max_queue=100, weights={})
+    calls = [("a", Priority.INTERACTIVE, "a")] * 5 + [("b", Priority.INTERACTIVE, "b")] * 5
+
+    order = served_order(scheduler, calls, count=6)
+
+    assert order.count("a") == order.count("b") == 3
+
+
+def test_full_queue_displaces_the_latest_lower_class_call():
+    scheduler = FairScheduler(slots=1, max_queue=2)
+
+    async def run():
+        await scheduler.acquire()
+        first = asyncio.create_task(scheduler.acquire(Priority.BACKGROUND))
+        second = asyncio.create_task(scheduler.acquire(Priority.BACKGROUND))
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(scheduler.acquire(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+
+        with pytest.raises(QueueFullError):
+            await second
+        assert not first.done()
+        assert scheduler.stats()["queued"] == {"interactive": 1, "batch": 0, "background": 1}
+
+        scheduler.release()
+        await interactive
+        assert not first.done()
+        scheduler.release()
+        await first
+
+    asyncio.run(run())
+    assert scheduler.stats()["shed"] == {"interactive": 0, "batch": 0, "background": 1}
+
+
+def test_full_queue_sheds_calls_without_a_lower_class_to_displace():
+    scheduler = FairScheduler(slots=1, max_queue=1)
+
+    async def run():
+        await scheduler.acquire()
+        queued = asyncio.create_task(scheduler.acquire(Priority.BATCH))
+        await asyncio.sleep(0)
+
+        for priority in (Priority.BATCH, Priority.BACKGROUND):
+            with pytest.raises(QueueFullError):
+                await scheduler.acquire(priority)
+        assert not queued.done()
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+
+    asyncio.run(run())
+    assert scheduler.stats()["shed"] == {"interactive": 0, "batch": 1, "background": 1}
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = FairScheduler(slots=1, max_queue=1)
+
+    async def run():
+        await scheduler.acquire()
+        cancelled = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        assert scheduler.queued == 1
+
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        assert scheduler.queued == 0
+
+        # Its place in the full queue is free, and the slot skips over it
+        waiting = asyncio.create_task(scheduler.acquire())
+        await asyncio.sleep(0)
+        scheduler.release()
+        await waiting
+        assert scheduler.active == 1
+        scheduler.release()
+        assert scheduler.active == 0
+
+    asyncio.run(run())
+    assert scheduler.stats()["shed"] == {"interactive": 0, "batch": 0, "background": 0}
@@ -0,0 +1,103 @@
+"""
+Tests of response serialization: orjson and the standard library must agree on the wire
+"""
+import datetime
+import enum
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+from src.server import serialization
+from src.server.app import app
+from src.server.serialization import _stdlib_dumps, dumps
+from src.utils.types import Page, ServiceType, ToolResponse, WorkflowResponse, WorkflowStepResult
+
+requires_orjson = pytest.mark.skipif(serialization.orjson is None, reason="orjson is not installed")
+
+
+class Color(enum.Enum):
+    RED = 1
+
+
+def flask_default(value):
+    """Flask's default encoding, plus the enums it leaves to the value's type"""
+    return value.value if isinstance(value, enum.Enum) else DefaultJSONProvider.default(value)
+
+
+ISSUE = {
+    "id": 1,
+    "title": "Bug",
+    "created_at": datetime.datetime(2024, 1, 2, 3, 4, 5, 678901),
+    "closed_at": datetime.datetime(2024, 1, 3, 12, 0, tzinfo=datetime.timezone.utc),
+    "due_on": datetime.date(2024, 2, 1),
+    "node_id": uuid.UUID(int=5),
+    "estimate": Decimal("1.50"),
+    "service": ServiceType.GITHUB,
+    "color": Color.RED,
+    "labels": ("bug", "ui"),
+    "score": 0.1,
+    "assignee": None,
+}
+
+RESPONSES = [
+    ToolResponse(service=ServiceType.GITHUB, data=[ISSUE, ISSUE]),
+    ToolResponse(status="error", service=ServiceType.LINEAR, error="Invalid parameters"),
+    ToolResponse(service=ServiceType.GITHUB, data=Page(items=[ISSUE], next_cursor="abc"), next_cursor="abc"),
+    ToolResponse(service=ServiceType.GITHUB, data={"by_service": {ServiceType.LINEAR: 2, ServiceType.GITHUB: 1}}),
+    WorkflowResponse(
+        outputs={"issue": ISSUE, "count": 2},
+        steps={"issues": WorkflowStepResult(status="success", service=ServiceType.GITHUB, duration_ms=1.5)}
+    ),
+]
+
+
+@requires_orjson
+@pytest.mark.parametrize("response", RESPONSES)
+def test_encoders_agree_byte_for_byte(response):
+    assert dumps(response) == _stdlib_dumps(response)
+
+
+@pytest.mark.parametrize("response", RESPONSES)
+def test_output_matches_flask_default_provider(response):
+    provider = DefaultJSONProvider(app)
+    expected = provider.dumps(response.dict(), default=flask_default, separators=(",", ":"))
+
+    assert dumps(response).decode() == expected
+
+
+@requires_orjson
+@pytest.mark.parametrize("data", [
+    {1: "a", 2: "b", 10: "c"},
+    {True: 1, False: 2},
+    {2.5: "b", 1.5: "a"},
+    {"text": "héllo ☃ \U0001F600", "separator": "a\u2028b"},
+    [1e16, 1e-7, 1e300, 3.141592653589793],
+])
+def test_encoders_agree_on_values_where_bytes_differ(data):
+    response = ToolResponse(service=ServiceType.GITHUB, data=data)
+
+    assert json.loads(dumps(response)) == json.loads(_stdlib_dumps(response))
+
+
+def test_integers_beyond_64_bits_fall_back_to_the_standard_library():
+    response = ToolResponse(service=ServiceType.GITHUB, data={"id": 2 ** 70})
+
+    assert dumps(response) == _stdlib_dumps(response)
+    assert json.loads(dumps(response))["data"]["id"] == 2 ** 70
+
+
+def test_unknown_types_are_rejected():
+    with pytest.raises(TypeError):
+        dumps({"value": {1, 2}})
+
+
+def test_jsonify_uses_the_fast_encoder():
+    response = ToolResponse(service=ServiceType.GITHUB, data=[ISSUE])
+
+    with app.app_context():
+        body = app.json.response(response).get_data()
+
+    assert body == dumps(response) + b"\n"
@@ -0,0 +1,119 @@
+"""
+Tests of NDJSON streaming of tool results
+"""
+import json
+import threading
+import time
+
+from src.server.app import ndjson_lines
+from src.server.streaming import NDJSON
+from src.utils.types import ServiceType, ToolRequest
+
+
+def read_lines(stream):
+    """The NDJSON lines of a tool stream, decoded"""
+    return [json.loads(line) for line in b"".join(ndjson_lines(stream)).splitlines()]
+
+
+def numbers(count, delay=0.0, fail_at=None):
+    """A generator tool function yielding ``count`` records"""
+    def call(params):
+        for i in range(count):
+            if i == fail_at:
+                raise ValueError("upstream failed")
+            time.sleep(delay)
+            yield {"n": i}
+    return call
+
+
+def test_records_are_framed_by_a_header_and_a_trailer(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"numbers": numbers(600)}))
+
+    lines = read_lines(registry.stream_tool(ToolRequest(tool_name="numbers")))
+
+    header, records, trailer = lines[0], lines[1:-1], lines[-1]
+    assert header["status"] == "success" and header["data"] is None
+    assert records == [{"n": i} for i in range(600)]
+    assert trailer == {"status": "success", "service": "github", "error": None, "count": 600, "next_cursor": None}
+
+
+def test_call_failing_before_any_record_sends_only_the_header(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"numbers": numbers(5, fail_at=0)}))
+
+    lines = read_lines(registry.stream_tool(ToolRequest(tool_name="numbers")))
+
+    assert len(lines) == 1
+    assert lines[0]["status"] == "error"
+    assert "upstream failed" in lines[0]["error"]
+
+
+def test_failure_after_records_is_reported_in_the_trailer(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"numbers": numbers(5, delay=0.01, fail_at=3)}))
+
+    lines = read_lines(registry.stream_tool(ToolRequest(tool_name="numbers")))
+
+    assert lines[0]["status"] == "success"
+    assert lines[1:-1] == [{"n": 0}, {"n": 1}, {"n": 2}]
+    assert lines[-1]["status"] == "error"
+    assert lines[-1]["count"] == 3
+
+
+def test_deadline_ends_the_stream_with_a_timeout(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"numbers": numbers(100, delay=0.02)}))
+
+    lines = read_lines(registry.stream_tool(ToolRequest(tool_name="numbers", timeout_ms=150)))
+
+    assert lines[-1]["status"] == "timeout"
+    assert 0 < lines[-1]["count"] < 100
+
+
+def test_closing_the_response_stops_the_tool(registry, make_service):
+    closed = threading.Event()
+
+    def endless(params):
+        try:
+            i = 0
+            while True:
+                yield {"n": i}
+                i += 1
+        finally:
+            closed.set()
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"endless": endless}))
+
+    body = ndjson_lines(registry.stream_tool(ToolRequest(tool_name="endless", timeout_ms=5000)))
+    next(body)
+    next(body)
+    body.close()
+
+    assert closed.wait(2)
+
+
+def test_ndjson_is_sent_when_accepted(client):
+    body = {"tool_name": "linear.list_issues", "parameters": {}}
+
+    streamed = client.post("/execute", json=body, headers={"Accept": NDJSON})
+    collected = client.post("/execute", json=body)
+
+    lines = [json.loads(line) for line in streamed.get_data().splitlines()]
+    assert streamed.mimetype == NDJSON
+    assert lines[1:-1] == collected.get_json()["data"]
+    assert lines[-1]["count"] == len(collected.get_json()["data"])
+
+
+def test_streamed_results_are_not_cached(registry, make_service):
+    calls = []
+
+    def empty(params):
+        calls.append(params)
+        return iter([])
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"empty": empty}, cache_ttl=60))
+
+    lines = read_lines(registry.stream_tool(ToolRequest(tool_name="empty")))
+    response = registry.execute_tool(ToolRequest(tool_name="empty"))
+
+    assert [line["status"] for line in lines] == ["success", "success"]
+    assert lines[-1]["count"] == 0
+    assert response.data == []
+    assert len(calls) == 2
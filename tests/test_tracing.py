@@ -0,0 +1,145 @@
+"""
+Tests of request tracing: head sampling, context propagation and traceparent
+"""
+import pytest
+
+from src.server import tracing
+from src.server.tracing import (
+    NOOP_SPAN, RingBufferExporter, Tracer, TraceContext, current_request_id, parse_traceparent, span, trace_buffer,
+    traceparent
+)
+from src.utils.types import ServiceType, ToolRequest
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+EXECUTE = {"tool_name": "linear.list_issues", "parameters": {}}
+
+
+def traced(tracer, **options):
+    """Serve a request with ``tracer``, returning its root span"""
+    root, token = tracer.start_request("GET /test", **options)
+    with span("work"):
+        pass
+    tracer.finish_request(root, token)
+    return root
+
+
+def spans_by_name(trace):
+    """The spans of an exported trace, by name"""
+    return {span["name"]: span for span in trace["spans"]}
+
+
+@pytest.mark.parametrize("sample_rate, draw, sampled", [
+    (0, 0.0, False),
+    (1, 0.99, True),
+    (0.25, 0.2, True),
+    (0.25, 0.3, False),
+])
+def test_requests_are_sampled_at_the_head(monkeypatch, sample_rate, draw, sampled):
+    monkeypatch.setattr(tracing.random, "random", lambda: draw)
+    buffer = RingBufferExporter()
+
+    root = traced(Tracer(sample_rate, [buffer]), request_id="req")
+
+    assert (root is not None) is sampled
+    assert len(buffer.traces()) == int(sampled)
+    if sampled:
+        assert [span["name"] for span in buffer.get("req")["spans"]] == ["GET /test", "work"]
+
+
+def test_forced_requests_are_always_sampled():
+    buffer = RingBufferExporter()
+
+    traced(Tracer(0, [buffer]), request_id="req", force=True)
+
+    assert buffer.get("req") is not None
+
+
+def test_unsampled_requests_record_nothing():
+    tracer = Tracer(0)
+    root, token = tracer.start_request("GET /test", request_id="req")
+    try:
+        assert span("work") is NOOP_SPAN
+        assert traceparent() is None
+        # The request ID is set all the same
+        assert current_request_id.get() == "req"
+    finally:
+        tracer.finish_request(root, token)
+    assert current_request_id.get() is None
+
+
+@pytest.mark.parametrize("header, context", [
+    (f"00-{TRACE_ID}-{PARENT_ID}-01", TraceContext(TRACE_ID, PARENT_ID, True)),
+    (f"00-{TRACE_ID.upper()}-{PARENT_ID}-00", TraceContext(TRACE_ID, PARENT_ID, False)),
+    (f"00-{TRACE_ID}-{PARENT_ID}-03", TraceContext(TRACE_ID, PARENT_ID, True)),
+    (f"00-{'0' * 32}-{PARENT_ID}-01", None),
+    (f"00-{TRACE_ID}-{'0' * 16}-01", None),
+    (f"01-{TRACE_ID}-{PARENT_ID}-01", None),
+    (f"00-{TRACE_ID}-{PARENT_ID}", None),
+    ("garbage", None),
+    ("", None),
+    (None, None),
+])
+def test_traceparent_parsing(header, context):
+    assert parse_traceparent(header) == context
+
+
+def test_traceparent_continues_the_callers_trace():
+    buffer = RingBufferExporter()
+
+    root = traced(Tracer(0, [buffer]), parent=TraceContext(TRACE_ID, PARENT_ID, True))
+
+    trace = buffer.get(TRACE_ID)
+    assert root is not None and trace is not None
+    assert spans_by_name(trace)["GET /test"]["parent_id"] == PARENT_ID
+
+
+def test_traceparent_sampling_decision_is_kept():
+    buffer = RingBufferExporter()
+    tracer = Tracer(1, [buffer])
+
+    assert traced(tracer, parent=TraceContext(TRACE_ID, PARENT_ID, False)) is None
+    assert traced(tracer, parent=TraceContext(TRACE_ID, PARENT_ID, False), force=True) is not None
+
+
+def test_spans_and_request_id_follow_the_call_into_the_tool(registry, make_service):
+    seen = {}
+
+    def tool(params):
+        seen["request_id"] = current_request_id.get()
+        seen["traceparent"] = traceparent()
+        return []
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"issues": tool}))
+    buffer = RingBufferExporter()
+    tracer = Tracer(0, [buffer])
+
+    root, token = tracer.start_request("POST /execute", parent=TraceContext(TRACE_ID, PARENT_ID, True))
+    registry.execute_tool(ToolRequest(tool_name="issues"))
+    tracer.finish_request(root, token)
+
+    spans = spans_by_name(buffer.get(TRACE_ID))
+    assert seen["request_id"] == TRACE_ID
+    # The tool's upstream requests would continue the tool span
+    assert seen["traceparent"] == f"00-{TRACE_ID}-{spans['tool']['span_id']}-01"
+    assert spans["tool"]["attributes"]["tool"] == "github.issues"
+    assert spans["tool"]["parent_id"] == spans["registry.dispatch"]["span_id"]
+
+
+def test_collected_tools_are_traced_under_their_own_name(client):
+    response = client.post("/execute", json=EXECUTE, headers={"X-MCP-Trace": "1", "X-Request-ID": "collected"})
+
+    spans = spans_by_name(trace_buffer.get("collected"))
+    assert response.headers["X-Request-ID"] == "collected"
+    assert spans["tool"]["attributes"]["tool"] == "linear.list_issues"
+    assert {"parse_json", "validate_request", "registry.dispatch", "serialize"} <= set(spans)
+
+
+def test_traceparent_header_joins_the_callers_trace(client):
+    response = client.post("/execute", json=EXECUTE, headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+
+    trace = trace_buffer.get(TRACE_ID)
+    assert response.headers["X-Request-ID"] == TRACE_ID
+    assert trace is not None
+    assert spans_by_name(trace)["POST /execute"]["parent_id"] == PARENT_ID
+    assert "tool" in spans_by_name(trace)
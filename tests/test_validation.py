@@ -0,0 +1,140 @@
+"""
+Tests of tool parameter validation
+"""
+import pytest
+
+from src.server.validation import ToolValidationError, compile_validator
+from src.utils.types import ServiceType, ToolRequest, ToolSchema
+
+SCHEMA = ToolSchema(
+    properties={
+        "repo_id": {"type": "integer", "minimum": 1},
+        "limit": {"type": "integer", "minimum": 1, "maximum": 100},
+        "score": {"type": "number", "maximum": 1},
+        "title": {"type": "string"},
+        "draft": {"type": "boolean"},
+        "labels": {"type": "array"},
+        "filter": {"type": "object"},
+        "state": {"type": "string", "enum": ["open", "closed"]},
+        "priority": {"type": "integer", "enum": [0, 1, 2]},
+        "sort": {"enum": ["created", "updated"], "description": "No declared type"},
+        "notes": {"description": "Neither type nor enum"},
+    },
+    required=["repo_id"]
+)
+
+validate = compile_validator(SCHEMA)
+
+
+def test_valid_parameters_are_returned_as_is():
+    params = {"repo_id": 1, "title": "Bug", "draft": False, "labels": ["bug"], "state": "open", "priority": 0}
+
+    assert validate(params) is params
+
+
+@pytest.mark.parametrize("name, value, expected", [
+    ("limit", "5", 5),
+    ("limit", " 7 ", 7),
+    ("limit", 10.0, 10),
+    ("score", "0.5", 0.5),
+    ("score", 1, 1),
+    ("draft", "yes", True),
+    ("draft", "False", False),
+    ("labels", ("bug", "ui"), ["bug", "ui"]),
+    ("priority", "2", 2),
+])
+def test_unambiguous_values_are_coerced(name, value, expected):
+    params = {"repo_id": 1, name: value}
+
+    coerced = validate(params)
+
+    assert coerced[name] == expected and type(coerced[name]) is type(expected)
+    # The caller's parameters are left alone
+    assert params[name] is value
+
+
+@pytest.mark.parametrize("name, value", [
+    ("limit", True),
+    ("limit", False),
+    ("limit", "5.5"),
+    ("limit", 2.5),
+    ("limit", [5]),
+    ("score", True),
+    ("score", "high"),
+    ("title", 5),
+    ("draft", 1),
+    ("draft", "maybe"),
+    ("labels", "bug"),
+    ("filter", ["a"]),
+])
+def test_mistyped_values_are_rejected(name, value):
+    with pytest.raises(ToolValidationError, match=f"'{name}' must be"):
+        validate({"repo_id": 1, name: value})
+
+
+@pytest.mark.parametrize("params, error", [
+    ({"repo_id": 0}, "'repo_id' must be at least 1"),
+    ({"repo_id": 1, "limit": 0}, "'limit' must be at least 1"),
+    ({"repo_id": 1, "limit": "101"}, "'limit' must be at most 100"),
+    ({"repo_id": 1, "score": 1.5}, "'score' must be at most 1"),
+])
+def test_bounds_are_enforced_after_coercion(params, error):
+    with pytest.raises(ToolValidationError, match=error):
+        validate(params)
+
+
+def test_bounds_are_inclusive():
+    assert validate({"repo_id": 1, "limit": 100, "score": 1.0})["limit"] == 100
+
+
+@pytest.mark.parametrize("params", [{}, {"repo_id": None}, {"title": "Bug"}])
+def test_required_parameters(params):
+    with pytest.raises(ToolValidationError, match="Missing required parameters: repo_id"):
+        validate(params)
+
+
+def test_optional_none_values_count_as_missing():
+    assert validate({"repo_id": 1, "limit": None}) == {"repo_id": 1, "limit": None}
+
+
+def test_unknown_and_untyped_parameters_pass_through():
+    params = {"repo_id": 1, "notes": 5, "unknown": object()}
+
+    assert validate(params) is params
+
+
+@pytest.mark.parametrize("params, error", [
+    ({"repo_id": 1, "state": "merged"}, "'state' must be one of open, closed"),
+    ({"repo_id": 1, "priority": 3}, "'priority' must be one of 0, 1, 2"),
+    ({"repo_id": 1, "priority": "3"}, "'priority' must be one of 0, 1, 2"),
+    ({"repo_id": 1, "sort": "name"}, "'sort' must be one of created, updated"),
+])
+def test_values_outside_the_enum_are_rejected(params, error):
+    with pytest.raises(ToolValidationError, match=error):
+        validate(params)
+
+
+def test_enum_without_a_type_accepts_its_values():
+    assert validate({"repo_id": 1, "sort": "updated"})["sort"] == "updated"
+
+
+def test_schema_without_constraints_validates_nothing():
+    params = {"anything": True}
+
+    assert compile_validator(ToolSchema(properties={}, required=[]))(params) is params
+
+
+def test_registry_rejects_invalid_parameters_without_running_the_tool(registry, make_service):
+    calls = []
+    service = make_service(ServiceType.GITHUB, {"issues": calls.append})
+    service.tools[0].parameters = SCHEMA
+    registry.register_service(service)
+
+    response = registry.execute_tool(ToolRequest(tool_name="issues", parameters={"repo_id": True}))
+
+    assert response.status == "error"
+    assert response.error == "Invalid parameters: Parameter 'repo_id' must be an integer"
+    assert calls == []
+
+    registry.execute_tool(ToolRequest(tool_name="issues", parameters={"repo_id": "3", "state": "open"}))
+    assert calls == [{"repo_id": 3, "state": "open"}]
@@ -0,0 +1,164 @@
+"""
+Tests of server-side workflows of tool calls
+"""
+import time
+
+import pytest
+
+from src.server.workflows import ReferenceResolutionError, WorkflowError, compile_workflow, resolve
+from src.utils.types import ServiceType, WorkflowRequest, WorkflowStep
+
+
+def workflow(*steps, **options):
+    """A workflow request of ``(id, tool_name, parameters)`` steps, with ``depends_on`` as a fourth item"""
+    return WorkflowRequest(steps=[
+        WorkflowStep(id=step[0], tool_name=step[1], parameters=step[2], depends_on=list(step[3:]))
+        for step in steps
+    ], **options)
+
+
+def test_steps_are_ordered_by_their_dependencies():
+    compiled = compile_workflow(workflow(
+        ("comment", "comment", {"issue": "${issue.id}", "user": "${user}"}),
+        ("issue", "issue", {}, "user"),
+        ("user", "user", {}),
+    ))
+
+    assert [step.step.id for step in compiled.steps] == ["user", "issue", "comment"]
+    assert compiled.steps[2].dependencies == ("issue", "user")
+    # Outputs default to the steps nothing depends on
+    assert compiled.outputs == {"comment": "${comment}"}
+
+
+@pytest.mark.parametrize("workflow_request, error", [
+    (workflow(("a", "t", {"x": "${b}"}), ("b", "t", {"x": "${a.id}"})), "cycle between steps a, b"),
+    (workflow(("a", "t", {}, "a")), "depends on itself"),
+    (workflow(("a", "t", {"x": "${missing.id}"})), "unknown step 'missing'"),
+    (workflow(("a", "t", {}, "missing")), "unknown step 'missing'"),
+    (workflow(("a", "t", {}), ("a", "t", {})), "Duplicate step ID 'a'"),
+    (workflow(("a.b", "t", {})), "Invalid step ID"),
+    (workflow(("a", "t", {}), outputs={"x": "${b.id}"}), "references unknown step 'b'"),
+])
+def test_invalid_workflows_are_rejected(workflow_request, error):
+    with pytest.raises(WorkflowError, match=error):
+        compile_workflow(workflow_request)
+
+
+def test_references_keep_whole_values_and_interpolate_in_strings():
+    data = {"repos": [{"id": 7, "name": "api"}], "user": "octocat"}
+
+    assert resolve("${repos.0}", data) == {"id": 7, "name": "api"}
+    assert resolve({"ids": ["${repos.0.id}"]}, data) == {"ids": [7]}
+    assert resolve("${user}/${repos.0.name} #${repos.0.id}", data) == "octocat/api #7"
+    assert resolve("all: ${repos}", data) == 'all: [{"id": 7, "name": "api"}]'
+
+
+@pytest.mark.parametrize("path", ["${repos.1.id}", "${repos.0.missing}", "${repos.first}", "${user.name}"])
+def test_unresolvable_references_fail(path):
+    with pytest.raises(ReferenceResolutionError):
+        resolve(path, {"repos": [{"id": 7}], "user": "octocat"})
+
+
+def test_steps_get_the_output_of_their_dependencies(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {
+        "repos": lambda params: [{"id": 7, "owner": params["owner"]}],
+        "issues": lambda params: {"repo": params["repo"], "title": params["title"]},
+    }))
+
+    response = registry.execute_workflow(workflow(
+        ("repos", "repos", {"owner": "octocat"}),
+        ("issues", "issues", {"repo": "${repos.0.id}", "title": "Repo of ${repos.0.owner}"}),
+        outputs={"title": "${issues.title}", "repo": "${issues.repo}"}
+    ))
+
+    assert response.status == "success"
+    assert response.outputs == {"title": "Repo of octocat", "repo": 7}
+    assert set(response.steps) == {"repos", "issues"}
+    # Intermediate data stays on the server
+    assert all(not hasattr(step, "data") for step in response.steps.values())
+
+
+def test_dependents_of_a_failed_step_are_skipped(registry, make_service):
+    calls = []
+
+    def fail(params):
+        raise ValueError("upstream failed")
+
+    def record(params):
+        calls.append(params)
+        return params
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"fail": fail, "record": record}))
+
+    response = registry.execute_workflow(workflow(
+        ("broken", "fail", {}),
+        ("dependent", "record", {"x": "${broken.id}"}),
+        ("transitive", "record", {}, "dependent"),
+        ("independent", "record", {"y": 1}),
+    ))
+
+    statuses = {step_id: result.status for step_id, result in response.steps.items()}
+    assert statuses == {"broken": "error", "dependent": "skipped", "transitive": "skipped", "independent": "success"}
+    assert "'broken'" in response.steps["dependent"].error
+    assert calls == [{"y": 1}]
+    assert response.status == "error"
+    assert response.error == "3 of 4 steps did not succeed"
+    assert response.outputs == {"independent": {"y": 1}}
+
+
+def test_reference_missing_from_step_data_fails_the_step(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"echo": lambda params: params}))
+
+    response = registry.execute_workflow(workflow(
+        ("first", "echo", {"id": 1}),
+        ("second", "echo", {"x": "${first.missing}"}),
+    ))
+
+    assert response.steps["second"].status == "error"
+    assert "missing" in response.steps["second"].error
+
+
+def test_independent_steps_run_in_parallel(registry, make_service):
+    def slow(params):
+        time.sleep(0.2)
+        return params
+
+    registry.register_service(make_service(ServiceType.GITHUB, {"slow": slow}))
+
+    start = time.monotonic()
+    response = registry.execute_workflow(workflow(*((f"step{i}", "slow", {"i": i}) for i in range(3))))
+
+    assert response.status == "success"
+    assert time.monotonic() - start < 0.5
+
+
+def test_unknown_tool_is_rejected_before_running(registry, make_service):
+    registry.register_service(make_service(ServiceType.GITHUB, {"echo": lambda params: params}))
+
+    with pytest.raises(WorkflowError, match="unknown tool 'missing'"):
+        registry.execute_workflow(workflow(("a", "echo", {}), ("b", "missing", {})))
+
+
+def test_workflow_endpoint(client):
+    response = client.post("/workflows/execute", json={
+        "steps": [
+            {"id": "issues", "tool_name": "linear.list_issues", "parameters": {"team_id": "team3"}},
+            {"id": "assignee", "tool_name": "linear.get_user", "parameters": {"user_id": "${issues.0.assignee_id}"}},
+        ],
+        "outputs": {"name": "${assignee.name}", "issue": "${issues.0.title}"},
+    })
+
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["status"] == "success"
+    assert body["outputs"] == {"name": "Alice Smith", "issue": "Security audit findings"}
+    assert body["steps"]["assignee"]["status"] == "success"
+
+
+def test_workflow_endpoint_rejects_invalid_workflows(client):
+    response = client.post("/workflows/execute", json={
+        "steps": [{"id": "a", "tool_name": "linear.get_user", "parameters": {"user_id": "${a.id}"}}],
+    })
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Invalid workflow: Step 'a' depends on itself"